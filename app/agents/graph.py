@@ -7,15 +7,16 @@ from app.core.db_pool import get_pool
 
 logger = logging.getLogger(__name__)
 
+compiled_graph = None
+
 
 class TitanGraph:
-    def __init__(self, session):
-        self.session = session
-        self.nodes = AgentNodes(session)
+    def __init__(self):
+        self.nodes = AgentNodes()
 
-    async def get(self):
+    def build(self) -> StateGraph:
         """
-        Executes the workflow using the global connection pool for persistence.
+        Declares the workflow topology (nodes + edges). Does not touch the database.
         """
         workflow = StateGraph(AgentState)
 
@@ -30,9 +31,25 @@ class TitanGraph:
         workflow.add_node(
             "forecast_agent", self.nodes.forecast_agent
         )  # CHRONOS integration
+        # Speculative branches started next to the data-gathering node
+        workflow.add_node("prefetch_forecast", self.nodes.prefetch_forecast)
+        workflow.add_node("prefetch_market", self.nodes.prefetch_market)
 
         workflow.set_entry_point("supervisor")
-        workflow.add_conditional_edges("supervisor", self.nodes.route_supervisor)
+        workflow.add_conditional_edges(
+            "supervisor",
+            self.nodes.route_supervisor,
+            [
+                "retrieve",
+                "quant_agent",
+                "market_agent",
+                "human_intervention",
+                "reporter_agent",
+                "forecast_agent",
+                "prefetch_forecast",
+                "prefetch_market",
+            ],
+        )
         workflow.add_edge("retrieve", "grade_documents")
         workflow.add_conditional_edges("grade_documents", self.nodes.route_search)
         workflow.add_edge("web_search", "supervisor")
@@ -42,13 +59,41 @@ class TitanGraph:
         )  # Returns to supervisor after enrichment
         workflow.add_conditional_edges("quant_agent", self.nodes.route_quant)
         workflow.add_edge("human_intervention", "supervisor")
+        # Branch ends here; its state is joined by the next superstep, which
+        # always precedes the reporter.
+        workflow.add_edge("prefetch_forecast", END)
+        workflow.add_edge("prefetch_market", END)
         workflow.add_edge("reporter_agent", END)
 
+        return workflow
+
+    async def get(self, setup_checkpointer: bool = True):
+        """
+        Compiles the workflow using the global connection pool for persistence.
+        Request-scoped resources (e.g. the DB session) are NOT bound here;
+        they travel in config["configurable"] on every invocation.
+        """
         pool = get_pool()
         checkpointer = AsyncPostgresSaver(pool)
-        await checkpointer.setup()
-        app = workflow.compile(
+        if setup_checkpointer:
+            await checkpointer.setup()
+
+        app = self.build().compile(
             checkpointer=checkpointer, interrupt_before=["human_intervention"]
         )
 
         return app
+
+
+async def init_graph():
+    """
+    Builds and compiles the TITAN graph once per process.
+    Must run after open_pool() (called from the FastAPI lifespan).
+    """
+    global compiled_graph
+    compiled_graph = await TitanGraph().get()
+    logger.info("TitanGraph compiled (process-wide).")
+
+
+def get_graph():
+    return compiled_graph
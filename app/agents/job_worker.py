@@ -0,0 +1,152 @@
+import os
+import socket
+import asyncio
+import logging
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.agents.graph import get_graph
+from app.agents.streaming import final_payload
+from app.services.job_queue import claim_next_job, finish_job, heartbeat_job
+
+logger = logging.getLogger(__name__)
+
+job_pool = None
+
+
+class JobWorkerPool:
+    """
+    Runs queued agent jobs in the background of each API process.
+    'concurrency' bounds the graphs this process runs at once; every worker
+    polls the shared agent_jobs table, so adding processes adds capacity
+    without double-running a job.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 60.0,
+        session_factory=async_session_factory,
+    ):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.session_factory = session_factory
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.stats = {"completed": 0, "paused": 0, "failed": 0, "retried": 0}
+
+    async def start(self):
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{prefix}-{i}"))
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Job workers started (concurrency={self.concurrency}).")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """
+        Wakes idle workers right away after an in-process submission.
+        """
+        self._wakeup.set()
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    job = await claim_next_job(session, worker_id)
+                if job is not None:
+                    await self.run_job(job)
+                    continue
+            except Exception as e:
+                # Never let a DB blip end this worker for the life of the
+                # process; an unfinished job is reclaimed once it goes stale.
+                logger.error(f"Job worker {worker_id} error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _heartbeat(self, job):
+        """
+        Refreshes the job's heartbeat while the graph runs, so runs longer
+        than JOB_STALE_SECONDS are not reclaimed and run twice.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    owned = await heartbeat_job(session, job.id, job.worker_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job.id} failed: {e}")
+                continue
+            if not owned:
+                logger.warning(f"Job {job.id} is no longer ours; heartbeat stopped.")
+                return
+
+    async def run_job(self, job):
+        logger.info(f"Running job {job.id} (attempt {job.attempts}).")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            async with self.session_factory() as session:
+                config = {
+                    "configurable": {"thread_id": job.thread_id, "session": session},
+                    "recursion_limit": 50,
+                }
+                final_state = await get_graph().ainvoke(
+                    {"question": job.question, "loop_step": 0}, config
+                )
+            status, result = final_payload(final_state)
+            error = None
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            retry = job.attempts < settings.JOB_MAX_ATTEMPTS
+            status, result, error = ("queued" if retry else "failed"), None, str(e)
+        finally:
+            heartbeat.cancel()
+
+        self.stats["retried" if status == "queued" else status] += 1
+        async with self.session_factory() as session:
+            recorded = await finish_job(
+                session,
+                job.id,
+                status,
+                result=result,
+                error=error,
+                worker_id=job.worker_id,
+            )
+        if not recorded:
+            logger.warning(
+                f"Job {job.id} was reclaimed by another worker; "
+                f"discarding this run's '{status}' result."
+            )
+
+
+async def start_job_workers():
+    global job_pool
+    pool = JobWorkerPool(
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        heartbeat_interval=settings.JOB_HEARTBEAT_SECONDS,
+    )
+    await pool.start()
+    job_pool = pool
+
+
+async def stop_job_workers():
+    global job_pool
+    if job_pool:
+        await job_pool.stop()
+        job_pool = None
+
+
+def get_job_pool():
+    return job_pool
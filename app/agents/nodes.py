@@ -1,13 +1,21 @@
+import asyncio
 import logging
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_experimental.utilities import PythonREPL
+from langchain_core.runnables import RunnableConfig
 from jinja2 import Environment, FileSystemLoader
 from typing import Literal
 
 from app.agents.state import AgentState
 from app.services.retriever import RetrievalService
-from app.services.chronos_client import ChronosClient
+from app.services.query_filters import (
+    extract_filters,
+    extract_tickers,
+    relaxation_steps,
+)
+from app.services.forecast_cache import forecast_cache
+from app.services.intent_router import intent_router
 from app.core.config import settings
 from app.schemas.report_schema import FinancialSummary
 from app.core.mcp_client import load_mcp_tools
@@ -23,10 +31,12 @@ from app.core.prompts import (
 logger = logging.getLogger(__name__)
 templates_env = Environment(loader=FileSystemLoader("app/templates"))
 
+# Process-wide grader counters (exposed through /metrics)
+grader_stats = {"llm_calls": 0, "auto_accepted": 0, "auto_rejected": 0, "timeouts": 0}
+
 
 class AgentNodes:
-    def __init__(self, session):
-        self.retriever_service = RetrievalService(session)
+    def __init__(self):
         self.router_llm = LLMFactory.get_llm(temperature=0, json_mode=True)
         self.gen_llm = LLMFactory.get_llm(temperature=0, json_mode=False)
         self.web_search_tool = TavilySearchResults(
@@ -35,21 +45,68 @@ class AgentNodes:
         self.repl = PythonREPL()
         self.market_tools = []
 
-    async def retrieve(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def get_retriever(config: RunnableConfig) -> RetrievalService:
+        """
+        Builds a RetrievalService bound to the request-scoped DB session,
+        which the API passes in config["configurable"]["session"].
+        """
+        session = config.get("configurable", {}).get("session")
+        if session is None:
+            raise ValueError("No DB session found in config['configurable'].")
+        return RetrievalService(session)
+
+    async def retrieve(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """
         Node: Retrieves documents from Vecto DB based on the question.
         """
         logger.info("---RETRIEVE---")
         question = state["question"]
+        retriever_service = self.get_retriever(config)
+        filters = extract_filters(question)
+        if filters.tickers:
+            stored = await retriever_service.stored_tickers(filters.tickers)
+            unknown = [t for t in filters.tickers if t not in stored]
+            if unknown:
+                logger.info(f"Ignoring tickers with no filings: {unknown}")
+                filters.tickers = [t for t in filters.tickers if t in stored]
+
+        for step, step_filters in enumerate(relaxation_steps(filters)):
+            if step:
+                logger.info(f"No chunks matched. Retrying with filters {step_filters}.")
+            documents = await retriever_service.search_relevant_chunks(
+                question, limit=4, filters=step_filters
+            )
+            if documents:
+                break
 
-        documents = await self.retriever_service.search_relevant_chunks(
-            question, limit=4
-        )
+        doc_contents = [doc.content for doc, _ in documents]
+        doc_sources = [f"{doc.company_ticker} ({doc.section})" for doc, _ in documents]
+        doc_distances = [distance for _, distance in documents]
 
-        doc_contents = [doc.content for doc in documents]
-        doc_sources = [f"{doc.company_ticker} ({doc.section})" for doc in documents]
+        return {
+            "documents": doc_contents,
+            "sources": doc_sources,
+            "distances": doc_distances,
+            "question": question,
+        }
 
-        return {"documents": doc_contents, "sources": doc_sources, "question": question}
+    @staticmethod
+    def prefilter_grade(distance: float | None) -> str | None:
+        """
+        Cheap relevance decision from the vector distance alone.
+        Returns 'yes' / 'no' when the distance is conclusive, or None when
+        the document must go to the LLM grader. A cutoff set to None is off.
+        """
+        if not settings.GRADER_PREFILTER or distance is None:
+            return None
+        accept = settings.GRADER_AUTO_ACCEPT_DISTANCE
+        reject = settings.GRADER_AUTO_REJECT_DISTANCE
+        if accept is not None and distance <= accept:
+            return "yes"
+        if reject is not None and distance >= reject:
+            return "no"
+        return None
 
     async def grade_documents(self, state: AgentState) -> AgentState:
         """
@@ -60,33 +117,65 @@ class AgentNodes:
         question = state["question"]
         documents = state["documents"]
         sources = state["sources"]
+        distances = state.get("distances") or []
+        if len(distances) != len(documents):
+            distances = [None] * len(documents)
 
         grader_chain = GRADER_PROMPT | self.router_llm | JsonOutputParser()
+        semaphore = asyncio.Semaphore(settings.GRADER_CONCURRENCY)
 
-        filtered_docs = []
-        filtered_sources = []
-
-        for i, doc in enumerate(documents):
-            try:
-                grade = await grader_chain.ainvoke(
-                    {"question": question, "document": doc}
+        async def grade_one(i: int, doc: str) -> bool:
+            score = self.prefilter_grade(distances[i])
+            if score is not None:
+                bucket = "auto_accepted" if score == "yes" else "auto_rejected"
+                grader_stats[bucket] += 1
+                logger.info(
+                    f"---GRADE (PRE-FILTER): distance={distances[i]:.3f} -> {score}---"
                 )
-                score = grade.get("score", "no")
-
-                if score == "yes":
-                    logger.info("---GRADE: DOCUMENT RELEVANT---")
-                    filtered_docs.append(doc)
-                    filtered_sources.append(sources[i])
-                else:
-                    logger.info("---GRADE: DOCUMENT NOT RELEVANT (FILTERED)---")
+                return score == "yes"
+
+            async with semaphore:
+                grader_stats["llm_calls"] += 1
+                try:
+                    grade = await asyncio.wait_for(
+                        grader_chain.ainvoke({"question": question, "document": doc}),
+                        timeout=settings.GRADER_TIMEOUT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    grader_stats["timeouts"] += 1
+                    logger.warning(
+                        f"Grader timed out on document {i}. Counting as not relevant."
+                    )
+                    return False
+                except Exception as e:
+                    logger.warning(f"Grader error: {e}")
+                    return False
+
+            # The JSON parser may return a list or a bare string: not relevant.
+            return isinstance(grade, dict) and grade.get("score", "no") == "yes"
+
+        # Graded concurrently (bounded by GRADER_CONCURRENCY); gather keeps order.
+        verdicts = await asyncio.gather(
+            *(grade_one(i, doc) for i, doc in enumerate(documents))
+        )
 
-            except Exception as e:
-                logger.warning(f"Grader error: {e}")
-                continue
+        filtered_docs = []
+        filtered_sources = []
+        filtered_distances = []
+
+        for i, (doc, relevant) in enumerate(zip(documents, verdicts)):
+            if relevant:
+                logger.info("---GRADE: DOCUMENT RELEVANT---")
+                filtered_docs.append(doc)
+                filtered_sources.append(sources[i])
+                filtered_distances.append(distances[i])
+            else:
+                logger.info("---GRADE: DOCUMENT NOT RELEVANT (FILTERED)---")
 
         return {
             "documents": filtered_docs,
             "sources": filtered_sources,
+            "distances": filtered_distances,
             "question": question,
         }
 
@@ -106,9 +195,7 @@ class AgentNodes:
 
         context = "\n\n".join(documents)
 
-        generator_llm = LLMFactory.get_llm(temperature=0)
-
-        chain = GENERATOR_PROMPT | generator_llm
+        chain = GENERATOR_PROMPT | self.gen_llm
         reponse = await chain.ainvoke({"context": context, "question": question})
 
         return {"generation": reponse.content, "question": question}
@@ -134,7 +221,13 @@ class AgentNodes:
         """
         logger.info("---GENERATE REPORT (JINJA2)---")
         question = state["question"]
-        documents = state["documents"]
+        documents = list(state["documents"])
+
+        # Join the prefetch branches (see prefetch_forecast / prefetch_market)
+        note = state.get("forecast_note")
+        if note and note not in documents:
+            documents.append(note)
+        documents.extend(state.get("market_snapshot") or [])
 
         context = "\n\n".join(documents) if documents else "No internal data found."
         parser = JsonOutputParser(pydantic_object=FinancialSummary)
@@ -200,7 +293,8 @@ class AgentNodes:
 
         if current_step > 0 and docs:
             # Auto-enrich with CHRONOS forecast before generating the final report
-            if not state.get("forecast_data"):
+            # (skipped when a prefetch branch already fetched or tried it)
+            if not state.get("forecast_data") and not state.get("forecast_note"):
                 logger.info(
                     "Supervisor Logic: Data ready — auto-fetching CHRONOS forecast next."
                 )
@@ -211,14 +305,31 @@ class AgentNodes:
                 )
                 return {"next_step": "reporter_agent", "loop_step": current_step + 1}
 
+        # A new question must not reuse the previous question's enrichment.
+        reset = (
+            {"forecast_data": None, "forecast_note": None, "market_snapshot": None}
+            if current_step == 0
+            else {}
+        )
+
+        if settings.ROUTER_PREROUTE and current_step == 0:
+            next_step = await intent_router.route(question)
+            if next_step:
+                logger.info(f"Supervisor decided (pre-router): {next_step}")
+                return {"next_step": next_step, "loop_step": current_step + 1, **reset}
+
         try:
             result = await chain.ainvoke({"question": question, "len_docs": len(docs)})
             next_step = result.get("next_step", "reporter_agent")
             logger.info(f"Supervisor decided: {next_step}")
-            return {"next_step": next_step, "loop_step": current_step + 1}
+            return {"next_step": next_step, "loop_step": current_step + 1, **reset}
         except Exception as e:
             logger.error(f"Supervisor failed: {e}. Defaulting to reporter.")
-            return {"next_step": "reporter_agent", "loop_step": current_step + 1}
+            return {
+                "next_step": "reporter_agent",
+                "loop_step": current_step + 1,
+                **reset,
+            }
 
     async def quant_agent(self, state: AgentState) -> AgentState:
         logger.info("--- QUANT AGENT: CODING ---")
@@ -252,6 +363,13 @@ class AgentNodes:
         if not self.market_tools:
             self.market_tools = await load_mcp_tools()
 
+    @staticmethod
+    def batch_target(tool):
+        """
+        Name of the per-ticker tool a multi-ticker tool replaces, else None.
+        """
+        return (getattr(tool, "metadata", None) or {}).get("batch_for")
+
     async def market_agent(self, state: AgentState) -> AgentState:
         logger.info("---MARKET AGENT (MCP)---")
         question = state["question"]
@@ -260,16 +378,50 @@ class AgentNodes:
         if not self.market_tools:
             return {"documents": ["Error: Market tools unavailable."]}
 
-        words = question.split()
-        ticker = next((w for w in words if w.isupper() and len(w) <= 5), "AAPL")
-        results = []
+        tickers = extract_tickers(question)[: settings.MARKET_MAX_TICKERS] or ["AAPL"]
+
+        batch_tools = [t for t in self.market_tools if self.batch_target(t)]
+        single_tools = [t for t in self.market_tools if not self.batch_target(t)]
+
+        if len(tickers) > 1 and batch_tools:
+            # One upstream request per batch tool instead of one per ticker.
+            covered = {self.batch_target(t) for t in batch_tools}
+            calls = [(tool, tickers) for tool in batch_tools]
+            calls += [
+                (tool, ticker)
+                for ticker in tickers
+                for tool in single_tools
+                if tool.name not in covered
+            ]
+        else:
+            calls = [(tool, ticker) for ticker in tickers for tool in single_tools]
+
+        async def run_tool(tool, ticker):
+            # The tool starts the clock once it holds a pooled MCP session, so
+            # calls queued behind a busy pool are not timed out while waiting.
+            return await tool.coroutine(
+                ticker, timeout=settings.MARKET_TOOL_TIMEOUT_SECONDS
+            )
 
-        for tool in self.market_tools:
-            try:
-                res = await tool.coroutine(ticker)
-                results.append(f"[{tool.name}]: {res}")
-            except Exception as e:
-                logger.error(f"Tool error: {e}")
+        # Independent Yahoo lookups: latency is the slowest call, not the sum.
+        outcomes = await asyncio.gather(
+            *(run_tool(tool, ticker) for tool, ticker in calls),
+            return_exceptions=True,
+        )
+
+        results = []
+        for (tool, ticker), outcome in zip(calls, outcomes):
+            label = ticker if isinstance(ticker, str) else ", ".join(ticker)
+            if isinstance(outcome, Exception):
+                reason = (
+                    "timed out"
+                    if isinstance(outcome, asyncio.TimeoutError)
+                    else str(outcome)
+                )
+                logger.error(f"Tool error ({tool.name}, {label}): {reason}")
+                results.append(f"[{tool.name}] {label}: unavailable ({reason}).")
+            else:
+                results.append(f"[{tool.name}]: {outcome}")
 
         return {"documents": results}
 
@@ -283,64 +435,98 @@ class AgentNodes:
         logger.info("Human has updated the state. Resuming workflow...")
         return {"error_message": None, "next_step": "reporter_agent"}
 
+    @staticmethod
+    def forecast_note(ticker: str, forecast: dict | None) -> str:
+        """
+        Human-readable CHRONOS summary (or unavailability notice) for the LLM context.
+        """
+        if not forecast:
+            return (
+                f"[CHRONOS Forecast] Service unavailable for {ticker}. "
+                "Price prediction could not be retrieved at this time."
+            )
+        return (
+            f"[CHRONOS ML Forecast] Predicted close price for {forecast['ticker']} "
+            f"on {str(forecast['target_date'])[:10]}: "
+            f"${forecast['predicted_close']:.2f}. "
+            f"Champion model: {forecast['model_used']}. "
+            f"Environment: {forecast['environment']}."
+        )
+
     async def forecast_agent(self, state: AgentState) -> AgentState:
         """
-        Node: Calls the CHRONOS ML Forecasting API to obtain a price prediction.
+        Node: Calls the CHRONOS ML Forecasting API (through the shared forecast
+        cache) to obtain a price prediction.
         Automatically injected by the supervisor before report generation.
         Falls back gracefully if CHRONOS is unreachable.
         """
         logger.info("---FORECAST AGENT (CHRONOS)---")
         question = state["question"]
 
-        # Extract ticker from the question (same heuristic as market_agent)
-        words = question.split()
-        ticker = next(
-            (w for w in words if w.isupper() and 1 < len(w) <= 5),
-            "AAPL",
-        )
+        # Same ticker extraction as market_agent
+        ticker = next(iter(extract_tickers(question)), "AAPL")
         logger.info(f"Extracted ticker: {ticker} — calling CHRONOS API...")
 
-        forecast = await ChronosClient.get_forecast(ticker)
+        forecast = await forecast_cache.get_forecast(ticker)
 
         if not forecast:
             logger.warning(
                 f"CHRONOS unavailable for {ticker}. Continuing without forecast."
             )
-            unavailable_msg = (
-                f"[CHRONOS Forecast] Service unavailable for {ticker}. "
-                "Price prediction could not be retrieved at this time."
-            )
-            current_docs = state.get("documents", [])
-            return {
-                "documents": current_docs + [unavailable_msg],
-                "forecast_data": None,
-            }
-
-        # Format a human-readable summary for the LLM context
-        summary = (
-            f"[CHRONOS ML Forecast] Predicted close price for {forecast['ticker']} "
-            f"on {str(forecast['target_date'])[:10]}: "
-            f"${forecast['predicted_close']:.2f}. "
-            f"Champion model: {forecast['model_used']}. "
-            f"Environment: {forecast['environment']}."
-        )
 
         current_docs = state.get("documents", [])
         return {
-            "documents": current_docs + [summary],
+            "documents": current_docs + [self.forecast_note(ticker, forecast)],
             "forecast_data": forecast,
         }
 
-    async def route_supervisor(
-        self, state: AgentState
-    ) -> Literal[
-        "retrieve",
-        "quant_agent",
-        "market_agent",
-        "human_intervention",
-        "reporter_agent",
-        "forecast_agent",
-    ]:
+    async def prefetch_forecast(self, state: AgentState) -> AgentState:
+        """
+        Node (parallel branch): fetches the CHRONOS forecast while the main
+        branch gathers data. Writes only its own keys, never 'documents',
+        so it can run in the same step as retrieve / market / quant; the
+        note is added to the report context by generate_report.
+        """
+        logger.info("---PREFETCH FORECAST (CHRONOS)---")
+        ticker = extract_tickers(state["question"])[0]
+        forecast = await forecast_cache.get_forecast(ticker)
+        return {
+            "forecast_data": forecast,
+            "forecast_note": self.forecast_note(ticker, forecast),
+        }
+
+    async def prefetch_market(self, state: AgentState) -> AgentState:
+        """
+        Node (parallel branch): market snapshot for the report, stored apart
+        from 'documents' so retrieval grading never sees it.
+        """
+        logger.info("---PREFETCH MARKET SNAPSHOT (MCP)---")
+        result = await self.market_agent(state)
+        return {"market_snapshot": result["documents"]}
+
+    def prefetch_branches(self, state: AgentState, next_node: str) -> list[str]:
+        """
+        Speculative branches to run alongside the chosen data-gathering node.
+        They only depend on the ticker in the question, so there is no reason
+        to wait for retrieval and grading (and an extra supervisor hop).
+        """
+        if next_node not in ("retrieve", "market_agent", "quant_agent"):
+            return []
+        if not extract_tickers(state.get("question") or ""):
+            return []
+
+        branches = []
+        if settings.GRAPH_PREFETCH_FORECAST and not state.get("forecast_data"):
+            branches.append("prefetch_forecast")
+        if (
+            settings.GRAPH_PREFETCH_MARKET
+            and next_node != "market_agent"
+            and not state.get("market_snapshot")
+        ):
+            branches.append("prefetch_market")
+        return branches
+
+    async def route_supervisor(self, state: AgentState) -> str | list[str]:
         next_node = state.get("next_step")
         current_step = state.get("loop_step", 0)
         max_loops = 15
@@ -354,11 +540,11 @@ class AgentNodes:
         logger.info(f"Router directing to: {next_node}")
 
         if next_node == "research_agent":
-            return "retrieve"
+            destination = "retrieve"
         elif next_node == "quant_agent":
-            return "quant_agent"
+            destination = "quant_agent"
         elif next_node == "market_agent":
-            return "market_agent"
+            destination = "market_agent"
         elif next_node == "human_intervention":
             return "human_intervention"
         elif next_node == "forecast_agent":
@@ -368,6 +554,12 @@ class AgentNodes:
         else:
             return "reporter_agent"
 
+        branches = self.prefetch_branches(state, destination)
+        if branches:
+            logger.info(f"Prefetching in parallel: {branches}")
+            return [destination, *branches]
+        return destination
+
     async def route_search(
         self, state: AgentState
     ) -> Literal["web_search", "supervisor"]:
@@ -10,9 +10,18 @@ class AgentState(TypedDict):
     documents: List[str]
     generation: str
     sources: List[str]
+    distances: List[
+        float
+    ]  # Cosine distance of each retrieved document (aligned with 'documents')
     next_step: Optional[str]
     loop_step: int
     error_message: Optional[str]
     forecast_data: Optional[
         dict
     ]  # Raw CHRONOS API response — populated by forecast_agent
+    forecast_note: Optional[
+        str
+    ]  # CHRONOS summary for the report context — populated by prefetch_forecast
+    market_snapshot: Optional[
+        List[str]
+    ]  # MCP market data for the report context — populated by prefetch_market
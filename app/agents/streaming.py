@@ -0,0 +1,78 @@
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Graph nodes whose LLM tokens are forwarded to the client: only
+# 'reporter_agent' (generate_report) writes the final answer.
+TOKEN_NODES = {"reporter_agent"}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def final_payload(values: dict) -> tuple[str, dict]:
+    """
+    Same result shape as POST /chat/agent.
+    """
+    if values.get("next_step") == "human_intervention":
+        return "paused", {
+            "status": "PAUSED",
+            "message": "Agent paused for human intervention.",
+            "error": values.get("error_message"),
+        }
+    return "completed", {
+        "status": "COMPLETED",
+        "answer": values.get("generation"),
+        "sources": values.get("sources", []),
+    }
+
+
+async def stream_agent_run(
+    agent,
+    graph_input: Optional[dict],
+    config: dict,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    """
+    Runs the graph through astream_events and yields SSE frames:
+    'node_start' / 'node_end' for every node transition, 'token' for LLM
+    deltas of TOKEN_NODES, then a final 'completed' / 'paused' frame (or
+    'error'). Stops the graph run as soon as the client goes away.
+    """
+    yield sse_event("start", {"thread_id": config["configurable"]["thread_id"]})
+
+    events = agent.astream_events(graph_input, config, version="v2")
+    try:
+        async for event in events:
+            if await is_disconnected():
+                logger.info("SSE client disconnected; cancelling agent run.")
+                return
+
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            if kind in ("on_chain_start", "on_chain_end") and event["name"] == node:
+                phase = "node_start" if kind == "on_chain_start" else "node_end"
+                yield sse_event(phase, {"node": node})
+
+            elif kind == "on_chat_model_stream" and node in TOKEN_NODES:
+                content = event["data"]["chunk"].content
+                if content:
+                    yield sse_event("token", {"node": node, "content": content})
+
+        snapshot = await agent.aget_state(config)
+        yield sse_event(*final_payload(snapshot.values))
+
+    except asyncio.CancelledError:
+        logger.info("SSE stream cancelled; agent run stopped.")
+        raise
+    except Exception as e:
+        logger.error(f"Streaming agent run failed: {e}")
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        # Closing the generator cancels the in-flight node (and its LLM call).
+        await events.aclose()
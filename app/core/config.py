@@ -24,6 +24,102 @@ class Settings(BaseSettings):
 
     INSTANCE_CONNECTION_NAME: Optional[str] = None
 
+    # Shared LLM clients (HTTP connection pool per client)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY: float = 60.0
+
+    # Query embedding micro-batching (EmbeddingService.aembed)
+    EMBEDDING_MAX_BATCH_SIZE: int = 32
+    EMBEDDING_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_EXECUTOR_WORKERS: int = 1
+
+    # Query embedding LRU + TTL cache (set EMBEDDING_CACHE_PATH to persist on disk)
+    EMBEDDING_CACHE_SIZE: int = 2048
+    EMBEDDING_CACHE_TTL_SECONDS: int = 86400
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+
+    # pgvector ANN index on financial_reports.embedding ("hnsw" | "ivfflat" | "none")
+    VECTOR_INDEX_TYPE: str = "hnsw"
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    HNSW_EF_SEARCH: int = 40
+    IVFFLAT_LISTS: Optional[int] = None  # None: rows/1000 (sqrt(rows) above 1M)
+    IVFFLAT_PROBES: int = 10
+    # pgvector >= 0.8 iterative scans for filtered searches ("relaxed_order" | "off")
+    VECTOR_ITERATIVE_SCAN: str = "relaxed_order"
+
+    # Grader pre-filter: conclusive cosine distances skip the LLM grader.
+    # Both cutoffs are off (None) until calibrated against the deployed
+    # embedding model with scripts/benchmarks/grader_calibration.py.
+    GRADER_PREFILTER: bool = True
+    GRADER_AUTO_ACCEPT_DISTANCE: Optional[float] = None
+    GRADER_AUTO_REJECT_DISTANCE: Optional[float] = None
+    # Concurrent LLM grading
+    GRADER_CONCURRENCY: int = 4
+    GRADER_TIMEOUT_SECONDS: float = 20.0
+
+    # MCP finance server session pool
+    MCP_SERVER_SCRIPT: str = "app/mcp/finance_server.py"
+    MCP_POOL_SIZE: int = 2
+    MCP_CALL_TIMEOUT_SECONDS: float = 30.0
+    MCP_HEALTH_CHECK_INTERVAL_SECONDS: float = 30.0
+    MARKET_TOOL_TIMEOUT_SECONDS: float = 10.0
+    MARKET_MAX_TICKERS: int = 5
+
+    # CHRONOS forecasting API client
+    CHRONOS_HTTP2: bool = True
+    CHRONOS_TIMEOUT_SECONDS: float = 8.0
+    CHRONOS_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    CHRONOS_MAX_CONNECTIONS: int = 10
+    CHRONOS_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    CHRONOS_MAX_RETRIES: int = 2
+    CHRONOS_RETRY_BACKOFF_SECONDS: float = 0.25
+    CHRONOS_BREAKER_FAILURE_THRESHOLD: int = 5
+    CHRONOS_BREAKER_RESET_SECONDS: float = 30.0
+    CHRONOS_BATCH_PATH: str = "/forecast/batch"  # used only if in /openapi.json
+    CHRONOS_BATCH_CONCURRENCY: int = 4
+    # Forecast cache (Postgres, keyed by ticker + target_date)
+    FORECAST_CACHE_ENABLED: bool = True
+    FORECAST_CACHE_TTL_SECONDS: int = 3600
+    FORECAST_CACHE_STALE_SECONDS: int = 86400
+    # Graph: run CHRONOS (and optionally a market snapshot) next to research
+    GRAPH_PREFETCH_FORECAST: bool = True
+    GRAPH_PREFETCH_MARKET: bool = False
+
+    # Supervisor pre-router (keyword rules + embedding similarity before the LLM)
+    ROUTER_PREROUTE: bool = True
+    ROUTER_USE_EMBEDDINGS: bool = True
+    ROUTER_EMBEDDING_THRESHOLD: float = 0.8
+    ROUTER_EMBEDDING_MARGIN: float = 0.05
+
+    # Background agent jobs (POST /jobs/agent, Postgres SKIP LOCKED queue)
+    # Workers run inside the API process: on Cloud Run this needs CPU always
+    # allocated (--no-cpu-throttling --min-instances=1 in deploy.yml, billed
+    # around the clock) or jobs starve after the 202 response.
+    JOB_WORKERS_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2  # graphs run at once per API process
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_STALE_SECONDS: int = (
+        900  # 'running' jobs without a heartbeat this long were lost
+    )
+    JOB_HEARTBEAT_SECONDS: float = 60.0  # must stay well below JOB_STALE_SECONDS
+    JOB_MAX_ATTEMPTS: int = 3
+
+    # Semantic answer cache (/chat/simple, /chat/agent), scoped by tickers + corpus version
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY: float = 0.95  # min cosine similarity to reuse an answer
+    ANSWER_CACHE_TTL_SECONDS: int = 86400  # /chat/simple: filings only
+    ANSWER_CACHE_AGENT_TTL_SECONDS: int = 300  # reports embed live prices/forecasts
+
+    # Ingestion pipeline (scripts/ingest/vectorize.py)
+    INGEST_EMBED_BATCH_SIZE: int = 64  # chunks per embed_documents call
+    INGEST_PIPELINE_DEPTH: int = 2  # embedded batches buffered before persist
+    INGEST_COPY_BATCH_ROWS: int = 5000  # rows per binary COPY transaction
+    INGEST_WORKERS: int = 1  # ingest processes claiming files (--workers)
+    INGEST_STALE_SECONDS: int = 600  # 'embedding' files without progress were lost
+    INGEST_MAX_ATTEMPTS: int = 3
+
     @property
     def DATABASE_URL(self) -> str:
         """
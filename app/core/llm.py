@@ -1,33 +1,87 @@
 import logging
 import os
+import threading
+import httpx
 import torch
 from langchain_ollama import ChatOllama
 from langchain_google_vertexai import ChatVertexAI, VertexAIEmbeddings
 from langchain_huggingface import HuggingFaceEmbeddings
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class LLMFactory:
+    # Process-wide registry of chat clients keyed by
+    # (provider, model, temperature, json_mode). Clients are stateless between
+    # calls, so one instance (and its HTTP connection pool) is shared by every
+    # node/request that asks for the same configuration.
+    _clients: dict[tuple, object] = {}
+    _lock = threading.Lock()
+
     @staticmethod
-    def get_llm(temperature=0, json_mode=False):
-        """
-        Returns the LLM configured according to the environment (Local vs Prod).
-        """
+    def _resolve_provider() -> tuple[str, str]:
         env = os.getenv("ENVIRONMENT", "local").lower()
-
         if env == "production":
-            logger.info("Using Vertex AI (Gemini Flash lite)")
-            model_name = "gemini-2.5-flash-lite"
+            return "vertexai", "gemini-2.5-flash-lite"
+        return "ollama", "llama3.2"
+
+    @staticmethod
+    def _create_llm(provider: str, model_name: str, temperature, json_mode: bool):
+        if provider == "vertexai":
+            logger.info(f"Creating Vertex AI client ({model_name})")
             return ChatVertexAI(
                 model_name=model_name,
                 temperature=temperature,
                 convert_system_message_to_human=True,
             )
-        else:
-            logger.info("Using Ollama (Llama 3.2)")
-            fmt = "json" if json_mode else None
-            return ChatOllama(model="llama3.2", temperature=temperature, format=fmt)
+
+        logger.info(f"Creating Ollama client ({model_name}, json_mode={json_mode})")
+        fmt = "json" if json_mode else None
+        limits = httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+        )
+        return ChatOllama(
+            model=model_name,
+            temperature=temperature,
+            format=fmt,
+            client_kwargs={"limits": limits},
+        )
+
+    @classmethod
+    def get_llm(cls, temperature=0, json_mode=False):
+        """
+        Returns the shared LLM client configured according to the environment
+        (Local vs Prod). The client is created on first use and reused afterwards.
+        """
+        provider, model_name = cls._resolve_provider()
+        key = (provider, model_name, float(temperature), bool(json_mode))
+
+        llm = cls._clients.get(key)
+        if llm is None:
+            with cls._lock:
+                llm = cls._clients.get(key)
+                if llm is None:
+                    llm = cls._create_llm(provider, model_name, temperature, json_mode)
+                    cls._clients[key] = llm
+        return llm
+
+    @classmethod
+    def client_count(cls) -> int:
+        """
+        Number of live chat clients in the registry.
+        """
+        return len(cls._clients)
+
+    @classmethod
+    def reset(cls):
+        """
+        Drops every cached client (tests / provider switch).
+        """
+        with cls._lock:
+            cls._clients.clear()
 
     @staticmethod
     def get_embeddings():
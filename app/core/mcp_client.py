@@ -1,51 +1,290 @@
 import shutil
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from langchain_core.tools import Tool
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+mcp_manager = None
+_manager_lock = asyncio.Lock()  # one lazy pool start, however many callers race
 
-async def load_mcp_tools():
-    """
-    Connects to the local MCP Finance Server and converts its capabilities
-    into LangChain Tools usable by our Agent.
-    """
+# Multi-ticker server tools and the per-ticker tool each one replaces.
+BATCH_TOOLS = {
+    "get_stock_prices": "get_stock_price",
+    "get_company_infos": "get_company_info",
+}
+
+
+def get_server_params() -> StdioServerParameters:
     python_executable = shutil.which("python")
-    server_params = StdioServerParameters(
+    return StdioServerParameters(
         command=python_executable,
-        args=["app/mcp/finance_server.py"],
+        args=[settings.MCP_SERVER_SCRIPT],
     )
 
-    tools = []
 
-    try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                mcp_tools = await session.list_tools()
-
-                for tool in mcp_tools.tools:
-
-                    async def _tool_wrapper(query: str, tool_name=tool.name):
-                        async with stdio_client(server_params) as (r, w):
-                            async with ClientSession(r, w) as s:
-                                await s.initialize()
-                                result = await s.call_tool(
-                                    tool_name, arguments={"ticker": query}
-                                )
-                                return result.content[0].text
-
-                    lc_tool = Tool(
-                        name=tool.name,
-                        func=None,
-                        coroutine=_tool_wrapper,
-                        description=tool.description,
+class MCPSessionWorker:
+    """
+    Owns one finance_server subprocess and its initialized ClientSession.
+
+    The stdio transport and the session are entered and exited inside a
+    single background task (anyio cancel scopes require it); callers only
+    borrow the live session.
+    """
+
+    def __init__(self, server_params: StdioServerParameters, worker_id: int):
+        self.server_params = server_params
+        self.worker_id = worker_id
+        self.session = None
+        self._task = None
+        self._ready = None
+        self._stop = None
+        self._error = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self):
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        logger.info(f"MCP session #{self.worker_id} ready.")
+
+    async def _run(self):
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.error(f"MCP session #{self.worker_id} terminated: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(
+                self.session.send_ping(), timeout=settings.MCP_CALL_TIMEOUT_SECONDS
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"MCP session #{self.worker_id} failed health check: {e}")
+            return False
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+        self._task = None
+        self.session = None
+
+
+class MCPClientManager:
+    """
+    Long-lived pool of initialized MCP sessions, started in the app lifespan.
+    Tool calls borrow an idle session instead of spawning a subprocess.
+    Dead servers are restarted on checkout and by a periodic health check.
+    """
+
+    def __init__(self, pool_size: int = 2, server_params=None):
+        self.pool_size = pool_size
+        self.server_params = server_params or get_server_params()
+        self.workers: list[MCPSessionWorker] = []
+        self.tool_definitions = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._health_task = None
+        self.restarts = 0
+        self.calls = 0
+
+    async def start(self):
+        self.workers = [
+            MCPSessionWorker(self.server_params, i) for i in range(self.pool_size)
+        ]
+        results = await asyncio.gather(
+            *(w.start() for w in self.workers), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            await self.stop()
+            raise errors[0]
+
+        for worker in self.workers:
+            self._idle.put_nowait(worker)
+
+        async with self.session() as session:
+            self.tool_definitions = (await session.list_tools()).tools
+
+        self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(
+            f"MCP pool ready: {self.pool_size} sessions, "
+            f"tools={[t.name for t in self.tool_definitions]}"
+        )
+
+    async def stop(self):
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        await asyncio.gather(*(w.stop() for w in self.workers), return_exceptions=True)
+        self.workers = []
+
+    async def _restart(self, worker: MCPSessionWorker):
+        logger.warning(f"Restarting MCP session #{worker.worker_id}...")
+        await worker.stop()
+        await worker.start()
+        self.restarts += 1
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Borrows an idle session, restarting its server first if it died.
+        """
+        worker = await self._idle.get()
+        try:
+            if not worker.alive:
+                await self._restart(worker)
+            yield worker.session
+        finally:
+            self._idle.put_nowait(worker)
+
+    async def call_tool(
+        self, tool_name: str, arguments: dict, timeout: float | None = None
+    ) -> str:
+        """
+        The timeout (default MCP_CALL_TIMEOUT_SECONDS) starts once a session
+        is checked out: queueing for a busy pool never eats the call budget.
+        """
+        self.calls += 1
+        async with self.session() as session:
+            result = await asyncio.wait_for(
+                session.call_tool(tool_name, arguments=arguments),
+                timeout=timeout or settings.MCP_CALL_TIMEOUT_SECONDS,
+            )
+            return result.content[0].text
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(settings.MCP_HEALTH_CHECK_INTERVAL_SECONDS)
+            # Only check idle sessions; busy ones prove their health by answering.
+            for _ in range(self._idle.qsize()):
+                worker = self._idle.get_nowait()
+                try:
+                    if not await worker.ping():
+                        await self._restart(worker)
+                except Exception as e:
+                    logger.error(f"MCP health check could not restart session: {e}")
+                finally:
+                    self._idle.put_nowait(worker)
+
+    def get_tools(self) -> list[Tool]:
+        """
+        Exposes the ticker-based server tools as LangChain Tools backed by the
+        pool; their coroutines take an optional per-call 'timeout' (see
+        call_tool). Multi-ticker tools accept a list or a comma-separated string and
+        carry metadata["batch_for"] naming the per-ticker tool they replace.
+        Tools without a ticker argument (e.g. get_cache_stats) stay reachable
+        through call_tool().
+        """
+        tools = []
+        for tool in self.tool_definitions:
+            properties = (tool.inputSchema or {}).get("properties", {})
+
+            if "ticker" in properties:
+
+                async def _tool_wrapper(query: str, tool_name=tool.name, timeout=None):
+                    return await self.call_tool(
+                        tool_name, {"ticker": query}, timeout=timeout
                     )
-                    tools.append(lc_tool)
-                    logger.info(f"MCP Tool Loaded: {tool.name}")
 
+                metadata = {}
+            elif "tickers" in properties:
+
+                async def _tool_wrapper(query, tool_name=tool.name, timeout=None):
+                    if isinstance(query, str):
+                        query = [t.strip() for t in query.split(",") if t.strip()]
+                    return await self.call_tool(
+                        tool_name, {"tickers": list(query)}, timeout=timeout
+                    )
+
+                metadata = {"batch_for": BATCH_TOOLS.get(tool.name)}
+            else:
+                continue
+
+            tools.append(
+                Tool(
+                    name=tool.name,
+                    func=None,
+                    coroutine=_tool_wrapper,
+                    description=tool.description,
+                    metadata=metadata,
+                )
+            )
+        return tools
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "alive": sum(1 for w in self.workers if w.alive),
+            "idle": self._idle.qsize(),
+            "calls": self.calls,
+            "restarts": self.restarts,
+        }
+
+
+async def start_mcp_manager():
+    global mcp_manager
+    manager = MCPClientManager(pool_size=settings.MCP_POOL_SIZE)
+    await manager.start()
+    mcp_manager = manager
+
+
+async def stop_mcp_manager():
+    global mcp_manager
+    if mcp_manager:
+        await mcp_manager.stop()
+        mcp_manager = None
+
+
+def get_mcp_manager():
+    return mcp_manager
+
+
+async def load_mcp_tools():
+    """
+    Returns the MCP Finance Server capabilities as LangChain Tools usable by
+    our Agent, backed by the shared session pool (started on first use when
+    running outside the API lifespan).
+    """
+    try:
+        async with _manager_lock:
+            if get_mcp_manager() is None:
+                await start_mcp_manager()
+
+        tools = get_mcp_manager().get_tools()
+        for tool in tools:
+            logger.info(f"MCP Tool Loaded: {tool.name}")
         return tools
 
     except Exception as e:
@@ -0,0 +1,146 @@
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Optional
+from pgvector.asyncpg import register_vector
+from app.core.config import settings
+from app.db.session import engine
+from app.db.vector_index import TABLE_NAME, create_vector_index, drop_vector_index
+
+logger = logging.getLogger(__name__)
+
+COPY_COLUMNS = (
+    "company_ticker",
+    "year",
+    "report_type",
+    "section",
+    "content",
+    "embedding",
+    "source_id",
+    "content_hash",
+    "created_at",
+)
+
+STAGE_TABLE = f"{TABLE_NAME}_stage"
+STAGE_DDL = (
+    f"CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS "
+    f"SELECT {', '.join(COPY_COLUMNS)} FROM {TABLE_NAME} WITH NO DATA"
+)
+MERGE_SQL = (
+    f"INSERT INTO {TABLE_NAME} ({', '.join(COPY_COLUMNS)}) "
+    f"SELECT {', '.join(COPY_COLUMNS)} FROM {STAGE_TABLE} "
+    "ON CONFLICT (source_id, content_hash) DO UPDATE SET "
+    "section = EXCLUDED.section, embedding = EXCLUDED.embedding"
+)
+
+
+def report_record(
+    ticker: str,
+    year: int,
+    report_type: str,
+    section: str,
+    content: str,
+    embedding: list[float],
+    source_id: Optional[str] = None,
+    content_hash: Optional[str] = None,
+) -> tuple:
+    """
+    One financial_reports row in COPY_COLUMNS order.
+    """
+    return (
+        ticker,
+        year,
+        report_type,
+        section,
+        content,
+        embedding,
+        source_id,
+        content_hash,
+        datetime.utcnow(),
+    )
+
+
+async def suspend_vector_index(engine=engine):
+    """
+    Drops the ANN index before a large load (see rebuild_vector_index).
+    """
+    if settings.VECTOR_INDEX_TYPE.lower() != "none":
+        async with engine.begin() as conn:
+            await drop_vector_index(conn)
+
+
+async def rebuild_vector_index(engine=engine):
+    if settings.VECTOR_INDEX_TYPE.lower() != "none":
+        logger.info("Rebuilding vector index after bulk load...")
+        async with engine.begin() as conn:
+            await create_vector_index(conn)
+
+
+class ReportBulkLoader:
+    """
+    Streams financial_reports rows into Postgres with binary COPY
+    (asyncpg copy_records_to_table) instead of one INSERT per ORM object.
+
+    Rows are loaded in transactions of 'batch_size' rows, so a failure only
+    loses the batch in flight. Each batch is COPied into a temporary staging
+    table and merged with INSERT ... ON CONFLICT (source_id, content_hash),
+    so reloading a chunk updates it instead of duplicating it.
+
+    With rebuild_index=True the ANN index is dropped on enter and rebuilt
+    once on exit: for large loads one bulk build is much cheaper than
+    maintaining the graph row by row.
+
+        async with ReportBulkLoader(rebuild_index=True) as loader:
+            await loader.load(records)
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        rebuild_index: bool = False,
+        engine=engine,
+    ):
+        self.batch_size = batch_size or settings.INGEST_COPY_BATCH_ROWS
+        self.rebuild_index = rebuild_index
+        self.engine = engine
+        self.rows_loaded = 0
+        self._conn = None
+        self._driver = None
+
+    async def __aenter__(self):
+        if self.rebuild_index:
+            await suspend_vector_index(self.engine)
+
+        self._conn = await self.engine.connect()
+        self._driver = (await self._conn.get_raw_connection()).driver_connection
+        # Binary codec for the 'vector' type (COPY ... FORMAT binary).
+        await register_vector(self._driver)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # The codec above is not what SQLAlchemy expects: never return this
+        # connection to the pool.
+        await self._conn.invalidate()
+        await self._conn.close()
+
+        if self.rebuild_index:
+            await rebuild_vector_index(self.engine)
+
+    async def load(self, records: Iterable[tuple]) -> int:
+        """
+        COPYs 'records' (see report_record) and returns the row count.
+        """
+        loaded = 0
+        iterator = iter(records)
+        while batch := list(islice(iterator, self.batch_size)):
+            async with self._driver.transaction():
+                await self._driver.execute(STAGE_DDL)
+                await self._driver.copy_records_to_table(
+                    STAGE_TABLE, records=batch, columns=COPY_COLUMNS
+                )
+                await self._driver.execute(MERGE_SQL)
+            loaded += len(batch)
+            logger.debug(f"COPY batch of {len(batch)} rows into {TABLE_NAME}.")
+
+        self.rows_loaded += loaded
+        return loaded
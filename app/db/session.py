@@ -5,9 +5,22 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 from sqlmodel import SQLModel
 from app.core.config import settings
+from app.db.vector_index import ensure_vector_index
 
 logger = logging.getLogger(__name__)
 
+# create_all() never alters existing tables: columns added after the first
+# deployment are upgraded here (idempotent).
+SCHEMA_UPGRADES = [
+    "ALTER TABLE financial_reports ADD COLUMN IF NOT EXISTS source_id VARCHAR",
+    "ALTER TABLE financial_reports ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_financial_reports_source_hash "
+    "ON financial_reports (source_id, content_hash)",
+    "CREATE INDEX IF NOT EXISTS ix_financial_reports_ticker_year_type "
+    "ON financial_reports (company_ticker, year, report_type)",
+    "ALTER TABLE agent_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP",
+]
+
 engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
 async_session_factory = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -52,7 +65,8 @@ async def init_db():
     Initializes the database:
     1. Ensures the DB exists (using maintenance connection).
     2. Installs extensions (pgvector).
-    3. Creates tables.
+    3. Creates tables (and applies SCHEMA_UPGRADES to existing ones).
+    4. Builds the ANN vector index (HNSW / IVFFlat, see VECTOR_INDEX_TYPE).
     Includes retry logic for Docker startup race conditions.
     """
     retries = 5
@@ -67,6 +81,10 @@ async def init_db():
                 await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
                 logger.info("Creating tables...")
                 await conn.run_sync(SQLModel.metadata.create_all)
+                for ddl in SCHEMA_UPGRADES:
+                    await conn.execute(text(ddl))
+                logger.info("Ensuring vector index...")
+                await ensure_vector_index(conn)
 
             logger.info("Database initialized successfully.")
             return
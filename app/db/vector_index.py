@@ -0,0 +1,158 @@
+import math
+import logging
+from typing import Optional
+from sqlalchemy import text
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "financial_reports"
+VECTOR_COLUMN = "embedding"
+INDEX_METHODS = ("hnsw", "ivfflat")
+
+
+def index_name(method: str, ticker: Optional[str] = None) -> str:
+    if ticker:
+        return f"ix_{TABLE_NAME}_{VECTOR_COLUMN}_{method}_{ticker.lower()}"
+    return f"ix_{TABLE_NAME}_{VECTOR_COLUMN}_{method}"
+
+
+def ivfflat_lists(rows: int) -> int:
+    """
+    pgvector's sizing rule for IVFFlat: rows / 1000 lists up to 1M rows,
+    sqrt(rows) above that (at least one list).
+    """
+    if rows > 1_000_000:
+        return int(math.sqrt(rows))
+    return max(rows // 1000, 1)
+
+
+async def count_rows(conn, ticker: Optional[str] = None) -> int:
+    """Rows the index will cover (only the ticker's for a partial index)."""
+    sql = f"SELECT count(*) FROM {TABLE_NAME}"
+    params = {}
+    if ticker:
+        sql += " WHERE company_ticker = :ticker"
+        params["ticker"] = ticker.upper()
+    result = await conn.execute(text(sql), params)
+    return int(result.scalar() or 0)
+
+
+def build_index_ddl(
+    method: str,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    lists: Optional[int] = None,
+    concurrently: bool = False,
+    ticker: Optional[str] = None,
+) -> str:
+    """
+    Builds the CREATE INDEX statement for a pgvector ANN index on the
+    embedding column (cosine distance, matching RetrievalService).
+    With 'ticker', builds a partial index (WHERE company_ticker = ...) so
+    filtered searches on a hot company get their own small graph.
+    """
+    method = method.lower()
+    if method == "hnsw":
+        m = m or settings.HNSW_M
+        ef_construction = ef_construction or settings.HNSW_EF_CONSTRUCTION
+        params = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    elif method == "ivfflat":
+        lists = lists or settings.IVFFLAT_LISTS or ivfflat_lists(0)
+        params = f"lists = {int(lists)}"
+    else:
+        raise ValueError(f"Unsupported vector index method: {method}")
+
+    concurrently_sql = "CONCURRENTLY " if concurrently else ""
+    ddl = (
+        f"CREATE INDEX {concurrently_sql}IF NOT EXISTS {index_name(method, ticker)} "
+        f"ON {TABLE_NAME} USING {method} ({VECTOR_COLUMN} vector_cosine_ops) "
+        f"WITH ({params})"
+    )
+    if ticker:
+        if not ticker.isalnum():
+            raise ValueError(f"Invalid ticker for partial index: {ticker}")
+        ddl += f" WHERE company_ticker = '{ticker.upper()}'"
+    return ddl
+
+
+async def create_vector_index(conn, method: Optional[str] = None, **params):
+    """
+    Creates the ANN index (no-op if it already exists).
+    'conn' is an AsyncConnection or AsyncSession. IVFFlat lists come from
+    'lists', else IVFFLAT_LISTS, else the current row count.
+    """
+    method = (method or settings.VECTOR_INDEX_TYPE).lower()
+    if method == "ivfflat" and not (params.get("lists") or settings.IVFFLAT_LISTS):
+        rows = await count_rows(conn, params.get("ticker"))
+        params["lists"] = ivfflat_lists(rows)
+        logger.info(f"IVFFlat lists = {params['lists']} for {rows} rows.")
+    ddl = build_index_ddl(method, **params)
+    logger.info(f"Ensuring vector index: {ddl}")
+    await conn.execute(text(ddl))
+
+
+async def drop_vector_index(
+    conn, method: Optional[str] = None, ticker: Optional[str] = None
+):
+    method = (method or settings.VECTOR_INDEX_TYPE).lower()
+    name = index_name(method, ticker)
+    logger.info(f"Dropping vector index {name}...")
+    await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+async def list_vector_indexes(conn) -> list[dict]:
+    result = await conn.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexdef ILIKE :pattern"
+        ),
+        {"table": TABLE_NAME, "pattern": "%vector_cosine_ops%"},
+    )
+    return [{"name": row[0], "definition": row[1]} for row in result.all()]
+
+
+async def ensure_vector_index(conn):
+    """
+    Called from init_db(). Builds the configured index unless VECTOR_INDEX_TYPE
+    is 'none'. IVFFlat lists are computed from the rows present at build
+    time, so rebuild with scripts/db/manage_index.py after large ingestions.
+    """
+    method = settings.VECTOR_INDEX_TYPE.lower()
+    if method == "none":
+        logger.info("Vector index disabled (VECTOR_INDEX_TYPE=none).")
+        return
+    await create_vector_index(conn, method)
+
+
+async def apply_search_params(
+    session,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    filtered: bool = False,
+):
+    """
+    Sets the per-query ANN knobs for the current transaction only
+    (SET LOCAL), so pooled connections never leak them to other requests.
+    Filtered searches also enable pgvector iterative index scans, so the
+    index keeps producing candidates until enough rows pass the WHERE clause
+    instead of returning too few results or falling back to a full scan.
+    """
+    method = settings.VECTOR_INDEX_TYPE.lower()
+    if method not in INDEX_METHODS:
+        return
+
+    if method == "hnsw":
+        ef_search = ef_search or settings.HNSW_EF_SEARCH
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    else:
+        probes = probes or settings.IVFFLAT_PROBES
+        await session.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+
+    iterative_scan = settings.VECTOR_ITERATIVE_SCAN.lower()
+    if filtered and iterative_scan in ("relaxed_order", "strict_order"):
+        if method == "ivfflat":
+            iterative_scan = "relaxed_order"  # only mode IVFFlat supports
+        await session.execute(
+            text(f"SET LOCAL {method}.iterative_scan = {iterative_scan}")
+        )
@@ -2,18 +2,34 @@ from dotenv import load_dotenv
 import logging
 from typing import Optional
 from pydantic import BaseModel
-from fastapi import FastAPI, Depends, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Depends, Request, Header, HTTPException
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from sqlalchemy.sql import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import init_db, get_session
+from app.db.session import init_db, get_session, async_session_factory
 from app.services.retriever import RetrievalService
 from app.services.rag import RAGService
-from app.agents.graph import TitanGraph
+from app.agents.graph import init_graph, get_graph
+from app.agents.streaming import stream_agent_run
+from app.agents.job_worker import start_job_workers, stop_job_workers, get_job_pool
+from app.services.job_queue import enqueue_agent_job, get_job
+from app.core.config import settings
 from app.core.db_pool import open_pool, close_pool
+from app.core.llm import LLMFactory
+from app.core.mcp_client import start_mcp_manager, stop_mcp_manager, get_mcp_manager
+from app.services.embedder import embedder
+from app.services.chronos_client import (
+    open_chronos_client,
+    close_chronos_client,
+    get_chronos_stats,
+)
+from app.services.forecast_cache import forecast_cache
+from app.services.intent_router import get_router_stats
+from app.services.answer_cache import answer_cache, get_answer_cache_stats
+from app.agents.nodes import grader_stats
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -27,10 +43,26 @@ async def lifespan(app: FastAPI):
         logger.info("System Ready.")
         await open_pool()
         logger.info("LangGraph Persistence Pool Ready.")
+        await init_graph()
+        logger.info("TITAN Agent Graph Ready.")
+        await open_chronos_client()
+        logger.info("CHRONOS HTTP Client Ready.")
     except Exception as e:
         logger.error(f"Critical Startup Error: {e}")
         raise e
+    try:
+        await start_mcp_manager()
+        logger.info("MCP Session Pool Ready.")
+    except Exception as e:
+        # Market data is optional: the market_agent reports it as unavailable.
+        logger.error(f"MCP Session Pool failed to start: {e}")
+    if settings.JOB_WORKERS_ENABLED:
+        await start_job_workers()
+        logger.info("Agent Job Workers Ready.")
     yield
+    await stop_job_workers()
+    await stop_mcp_manager()
+    await close_chronos_client()
     await close_pool()
     logger.info("TITAN System: SHUTTING DOWN...")
 
@@ -70,6 +102,12 @@ class AgentRequest(BaseModel):
     thread_id: str = "default_thread"
 
 
+class AgentJobRequest(BaseModel):
+    question: str
+    thread_id: str = "default_thread"
+    idempotency_key: Optional[str] = None
+
+
 class ResumeRequest(BaseModel):
     thread_id: str
     new_instructions: Optional[str] = None
@@ -82,12 +120,16 @@ async def simple_chat(
     """
     Direct RAG endpoint (No Agents yet).
     Retrieves context -> Calls LLM -> Returns Answer.
+    Near-duplicate questions are served from the semantic answer cache.
     """
     retriever = RetrievalService(session)
     rag_engine = RAGService(retriever)
 
-    result = await rag_engine.answer_question(request.question)
-    return result
+    return await answer_cache.get_or_compute(
+        "simple",
+        request.question,
+        lambda: rag_engine.answer_question(request.question),
+    )
 
 
 @app.post("/chat/agent", tags=["Inference"])
@@ -97,25 +139,122 @@ async def agent_chat(
     """
     Stateful Agentic RAG with PostgreSQL Persistence.
     The 'thread_id' in the request determines the conversation history.
+    Completed reports are reused for near-duplicate questions (answer cache).
     """
-    titan_system = TitanGraph(session)
+    agent = get_graph()
     initial_state = {"question": request.question, "loop_step": 0}
-    config = {"configurable": {"thread_id": request.thread_id}, "recursion_limit": 50}
+    config = {
+        "configurable": {"thread_id": request.thread_id, "session": session},
+        "recursion_limit": 50,
+    }
+
+    async def run_agent() -> dict:
+        final_state = await agent.ainvoke(initial_state, config)
 
-    agent = await titan_system.get()
-    final_state = await agent.ainvoke(initial_state, config)
+        if final_state.get("next_step") == "human_intervention":
+            return {
+                "status": "PAUSED",
+                "message": "Agent paused for human intervention.",
+                "error": final_state.get("error_message"),
+            }
 
-    if final_state.get("next_step") == "human_intervention":
         return {
-            "status": "PAUSED",
-            "message": "Agent paused for human intervention.",
-            "error": final_state.get("error_message"),
+            "status": "COMPLETED",
+            "answer": final_state.get("generation"),
+            "sources": final_state.get("sources", []),
         }
 
+    response = await answer_cache.get_or_compute(
+        "agent",
+        request.question,
+        run_agent,
+        cacheable=lambda response: response["status"] == "COMPLETED",
+        ttl_seconds=settings.ANSWER_CACHE_AGENT_TTL_SECONDS,
+    )
+    if response.get("cached"):
+        # The graph did not run: still record the turn in the thread history.
+        await agent.aupdate_state(
+            config,
+            {
+                "question": request.question,
+                "generation": response["answer"],
+                "sources": response["sources"],
+            },
+            as_node="reporter_agent",
+        )
+    return response
+
+
+@app.post("/chat/agent/stream", tags=["Inference"])
+async def agent_chat_stream(request: AgentRequest, http_request: Request):
+    """
+    Streaming variant of /chat/agent (Server-Sent Events).
+    Emits node transitions and report tokens as they happen, then the same
+    final payload as /chat/agent. Disconnecting cancels the graph run.
+    """
+    agent = get_graph()
+    initial_state = {"question": request.question, "loop_step": 0}
+
+    async def event_stream():
+        # Opened here, not via Depends: the session must live as long as the stream.
+        async with async_session_factory() as session:
+            config = {
+                "configurable": {"thread_id": request.thread_id, "session": session},
+                "recursion_limit": 50,
+            }
+            async for frame in stream_agent_run(
+                agent, initial_state, config, http_request.is_disconnected
+            ):
+                yield frame
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs/agent", status_code=202, tags=["Jobs"])
+async def submit_agent_job(
+    request: AgentJobRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Queues an agent run and returns its job id immediately.
+    Resubmitting with the same idempotency key (body field or
+    'Idempotency-Key' header) returns the original job.
+    """
+    job, created = await enqueue_agent_job(
+        session,
+        question=request.question,
+        thread_id=request.thread_id,
+        idempotency_key=request.idempotency_key or idempotency_key,
+    )
+    if created and get_job_pool():
+        get_job_pool().notify()
+
+    return {"job_id": job.id, "status": job.status, "deduplicated": not created}
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_agent_job(job_id: str, session: AsyncSession = Depends(get_session)):
+    """
+    Status of a queued agent run, with the /chat/agent payload once finished.
+    """
+    job = await get_job(session, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
     return {
-        "status": "COMPLETED",
-        "answer": final_state.get("generation"),
-        "sources": final_state.get("sources", []),
+        "job_id": job.id,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
     }
 
 
@@ -126,9 +265,8 @@ async def resume_agent(
     """
     Resumes a paused agent. Allows injecting manual corrections.
     """
-    titan = TitanGraph(session)
-    agent = await titan.get()
-    config = {"configurable": {"thread_id": request.thread_id}}
+    agent = get_graph()
+    config = {"configurable": {"thread_id": request.thread_id, "session": session}}
 
     current_state = await agent.aget_state(config)
     if not current_state.next:
@@ -173,6 +311,24 @@ async def health_check(session: AsyncSession = Depends(get_session)):
         return {"status": "degraded", "database": "unreachable", "detail": str(e)}
 
 
+@app.get("/metrics", tags=["System"])
+async def metrics():
+    """
+    In-process performance counters (shared clients, caches).
+    """
+    return {
+        "llm_clients": LLMFactory.client_count(),
+        "embedding_cache": embedder.cache.stats(),
+        "grader": grader_stats,
+        "mcp": get_mcp_manager().stats() if get_mcp_manager() else None,
+        "chronos": get_chronos_stats(),
+        "forecast_cache": forecast_cache.stats,
+        "router": get_router_stats(),
+        "jobs": get_job_pool().stats if get_job_pool() else None,
+        "answer_cache": get_answer_cache_stats(),
+    }
+
+
 @app.get("/test-report", response_class=HTMLResponse, tags=["UI Debug"])
 async def test_report_ui(request: Request):
     """
@@ -240,9 +396,8 @@ async def get_agent_state(thread_id: str, session: AsyncSession = Depends(get_se
     Get the current state of a conversation thread.
     Checks if the agent is paused or has errors.
     """
-    titan = TitanGraph(session)
-    agent = await titan.get()
-    config = {"configurable": {"thread_id": thread_id}}
+    agent = get_graph()
+    config = {"configurable": {"thread_id": thread_id, "session": session}}
 
     current_state = await agent.aget_state(config)
 
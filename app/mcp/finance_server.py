@@ -1,41 +1,250 @@
+import os
+import json
+import time
+import asyncio
 import yfinance as yf
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("YahooFinance")
 
+# Prices move every second; company profiles change a few times a year.
+PRICE_TTL_SECONDS = float(os.getenv("MCP_PRICE_TTL_SECONDS", "15"))
+PROFILE_TTL_SECONDS = float(os.getenv("MCP_PROFILE_TTL_SECONDS", "21600"))
+
+
+class TTLCache:
+    """
+    Per-process TTL cache for Yahoo lookups.
+    Concurrent misses for the same key share one in-flight fetch, and the
+    blocking yfinance call runs in a worker thread so the server keeps
+    answering other requests meanwhile.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, object]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def get(self, key: str):
+        """
+        Returns the fresh cached value (counting a hit) or None.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def put(self, key: str, value):
+        self._entries[key] = (time.monotonic(), value)
+
+    async def get_or_fetch(self, key: str, fetch):
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str, fetch):
+        try:
+            value = await asyncio.to_thread(fetch)
+        except Exception:
+            self.errors += 1
+            raise
+        self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+price_cache = TTLCache(PRICE_TTL_SECONDS)
+profile_cache = TTLCache(PROFILE_TTL_SECONDS)
+
+
+def fetch_price(ticker: str) -> dict:
+    stock = yf.Ticker(ticker)
+    return {
+        "price": stock.fast_info.last_price,
+        "currency": stock.fast_info.currency,
+    }
+
+
+def fetch_prices(tickers: list[str]) -> dict[str, dict]:
+    """
+    One upstream request for many tickers (yfinance multi-ticker download).
+    Tickers Yahoo returns nothing for are left out of the result.
+    """
+    frame = yf.download(
+        tickers,
+        period="1d",
+        interval="1m",
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+        threads=False,
+        multi_level_index=True,
+    )
+    quotes = {}
+    if frame is None or frame.empty:
+        return quotes
+
+    for ticker in tickers:
+        try:
+            closes = frame[(ticker, "Close")].dropna()
+        except KeyError:
+            continue
+        if not closes.empty:
+            quotes[ticker] = {
+                "price": float(closes.iloc[-1]),
+                "currency": None,  # not part of the download payload
+                "as_of": closes.index[-1].isoformat(),
+            }
+    return quotes
+
+
+def fetch_profile(ticker: str) -> dict:
+    info = yf.Ticker(ticker).info
+    return {
+        "sector": info.get("sector", "N/A"),
+        "industry": info.get("industry", "N/A"),
+        "marketCap": info.get("marketCap", 0),
+        "longBusinessSummary": info.get("longBusinessSummary", "N/A"),
+    }
+
 
 @mcp.tool()
-def get_stock_price(ticker: str) -> str:
+async def get_stock_price(ticker: str) -> str:
     """
     Get the current stock price and currency for a given ticker symbol (e.g., AAPL, MSFT).
     """
+    ticker = ticker.upper()
     try:
-        stock = yf.Ticker(ticker)
-        price = stock.fast_info.last_price
-        currency = stock.fast_info.currency
-        return f"The current price of {ticker.upper()} is {price:.2f} {currency}."
+        quote = await price_cache.get_or_fetch(ticker, lambda: fetch_price(ticker))
+        price = f"{quote['price']:.2f} {quote.get('currency') or ''}".strip()
+        return f"The current price of {ticker} is {price}."
     except Exception as e:
         return f"Error fetching price for {ticker}: {str(e)}"
 
 
 @mcp.tool()
-def get_company_info(ticker: str) -> str:
+async def get_company_info(ticker: str) -> str:
     """
     Get basic profile information (sector, industry, market cap) for a company.
     """
+    ticker = ticker.upper()
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = await profile_cache.get_or_fetch(ticker, lambda: fetch_profile(ticker))
         return (
-            f"Profile for {ticker.upper()}:\n"
-            f"- Sector: {info.get('sector', 'N/A')}\n"
-            f"- Industry: {info.get('industry', 'N/A')}\n"
-            f"- Market Cap: ${info.get('marketCap', 0):,}\n"
-            f"- Summary: {info.get('longBusinessSummary', 'N/A')[:200]}..."
+            f"Profile for {ticker}:\n"
+            f"- Sector: {info['sector']}\n"
+            f"- Industry: {info['industry']}\n"
+            f"- Market Cap: ${info['marketCap']:,}\n"
+            f"- Summary: {info['longBusinessSummary'][:200]}..."
         )
     except Exception as e:
         return f"Error fetching info for {ticker}: {str(e)}"
 
 
+def normalize_tickers(tickers: list[str]) -> list[str]:
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+
+
+def batch_key(ticker: str) -> str:
+    return f"batch:{ticker}"
+
+
+@mcp.tool()
+async def get_stock_prices(tickers: list[str]) -> dict:
+    """
+    Get the latest stock prices for several ticker symbols in one call
+    (e.g., ["AAPL", "MSFT", "NVDA"]). Returns one JSON quote per ticker.
+    """
+    tickers = normalize_tickers(tickers)
+    results = {}
+    missing = []
+
+    for ticker in tickers:
+        # Full single-ticker quotes are reused; batch quotes live under their
+        # own key because they lack the currency get_stock_price reports.
+        cached = price_cache.get(ticker) or price_cache.get(batch_key(ticker))
+        if cached is not None:
+            results[ticker] = {"ticker": ticker, **cached}
+        else:
+            missing.append(ticker)
+
+    if missing:
+        price_cache.misses += len(missing)
+        try:
+            fetched = await asyncio.to_thread(fetch_prices, missing)
+        except Exception as e:
+            price_cache.errors += 1
+            fetched = {}
+            error = str(e)
+        else:
+            error = "No data returned by Yahoo Finance"
+
+        for ticker in missing:
+            if ticker in fetched:
+                price_cache.put(batch_key(ticker), fetched[ticker])
+                results[ticker] = {"ticker": ticker, **fetched[ticker]}
+            else:
+                results[ticker] = {"ticker": ticker, "error": error}
+
+    return {"quotes": [results[t] for t in tickers]}
+
+
+@mcp.tool()
+async def get_company_infos(tickers: list[str]) -> dict:
+    """
+    Get profile information (sector, industry, market cap) for several
+    companies in one call. Returns one JSON profile per ticker.
+    """
+    tickers = normalize_tickers(tickers)
+
+    async def one(ticker: str) -> dict:
+        try:
+            info = await profile_cache.get_or_fetch(
+                ticker, lambda: fetch_profile(ticker)
+            )
+            return {"ticker": ticker, **info}
+        except Exception as e:
+            return {"ticker": ticker, "error": str(e)}
+
+    # Yahoo has no multi-ticker profile endpoint: misses are fetched in
+    # parallel threads and every profile goes through the shared cache.
+    return {"companies": list(await asyncio.gather(*(one(t) for t in tickers)))}
+
+
+@mcp.tool()
+async def get_cache_stats() -> str:
+    """
+    Get hit/miss statistics of the server's price and company-profile caches.
+    """
+    return json.dumps(
+        {"prices": price_cache.stats(), "profiles": profile_cache.stats()}
+    )
+
+
 if __name__ == "__main__":
     mcp.run()
@@ -0,0 +1,48 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+
+class AnswerCacheEntry(SQLModel, table=True):
+    """
+    Semantic answer cache (see app/services/answer_cache.py).
+    'scope' pins an answer to its endpoint, the tickers and years of the
+    question and the corpus version of those tickers, so re-vectorized
+    filings never serve old answers.
+    """
+
+    __tablename__ = "answer_cache"
+    __table_args__ = (
+        Index(
+            "ix_answer_cache_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    scope: str = Field(index=True)
+    endpoint: str
+    tickers: str = Field(default="")  # ",AAPL,MSFT," (sorted, comma-wrapped)
+    question: str
+    embedding: list[float] = Field(sa_column=Column(Vector(768)))
+    response: dict = Field(sa_column=Column(JSONB, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class CorpusVersion(SQLModel, table=True):
+    """
+    Bumped every time new filings for a ticker are vectorized. The "*" row
+    is bumped on every ingestion and scopes questions naming no ticker.
+    """
+
+    __tablename__ = "corpus_versions"
+
+    ticker: str = Field(primary_key=True)
+    version: int = Field(default=1)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
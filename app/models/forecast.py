@@ -0,0 +1,18 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import date, datetime
+
+
+class ForecastCacheEntry(SQLModel, table=True):
+    """
+    Last CHRONOS prediction per ticker and target trading day, shared by
+    every API worker (see app/services/forecast_cache.py).
+    """
+
+    __tablename__ = "forecast_cache"
+
+    ticker: str = Field(primary_key=True)
+    target_date: date = Field(primary_key=True)
+    payload: dict = Field(sa_column=Column(JSONB, nullable=False))
+    fetched_at: datetime = Field(default_factory=datetime.utcnow)
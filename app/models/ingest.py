@@ -0,0 +1,63 @@
+from typing import Optional
+from uuid import uuid4
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, UniqueConstraint
+from datetime import datetime
+
+
+class IngestManifest(SQLModel, table=True):
+    """
+    One row per source file processed by scripts/ingest/vectorize.py.
+    'file_hash' lets reruns skip unchanged files; 'version' counts the
+    changed revisions that were ingested.
+    """
+
+    __tablename__ = "ingest_manifest"
+
+    source_id: str = Field(primary_key=True)
+    ticker: str = Field(index=True)
+    file_hash: str
+    version: int = Field(default=1)
+    chunk_count: int = Field(default=0)
+    embedding_model: Optional[str] = None
+    processed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class IngestRun(SQLModel, table=True):
+    """
+    One vectorize.py run. Restarts resume the latest 'running' run instead
+    of starting over (see app/services/ingest_queue.py).
+    """
+
+    __tablename__ = "ingest_runs"
+
+    id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True)
+    # running | completed
+    status: str = Field(default="running")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class IngestFile(SQLModel, table=True):
+    """
+    Per-file task of an ingestion run, claimed by workers with
+    SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+
+    __tablename__ = "ingest_files"
+    __table_args__ = (
+        UniqueConstraint("run_id", "filename"),
+        Index("ix_ingest_files_run_status", "run_id", "status"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: str = Field(foreign_key="ingest_runs.id")
+    filename: str
+    # pending | embedding | committed | failed
+    status: str = Field(default="pending")
+    attempts: int = Field(default=0)
+    worker_id: Optional[str] = None
+    chunks_total: int = Field(default=0)
+    chunks_embedded: int = Field(default=0)
+    error: Optional[str] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
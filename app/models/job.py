@@ -0,0 +1,34 @@
+from typing import Optional
+from uuid import uuid4
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+
+class AgentJob(SQLModel, table=True):
+    """
+    Queued agent run (POST /jobs/agent), claimed by workers with
+    SELECT ... FOR UPDATE SKIP LOCKED (see app/services/job_queue.py).
+    """
+
+    __tablename__ = "agent_jobs"
+    __table_args__ = (Index("ix_agent_jobs_status_created", "status", "created_at"),)
+
+    id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True)
+    idempotency_key: Optional[str] = Field(default=None, unique=True)
+    # queued | running | completed | paused | failed
+    status: str = Field(default="queued")
+    question: str
+    thread_id: str
+
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
+    error: Optional[str] = None
+    attempts: int = Field(default=0)
+    worker_id: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    # Refreshed by the running worker; a job is stale when this stops moving.
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
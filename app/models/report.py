@@ -1,19 +1,37 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from datetime import datetime
 
 
 class FinancialReport(SQLModel, table=True):
     __tablename__ = "financial_reports"
+    __table_args__ = (
+        # Metadata filters of filtered vector search (see SearchFilters)
+        Index(
+            "ix_financial_reports_ticker_year_type",
+            "company_ticker",
+            "year",
+            "report_type",
+        ),
+        # Idempotent re-ingestion: one row per distinct chunk of a source file
+        Index(
+            "uq_financial_reports_source_hash",
+            "source_id",
+            "content_hash",
+            unique=True,
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     company_ticker: str = Field(index=True)
-    year: int
+    year: int  # fiscal year the report covers, not the filing year
     report_type: str = Field(default="10-K")
     section: str
     content: str
+    source_id: Optional[str] = Field(default=None)  # e.g. "AAPL_10-K_2024"
+    content_hash: Optional[str] = Field(default=None)  # sha256 of 'content'
 
     embedding: list[float] = Field(sa_column=Column(Vector(768)))
 
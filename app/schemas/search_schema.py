@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class SearchFilters(BaseModel):
+    tickers: List[str] = Field(
+        default_factory=list, description="Company tickers to restrict the search to"
+    )
+    year_from: Optional[int] = Field(
+        default=None, description="Inclusive lower fiscal year"
+    )
+    year_to: Optional[int] = Field(
+        default=None, description="Inclusive upper fiscal year"
+    )
+    report_type: Optional[str] = Field(default=None, description="e.g. 10-K, 10-Q")
+    section: Optional[str] = Field(default=None, description="Exact section label")
+
+    def is_empty(self) -> bool:
+        return not (
+            self.tickers
+            or self.year_from
+            or self.year_to
+            or self.report_type
+            or self.section
+        )
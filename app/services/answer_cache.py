@@ -0,0 +1,220 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import select, delete, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.answer_cache import AnswerCacheEntry, CorpusVersion
+from app.services.embedder import embedder
+from app.services.query_filters import extract_filters, extract_tickers
+
+logger = logging.getLogger(__name__)
+
+ALL_TICKERS = "*"
+
+
+class AnswerCache:
+    """
+    Semantic cache of full endpoint responses.
+
+    A new question reuses a stored answer when its embedding is within
+    ANSWER_CACHE_SIMILARITY (cosine) of a cached question with the same
+    scope: the endpoint, the tickers and years the question names and the
+    corpus version of each of those tickers. Vectorizing new filings for a
+    ticker bumps its version (see invalidate_ticker), so older answers stop
+    matching without any TTL having to expire. The TTL bounds the age of
+    live data (prices, forecasts) inside an answer: callers pass a short
+    one for such endpoints.
+
+    Like ForecastCache, it uses its own short-lived sessions and treats every
+    database error as a miss: the cache never fails a request.
+    """
+
+    def __init__(self, session_factory=async_session_factory):
+        self.session_factory = session_factory
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        question: str,
+        compute: Callable[[], Awaitable[dict]],
+        cacheable: Callable[[dict], bool] = lambda response: True,
+        ttl_seconds: Optional[int] = None,
+    ) -> dict:
+        """
+        Read-through entry point for the endpoints. 'cacheable' filters out
+        responses that must not be replayed (e.g. paused agent runs);
+        'ttl_seconds' defaults to ANSWER_CACHE_TTL_SECONDS.
+        """
+        if not settings.ANSWER_CACHE_ENABLED:
+            return await compute()
+
+        tickers = self.scope_tickers(question)
+        years = self.scope_years(question)
+        ttl_seconds = ttl_seconds or settings.ANSWER_CACHE_TTL_SECONDS
+        try:
+            embedding = await embedder.aembed(question)
+            scope = await self._scope(endpoint, tickers, years)
+            cached = await self._lookup(scope, embedding, ttl_seconds)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Answer cache lookup failed: {e}")
+            return await compute()
+
+        if cached is not None:
+            self.stats["hits"] += 1
+            logger.info(f"Answer cache hit ({scope}).")
+            return {**cached, "cached": True}
+
+        self.stats["misses"] += 1
+        response = await compute()
+        if cacheable(response):
+            await self._store(scope, endpoint, tickers, question, embedding, response)
+        return response
+
+    async def invalidate_ticker(self, ticker: str):
+        """
+        Called after new filings for 'ticker' are vectorized. Bumps its corpus
+        version (and the "*" version used by ticker-less questions) and
+        deletes the answers that depended on it.
+        """
+        ticker = ticker.upper()
+        statement = insert(CorpusVersion).values(
+            [
+                {"ticker": key, "version": 1, "updated_at": datetime.utcnow()}
+                for key in (ticker, ALL_TICKERS)
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["ticker"],
+            set_={
+                "version": CorpusVersion.version + 1,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        async with self.session_factory() as session:
+            await session.execute(statement)
+            await session.execute(
+                delete(AnswerCacheEntry).where(
+                    or_(
+                        AnswerCacheEntry.tickers.contains(f",{ticker},"),
+                        AnswerCacheEntry.tickers == "",
+                        AnswerCacheEntry.created_at < self._expiry_cutoff(),
+                    )
+                )
+            )
+            await session.commit()
+        self.stats["invalidations"] += 1
+        logger.info(f"Answer cache invalidated for {ticker}.")
+
+    @staticmethod
+    def scope_tickers(question: str) -> list[str]:
+        return sorted(set(extract_tickers(question)))
+
+    @staticmethod
+    def scope_years(question: str) -> str:
+        """
+        "2023", "2022-2024", or "" when the question names no year.
+        """
+        filters = extract_filters(question)
+        years = sorted({filters.year_from, filters.year_to} - {None})
+        return "-".join(str(year) for year in years)
+
+    @staticmethod
+    def scope_key(endpoint: str, versions: dict[str, int], years: str = "") -> str:
+        """
+        e.g. "agent|AAPL@3,MSFT@1", "simple|*@12" or "simple|AAPL@3|2023".
+        """
+        parts = ",".join(f"{key}@{versions[key]}" for key in sorted(versions))
+        return f"{endpoint}|{parts}|{years}" if years else f"{endpoint}|{parts}"
+
+    async def _scope(self, endpoint: str, tickers: list[str], years: str) -> str:
+        keys = tickers or [ALL_TICKERS]
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(CorpusVersion.ticker, CorpusVersion.version).where(
+                    CorpusVersion.ticker.in_(keys)
+                )
+            )
+            known = dict(result.all())
+        return self.scope_key(endpoint, {key: known.get(key, 0) for key in keys}, years)
+
+    async def _lookup(
+        self, scope: str, embedding: list[float], ttl_seconds: int
+    ) -> Optional[dict]:
+        if not embedding:
+            return None
+
+        distance = AnswerCacheEntry.embedding.cosine_distance(embedding)
+        statement = (
+            select(AnswerCacheEntry.response, distance.label("distance"))
+            .where(AnswerCacheEntry.scope == scope)
+            .where(AnswerCacheEntry.created_at >= self._expiry_cutoff(ttl_seconds))
+            .order_by(distance)
+            .limit(1)
+        )
+        iterative_scan = settings.VECTOR_ITERATIVE_SCAN.lower()
+        async with self.session_factory() as session:
+            if iterative_scan in ("relaxed_order", "strict_order"):
+                # The scope filter would otherwise starve the HNSW scan.
+                await session.execute(
+                    text(f"SET LOCAL hnsw.iterative_scan = {iterative_scan}")
+                )
+            row = (await session.execute(statement)).first()
+
+        if row is None or row.distance > 1 - settings.ANSWER_CACHE_SIMILARITY:
+            return None
+        return row.response
+
+    async def _store(
+        self,
+        scope: str,
+        endpoint: str,
+        tickers: list[str],
+        question: str,
+        embedding: list[float],
+        response: dict,
+    ):
+        if not embedding:
+            return
+        entry = AnswerCacheEntry(
+            scope=scope,
+            endpoint=endpoint,
+            tickers=f",{','.join(tickers)}," if tickers else "",
+            question=question,
+            embedding=embedding,
+            response=response,
+        )
+        try:
+            async with self.session_factory() as session:
+                session.add(entry)
+                await session.commit()
+            self.stats["stores"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Answer cache write failed: {e}")
+
+    @staticmethod
+    def _expiry_cutoff(ttl_seconds: Optional[int] = None) -> datetime:
+        ttl_seconds = ttl_seconds or settings.ANSWER_CACHE_TTL_SECONDS
+        return datetime.utcnow() - timedelta(seconds=ttl_seconds)
+
+
+answer_cache = AnswerCache()
+
+
+def get_answer_cache_stats() -> dict:
+    stats = answer_cache.stats
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
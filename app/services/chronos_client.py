@@ -1,9 +1,114 @@
+import time
+import random
+import asyncio
 import logging
+from collections import deque
+from importlib.util import find_spec
 import httpx
 from app.core.config import settings
+from app.core.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+# Worth retrying: the service may answer on the next attempt.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Only failures to connect are retried: a read timeout already waited the
+# full CHRONOS_TIMEOUT_SECONDS, and retrying it would multiply that wait.
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+http_client = None
+batch_supported = None  # discovered from the server's OpenAPI document
+
+breaker = CircuitBreaker(
+    "chronos",
+    failure_threshold=settings.CHRONOS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.CHRONOS_BREAKER_RESET_SECONDS,
+)
+
+chronos_stats = {
+    "requests": 0,
+    "successes": 0,
+    "failures": 0,
+    "retries": 0,
+    "short_circuited": 0,
+}
+latencies_ms = deque(maxlen=500)
+
+
+def build_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Keep-alive connection pool for CHRONOS. HTTP/2 is negotiated over TLS
+    (Cloud Run), so concurrent forecasts multiplex on one connection;
+    plain-http local runs (or installs without the h2 package) fall back to
+    HTTP/1.1.
+    """
+    return httpx.AsyncClient(
+        http2=settings.CHRONOS_HTTP2 and find_spec("h2") is not None,
+        timeout=httpx.Timeout(
+            settings.CHRONOS_TIMEOUT_SECONDS,
+            connect=settings.CHRONOS_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.CHRONOS_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CHRONOS_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        **kwargs,
+    )
+
+
+async def open_chronos_client():
+    global http_client, batch_supported
+    http_client = build_http_client()
+    batch_supported = None
+
+
+async def close_chronos_client():
+    global http_client, batch_supported
+    if http_client:
+        await http_client.aclose()
+        http_client = None
+    batch_supported = None
+
+
+def get_chronos_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client (created on first use when running outside
+    the API lifespan, e.g. scripts and tests).
+    """
+    global http_client
+    if http_client is None:
+        http_client = build_http_client()
+    return http_client
+
+
+def get_chronos_stats() -> dict:
+    ordered = sorted(latencies_ms)
+    return {
+        **chronos_stats,
+        "latency_ms": {
+            "avg": round(sum(ordered) / len(ordered), 2) if ordered else None,
+            "p50": ordered[len(ordered) // 2] if ordered else None,
+            "p95": ordered[int(len(ordered) * 0.95)] if ordered else None,
+        },
+        "breaker": breaker.stats(),
+    }
+
+
+class ChronosUnavailableError(Exception):
+    """
+    Raised instead of calling CHRONOS while the circuit breaker is open.
+    """
+
+
+def describe_error(error: Exception) -> str:
+    if isinstance(error, ChronosUnavailableError):
+        return "circuit open"
+    if isinstance(error, httpx.TimeoutException):
+        return "timed out"
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    return str(error) or type(error).__name__
+
 
 class ChronosClient:
     """
@@ -18,6 +123,9 @@ class ChronosClient:
         """
         Calls the CHRONOS /forecast/{ticker} endpoint and returns the
         structured prediction dict, or None if the service is unavailable.
+        Connection errors, 429 and 5xx are retried with jittered backoff
+        (read timeouts are not); while the circuit breaker is open, returns
+        None immediately.
 
         Returns:
             {
@@ -29,29 +137,194 @@ class ChronosClient:
                 "environment": "production"
             }
         """
-        url = f"{settings.CHRONOS_API_URL}/forecast/{ticker.upper()}"
-        logger.info(f"Calling CHRONOS API: GET {url}")
-
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-                logger.info(
-                    f"CHRONOS forecast received: {ticker} → "
-                    f"${data.get('predicted_close', '?')} "
-                    f"({data.get('model_used', '?')})"
-                )
-                return data
-
-        except httpx.TimeoutException:
-            logger.warning(f"CHRONOS API timed out for ticker {ticker}.")
+            data = await ChronosClient._fetch_forecast(ticker)
+        except ChronosUnavailableError:
+            logger.warning(f"CHRONOS circuit open; skipping forecast for {ticker}.")
             return None
         except httpx.HTTPStatusError as e:
             logger.warning(
                 f"CHRONOS API returned HTTP {e.response.status_code} for {ticker}."
             )
             return None
+        except httpx.TimeoutException:
+            logger.warning(f"CHRONOS API timed out for ticker {ticker}.")
+            return None
         except Exception as e:
             logger.error(f"Unexpected error calling CHRONOS for {ticker}: {e}")
             return None
+
+        logger.info(
+            f"CHRONOS forecast received: {ticker} → "
+            f"${data.get('predicted_close', '?')} "
+            f"({data.get('model_used', '?')})"
+        )
+        return data
+
+    @staticmethod
+    async def get_forecasts(
+        tickers: list[str], concurrency: int | None = None
+    ) -> dict[str, dict]:
+        """
+        Forecasts for many tickers at once. Uses the CHRONOS batch endpoint
+        when the server advertises it (see supports_batch), otherwise runs
+        single requests concurrently, at most 'concurrency' at a time.
+
+        Returns one entry per ticker (upper-cased, in input order):
+            {"AAPL": {"forecast": {...}, "error": None},
+             "ZZZZ": {"forecast": None, "error": "HTTP 404"}}
+        """
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        if not tickers:
+            return {}
+
+        if len(tickers) > 1 and await ChronosClient.supports_batch():
+            try:
+                return await ChronosClient._fetch_batch(tickers)
+            except ChronosUnavailableError as e:
+                return {
+                    t: {"forecast": None, "error": describe_error(e)} for t in tickers
+                }
+            except Exception as e:
+                logger.warning(
+                    f"CHRONOS batch request failed ({describe_error(e)}); "
+                    "falling back to single requests."
+                )
+
+        semaphore = asyncio.Semaphore(concurrency or settings.CHRONOS_BATCH_CONCURRENCY)
+
+        async def fetch_one(ticker: str) -> dict:
+            async with semaphore:
+                try:
+                    forecast = await ChronosClient._fetch_forecast(ticker)
+                    return {"forecast": forecast, "error": None}
+                except Exception as e:
+                    logger.warning(f"CHRONOS forecast failed for {ticker}: {e!r}")
+                    return {"forecast": None, "error": describe_error(e)}
+
+        results = await asyncio.gather(*(fetch_one(t) for t in tickers))
+        return dict(zip(tickers, results))
+
+    @staticmethod
+    async def supports_batch() -> bool:
+        """
+        Looks for the batch route in the server's OpenAPI document once per
+        client; failures to fetch it mean 'no' without being remembered.
+        """
+        global batch_supported
+        if batch_supported is not None:
+            return batch_supported
+        if not settings.CHRONOS_BATCH_PATH:
+            return False
+
+        try:
+            response = await get_chronos_client().get(
+                f"{settings.CHRONOS_API_URL}/openapi.json"
+            )
+            response.raise_for_status()
+            paths = response.json().get("paths", {})
+        except Exception as e:
+            logger.debug(f"CHRONOS OpenAPI discovery failed: {e!r}")
+            return False
+
+        batch_supported = "post" in paths.get(settings.CHRONOS_BATCH_PATH, {})
+        logger.info(f"CHRONOS batch endpoint available: {batch_supported}")
+        return batch_supported
+
+    @staticmethod
+    async def _fetch_forecast(ticker: str) -> dict:
+        url = f"{settings.CHRONOS_API_URL}/forecast/{ticker.upper()}"
+        logger.info(f"Calling CHRONOS API: GET {url}")
+        client = get_chronos_client()
+        return await ChronosClient._call(lambda: client.get(url))
+
+    @staticmethod
+    async def _fetch_batch(tickers: list[str]) -> dict[str, dict]:
+        """
+        Expects {"forecasts": [<forecast>, ...], "errors": {ticker: reason}}.
+        """
+        url = f"{settings.CHRONOS_API_URL}{settings.CHRONOS_BATCH_PATH}"
+        logger.info(f"Calling CHRONOS API: POST {url} ({len(tickers)} tickers)")
+        client = get_chronos_client()
+        data = await ChronosClient._call(
+            lambda: client.post(url, json={"tickers": tickers})
+        )
+
+        forecasts = {f["ticker"].upper(): f for f in data.get("forecasts", [])}
+        errors = data.get("errors", {})
+        return {
+            ticker: {
+                "forecast": forecasts.get(ticker),
+                "error": None
+                if ticker in forecasts
+                else errors.get(ticker, "missing from batch response"),
+            }
+            for ticker in tickers
+        }
+
+    @staticmethod
+    async def _call(send) -> dict:
+        """
+        One logical CHRONOS request: circuit breaker, retries, metrics.
+        'send' returns a fresh request coroutine on every attempt.
+        """
+        chronos_stats["requests"] += 1
+        if not breaker.allow_request():
+            chronos_stats["short_circuited"] += 1
+            raise ChronosUnavailableError("CHRONOS circuit breaker is open")
+
+        start = time.perf_counter()
+        try:
+            data = await ChronosClient._send_with_retries(send)
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            # A 4xx is a real answer (e.g. unknown ticker): the service is up.
+            if status >= 500 or status in RETRYABLE_STATUS_CODES:
+                ChronosClient._record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            ChronosClient._record_failure()
+            raise
+        except BaseException:
+            # Cancelled (e.g. client disconnect): no verdict on the service,
+            # but a half-open probe must not hold the circuit forever.
+            breaker.release_probe()
+            raise
+        finally:
+            latencies_ms.append(round((time.perf_counter() - start) * 1000, 2))
+
+        breaker.record_success()
+        chronos_stats["successes"] += 1
+        return data
+
+    @staticmethod
+    async def _send_with_retries(send) -> dict:
+        max_retries = settings.CHRONOS_MAX_RETRIES
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = await send()
+                if (
+                    response.status_code in RETRYABLE_STATUS_CODES
+                    and attempt < max_retries
+                ):
+                    logger.warning(f"CHRONOS HTTP {response.status_code}, retrying...")
+                else:
+                    response.raise_for_status()
+                    return response.json()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= max_retries:
+                    raise
+                logger.warning(f"CHRONOS connection error ({e!r}), retrying...")
+
+            chronos_stats["retries"] += 1
+            # Full jitter keeps concurrent report requests from retrying in sync.
+            backoff = settings.CHRONOS_RETRY_BACKOFF_SECONDS * (2**attempt)
+            await asyncio.sleep(random.uniform(0, backoff))
+
+    @staticmethod
+    def _record_failure():
+        chronos_stats["failures"] += 1
+        breaker.record_failure()
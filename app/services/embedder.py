@@ -1,5 +1,10 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from langchain_google_vertexai import VertexAIEmbeddings
+from app.core.config import settings
 from app.core.llm import LLMFactory
+from app.services.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +17,12 @@ class EmbeddingService:
         if cls._instance is None:
             cls._instance = super(EmbeddingService, cls).__new__(cls)
             cls._initialize_model()
+            cls._instance._initialize_batcher()
+            cls._instance.cache = EmbeddingCache(
+                max_size=settings.EMBEDDING_CACHE_SIZE,
+                ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+                persist_path=settings.EMBEDDING_CACHE_PATH,
+            )
         return cls._instance
 
     @classmethod
@@ -22,6 +33,29 @@ class EmbeddingService:
         except Exception as e:
             logger.critical(f"Failded to load embedding model: {e}")
 
+    def _initialize_batcher(self):
+        """
+        Inference runs on a dedicated executor so the event loop never blocks
+        on a forward pass. Concurrent aembed() calls arriving within
+        max_wait seconds are grouped into a single embed_documents call.
+        """
+        self.max_batch_size = settings.EMBEDDING_MAX_BATCH_SIZE
+        self.max_wait = settings.EMBEDDING_MAX_WAIT_MS / 1000
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+            thread_name_prefix="titan-embedder",
+        )
+        self._loop = None
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()  # strong refs: the loop only keeps weak ones
+
+    @property
+    def model_name(self) -> str:
+        return getattr(
+            self._embedder_model, "model_name", type(self._embedder_model).__name__
+        )
+
     def generate_embedding(self, text: str) -> list[float]:
         if not text or not text.strip():
             return []
@@ -30,5 +64,98 @@ class EmbeddingService:
 
         return self._embedder_model.embed_query(clean_text)
 
+    def embed_documents(
+        self, texts: list[str], batch_size: int = 64
+    ) -> list[list[float]]:
+        """
+        Document-side counterpart of generate_embedding() for ingestion:
+        one model call per 'batch_size' texts instead of one per chunk.
+        """
+        clean_texts = [text.replace("\n", " ") for text in texts]
+
+        vectors = []
+        for start in range(0, len(clean_texts), batch_size):
+            batch = clean_texts[start : start + batch_size]
+            vectors.extend(self._embedder_model.embed_documents(batch))
+        return vectors
+
+    async def aembed(self, text: str) -> list[float]:
+        """
+        Async, micro-batched equivalent of generate_embedding() for user queries.
+        Results are memoized in the query-embedding cache.
+        """
+        if not text or not text.strip():
+            return []
+
+        clean_text = text.replace("\n", " ")
+
+        cached = self.cache.get(clean_text, self.model_name)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+
+        if self._loop is not loop:
+            # Futures are bound to their loop; never mix batches across loops.
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+
+        future = loop.create_future()
+        self._pending.append((clean_text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            vectors = await loop.run_in_executor(
+                self._executor, self._embed_and_cache, texts
+            )
+        except Exception as e:
+            logger.error(f"Batched embedding failed ({len(texts)} queries): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Embedded batch of {len(texts)} queries.")
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def _embed_and_cache(self, texts: list[str]) -> list[list[float]]:
+        vectors = self._embed_queries(texts)
+        for text, vector in zip(texts, vectors):
+            self.cache.put(text, self.model_name, vector)
+        return vectors
+
+    def _embed_queries(self, texts: list[str]) -> list[list[float]]:
+        if isinstance(self._embedder_model, VertexAIEmbeddings):
+            # Keep query-side task type (embed_documents defaults to RETRIEVAL_DOCUMENT)
+            return self._embedder_model.embed_documents(
+                texts, embeddings_task_type="RETRIEVAL_QUERY"
+            )
+        return self._embedder_model.embed_documents(texts)
+
 
 embedder = EmbeddingService()
@@ -0,0 +1,161 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU + TTL cache for query embeddings.
+
+    Keys are a SHA-256 of the normalized query text plus the embedding model
+    name, so switching models never serves stale vectors. When a path is
+    given, entries are also written to a local SQLite file and reloaded on a
+    memory miss, so the cache survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        ttl_seconds: float = 86400,
+        persist_path: Optional[str] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+
+        if persist_path:
+            self._open_store(persist_path)
+
+    def _open_store(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, vector TEXT NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"Embedding cache persisted at {path}")
+        except sqlite3.Error as e:
+            logger.error(f"Could not open embedding cache store {path}: {e}")
+            self._db = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str) -> str:
+        payload = f"{model_name}\x00{cls.normalize(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model_name: str) -> Optional[list[float]]:
+        key = self.make_key(text, model_name)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, vector = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+                self.expirations += 1
+
+            vector = self._load_from_store(key, now)
+            if vector is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, model_name: str, vector: list[float]):
+        if not vector:
+            return
+
+        key = self.make_key(text, model_name)
+        created_at = time.time()
+
+        with self._lock:
+            self._insert(key, created_at, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?)",
+                        (key, created_at, json.dumps(vector)),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+
+    def _insert(self, key: str, created_at: float, vector: list[float]):
+        self._entries[key] = (created_at, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load_from_store(self, key: str, now: float) -> Optional[list[float]]:
+        if self._db is None:
+            return None
+
+        try:
+            row = self._db.execute(
+                "SELECT created_at, vector FROM query_embeddings WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            created_at, raw_vector = row
+            if now - created_at > self.ttl_seconds:
+                self._db.execute("DELETE FROM query_embeddings WHERE key = ?", (key,))
+                self._db.commit()
+                self.expirations += 1
+                return None
+
+            vector = json.loads(raw_vector)
+            self._insert(key, created_at, vector)
+            return vector
+
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_embeddings")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import date, datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.forecast import ForecastCacheEntry
+from app.services.chronos_client import ChronosClient
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastCache:
+    """
+    Read-through cache in front of ChronosClient.
+
+    A CHRONOS prediction only changes once per trading day, so entries are
+    stored in Postgres keyed by (ticker, target_date) and shared by every
+    worker. Entries younger than FORECAST_CACHE_TTL_SECONDS are served
+    directly; older ones (up to FORECAST_CACHE_STALE_SECONDS) are served
+    immediately while a background task refreshes them. Concurrent misses for
+    the same ticker share one CHRONOS call (single-flight, per process).
+
+    Uses its own short-lived sessions, never the request session, so
+    background refreshes can outlive the request that triggered them.
+    """
+
+    def __init__(self, session_factory=async_session_factory):
+        self.session_factory = session_factory
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "store_errors": 0,
+        }
+
+    async def get_forecast(self, ticker: str) -> dict | None:
+        ticker = ticker.upper()
+        if not settings.FORECAST_CACHE_ENABLED:
+            return await ChronosClient.get_forecast(ticker)
+
+        entry = await self._load(ticker)
+        if entry is not None:
+            age = (datetime.utcnow() - entry.fetched_at).total_seconds()
+            if age < settings.FORECAST_CACHE_TTL_SECONDS:
+                self.stats["hits"] += 1
+                return entry.payload
+            if age < settings.FORECAST_CACHE_STALE_SECONDS:
+                self.stats["stale_hits"] += 1
+                self._revalidate(ticker)
+                return entry.payload
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._fetch_task(ticker))
+
+    def _fetch_task(self, ticker: str) -> asyncio.Task:
+        task = self._inflight.get(ticker)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return task
+
+        task = asyncio.create_task(self._fetch_and_store(ticker))
+        self._inflight[ticker] = task
+        task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+        return task
+
+    def _revalidate(self, ticker: str):
+        if ticker in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+        task = self._fetch_task(ticker)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _fetch_and_store(self, ticker: str) -> dict | None:
+        forecast = await ChronosClient.get_forecast(ticker)
+        if forecast:
+            await self._store(ticker, forecast)
+        return forecast
+
+    async def _load(self, ticker: str) -> ForecastCacheEntry | None:
+        """
+        Latest cached forecast whose target day has not passed yet.
+        """
+        statement = (
+            select(ForecastCacheEntry)
+            .where(ForecastCacheEntry.ticker == ticker)
+            .where(ForecastCacheEntry.target_date >= datetime.utcnow().date())
+            .order_by(ForecastCacheEntry.target_date.desc())
+            .limit(1)
+        )
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(statement)
+                return result.scalars().first()
+        except Exception as e:
+            logger.warning(f"Forecast cache read failed for {ticker}: {e}")
+            return None
+
+    async def _store(self, ticker: str, forecast: dict):
+        statement = insert(ForecastCacheEntry).values(
+            ticker=ticker,
+            target_date=self.target_date(forecast),
+            payload=forecast,
+            fetched_at=datetime.utcnow(),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["ticker", "target_date"],
+            set_={
+                "payload": statement.excluded.payload,
+                "fetched_at": statement.excluded.fetched_at,
+            },
+        )
+        try:
+            async with self.session_factory() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception as e:
+            self.stats["store_errors"] += 1
+            logger.warning(f"Forecast cache write failed for {ticker}: {e}")
+
+    @staticmethod
+    def target_date(forecast: dict) -> date:
+        try:
+            return date.fromisoformat(str(forecast.get("target_date"))[:10])
+        except ValueError:
+            return datetime.utcnow().date()
+
+
+forecast_cache = ForecastCache()
@@ -0,0 +1,118 @@
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.ingest import IngestManifest
+from app.models.report import FinancialReport
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestPlan:
+    """
+    What re-ingesting one source file has to do. 'pending' hashes need an
+    embedding; 'stale' ones are in the table but gone from the file.
+    """
+
+    unchanged: bool = False
+    pending: set[str] = field(default_factory=set)
+    stale: list[str] = field(default_factory=list)
+
+
+async def plan_source(
+    session: AsyncSession,
+    source_id: str,
+    file_hash: str,
+    hashes: list[str],
+    embedding_model: str,
+) -> IngestPlan:
+    """
+    Diffs a file's chunk hashes against the rows already stored for it.
+    Unchanged files (same file hash and embedding model as the manifest) are
+    skipped outright; a new embedding model re-embeds every chunk.
+    """
+    manifest = await session.get(IngestManifest, source_id)
+    if (
+        manifest is not None
+        and manifest.file_hash == file_hash
+        and manifest.embedding_model == embedding_model
+    ):
+        return IngestPlan(unchanged=True)
+
+    result = await session.execute(
+        select(FinancialReport.content_hash).where(
+            FinancialReport.source_id == source_id
+        )
+    )
+    stored = set(result.scalars().all())
+    reusable = stored
+    if manifest is not None and manifest.embedding_model != embedding_model:
+        reusable = set()
+
+    return IngestPlan(
+        pending={h for h in hashes if h not in reusable},
+        stale=sorted(stored - set(hashes)),
+    )
+
+
+async def delete_stale_chunks(session: AsyncSession, source_id: str, hashes: list[str]):
+    if not hashes:
+        return
+    await session.execute(
+        delete(FinancialReport)
+        .where(FinancialReport.source_id == source_id)
+        .where(FinancialReport.content_hash.in_(hashes))
+    )
+
+
+async def delete_legacy_chunks(
+    session: AsyncSession, ticker: str, report_type: str
+) -> int:
+    """
+    Deletes the ticker's chunks of this report type loaded before source_id
+    existed. They cannot be tied to a file, so they are replaced the first
+    time one of the ticker's files is ingested again; otherwise every one
+    would be stored twice. Returns the number of rows deleted.
+    """
+    result = await session.execute(
+        delete(FinancialReport)
+        .where(FinancialReport.source_id.is_(None))
+        .where(FinancialReport.company_ticker == ticker)
+        .where(FinancialReport.report_type == report_type)
+    )
+    return result.rowcount or 0
+
+
+async def record_manifest(
+    session: AsyncSession,
+    source_id: str,
+    ticker: str,
+    file_hash: str,
+    chunk_count: int,
+    embedding_model: str,
+):
+    statement = insert(IngestManifest).values(
+        source_id=source_id,
+        ticker=ticker,
+        file_hash=file_hash,
+        version=1,
+        chunk_count=chunk_count,
+        embedding_model=embedding_model,
+        processed_at=datetime.utcnow(),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["source_id"],
+        set_={
+            "file_hash": statement.excluded.file_hash,
+            "version": IngestManifest.version + 1,
+            "chunk_count": statement.excluded.chunk_count,
+            "embedding_model": statement.excluded.embedding_model,
+            "processed_at": statement.excluded.processed_at,
+        },
+    )
+    await session.execute(statement)
@@ -0,0 +1,204 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update, func, or_, and_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.ingest import IngestRun, IngestFile
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key serializing run creation across launchers
+RUN_LOCK_KEY = 7_342_001
+
+
+async def open_ingest_run(
+    session: AsyncSession, filenames: list[str], new_run: bool = False
+) -> tuple[IngestRun, bool]:
+    """
+    Resumes the latest unfinished run (resumed=True) or starts a new one,
+    and queues every file not yet part of it. Failed files of a resumed run
+    get another round of attempts. Launchers on several machines serialize
+    on an advisory lock, so they all join the same run.
+    """
+    await session.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": RUN_LOCK_KEY}
+    )
+
+    run = None
+    if not new_run:
+        result = await session.execute(
+            select(IngestRun)
+            .where(IngestRun.status == "running")
+            .order_by(IngestRun.created_at.desc())
+            .limit(1)
+        )
+        run = result.scalars().first()
+
+    resumed = run is not None
+    if run is None:
+        run = IngestRun()
+        session.add(run)
+        await session.flush()
+    else:
+        await session.execute(
+            update(IngestFile)
+            .where(IngestFile.run_id == run.id)
+            .where(IngestFile.status == "failed")
+            .values(status="pending", attempts=0, error=None)
+        )
+
+    if filenames:
+        now = datetime.utcnow()
+        await session.execute(
+            insert(IngestFile)
+            .values(
+                [
+                    {
+                        "run_id": run.id,
+                        "filename": filename,
+                        "status": "pending",
+                        "attempts": 0,
+                        "chunks_total": 0,
+                        "chunks_embedded": 0,
+                        "updated_at": now,
+                    }
+                    for filename in filenames
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["run_id", "filename"])
+        )
+    await session.commit()
+    return run, resumed
+
+
+async def claim_next_file(
+    session: AsyncSession, run_id: str, worker_id: str
+) -> Optional[IngestFile]:
+    """
+    Atomically moves the next pending file of the run to 'embedding' for
+    this worker (FOR UPDATE SKIP LOCKED, as in job_queue.claim_next_job).
+    Files stuck in 'embedding' without progress for INGEST_STALE_SECONDS
+    belonged to a crashed worker and are claimable again.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.INGEST_STALE_SECONDS)
+
+    await session.execute(
+        update(IngestFile)
+        .where(IngestFile.run_id == run_id)
+        .where(IngestFile.status == "embedding")
+        .where(IngestFile.updated_at < stale_before)
+        .where(IngestFile.attempts >= settings.INGEST_MAX_ATTEMPTS)
+        .values(status="failed", error="Worker lost", updated_at=now)
+    )
+
+    candidate = (
+        select(IngestFile.id)
+        .where(IngestFile.run_id == run_id)
+        .where(
+            or_(
+                IngestFile.status == "pending",
+                and_(
+                    IngestFile.status == "embedding",
+                    IngestFile.updated_at < stale_before,
+                ),
+            )
+        )
+        .where(IngestFile.attempts < settings.INGEST_MAX_ATTEMPTS)
+        .order_by(IngestFile.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    statement = (
+        update(IngestFile)
+        .where(IngestFile.id == candidate)
+        .values(
+            status="embedding",
+            attempts=IngestFile.attempts + 1,
+            worker_id=worker_id,
+            error=None,
+            updated_at=now,
+        )
+        .returning(IngestFile.id)
+    )
+    file_id = (await session.execute(statement)).scalar_one_or_none()
+    await session.commit()
+
+    if file_id is None:
+        return None
+    return await session.get(IngestFile, file_id, populate_existing=True)
+
+
+async def record_progress(session: AsyncSession, file_id: int, chunks: int):
+    """
+    Checkpoint after a committed batch; also keeps the claim from going stale.
+    """
+    await session.execute(
+        update(IngestFile)
+        .where(IngestFile.id == file_id)
+        .values(
+            chunks_embedded=IngestFile.chunks_embedded + chunks,
+            updated_at=datetime.utcnow(),
+        )
+    )
+    await session.commit()
+
+
+async def finish_file(
+    session: AsyncSession,
+    file_id: int,
+    status: str,
+    chunks_total: Optional[int] = None,
+    error: Optional[str] = None,
+    worker_id: Optional[str] = None,
+) -> bool:
+    """
+    Sets the file's final (or retry) status. With 'worker_id', only a file
+    still being embedded by that worker is updated, so a worker whose stale
+    claim was taken over cannot reset the new owner's file. Returns False
+    when nothing was updated.
+    """
+    values = {"status": status, "error": error, "updated_at": datetime.utcnow()}
+    if chunks_total is not None:
+        values["chunks_total"] = chunks_total
+    statement = update(IngestFile).where(IngestFile.id == file_id)
+    if worker_id is not None:
+        statement = statement.where(IngestFile.worker_id == worker_id).where(
+            IngestFile.status == "embedding"
+        )
+    result = await session.execute(statement.values(**values))
+    return result.rowcount > 0
+
+
+async def close_run(session: AsyncSession, run_id: str) -> dict:
+    """
+    Marks the run completed once no file is left to process and returns
+    per-status file counts plus chunk totals.
+    """
+    result = await session.execute(
+        select(
+            IngestFile.status,
+            func.count(),
+            func.sum(IngestFile.chunks_total),
+            func.sum(IngestFile.chunks_embedded),
+        )
+        .where(IngestFile.run_id == run_id)
+        .group_by(IngestFile.status)
+    )
+    summary = {"files": {}, "chunks_total": 0, "chunks_embedded": 0}
+    for status, count, total, embedded in result.all():
+        summary["files"][status] = count
+        summary["chunks_total"] += total or 0
+        summary["chunks_embedded"] += embedded or 0
+
+    if not summary["files"].get("pending") and not summary["files"].get("embedding"):
+        await session.execute(
+            update(IngestRun)
+            .where(IngestRun.id == run_id)
+            .values(status="completed", finished_at=datetime.utcnow())
+        )
+    await session.commit()
+    return summary
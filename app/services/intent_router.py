@@ -0,0 +1,159 @@
+import re
+import math
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.services.embedder import embedder as default_embedder
+
+logger = logging.getLogger(__name__)
+
+# Keyword rules per supervisor worker. A rule only decides when exactly one
+# worker matches; overlapping intents ("analyze and forecast ...") go on.
+KEYWORD_RULES = {
+    # Arithmetic needs operands that are not years: "2023/2024" is a range.
+    "quant_agent": re.compile(
+        r"\b(calculate|compute|cagr)\b|"
+        r"(?<![\d.])(?!(?:19|20)\d\d\b)\d+(?:\.\d+)?\s*[+*/^]\s*"
+        r"(?!(?:19|20)\d\d\b)\d",
+        re.IGNORECASE,
+    ),
+    "market_agent": re.compile(
+        r"\b(stock price|share price|current price|price of|trading at|"
+        r"market cap(italization)?|quote for)\b",
+        re.IGNORECASE,
+    ),
+    "forecast_agent": re.compile(
+        r"\b(forecast|predict(ed|ion)?|price target)\b", re.IGNORECASE
+    ),
+    "research_agent": re.compile(
+        r"\b(risks?|risk factors|10-K|annual report|analy[sz]e|analysis|"
+        r"summari[sz]e|business model|strategy|outlook|competitors?|"
+        r"competition|revenue segments?|guidance)\b",
+        re.IGNORECASE,
+    ),
+}
+
+# Labelled example queries for the embedding fallback.
+LABELLED_EXAMPLES = {
+    "research_agent": [
+        "What are the main risks Apple reports in its 10-K?",
+        "Summarize Microsoft's business strategy",
+        "How does Tesla describe its competition?",
+        "What did Nvidia say about supply chain issues?",
+    ],
+    "quant_agent": [
+        "Calculate the current ratio with assets of 500 and liabilities of 200",
+        "What is the compound annual growth rate from 100 to 180 over 3 years?",
+        "Compute the net margin if revenue is 400 and net income is 60",
+    ],
+    "market_agent": [
+        "What is the stock price of AAPL right now?",
+        "How much is Microsoft worth on the market today?",
+        "Which sector and industry is NVDA in?",
+    ],
+    "forecast_agent": [
+        "What will TSLA close at tomorrow?",
+        "Give me the predicted closing price for MSFT",
+    ],
+}
+
+# Process-wide counters (exposed through /metrics)
+router_stats = {"rules": 0, "embeddings": 0, "llm": 0}
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class IntentRouter:
+    """
+    Deterministic pre-router in front of the supervisor LLM.
+
+    1. Keyword rules: decide when exactly one worker's rule matches.
+    2. Embedding similarity against LABELLED_EXAMPLES (reusing the cached,
+       micro-batched EmbeddingService): decide when the best label is both
+       similar enough and clearly ahead of the runner-up.
+    Otherwise returns None and the supervisor asks the LLM.
+    """
+
+    def __init__(self, embedder=None, examples: dict = LABELLED_EXAMPLES):
+        self.embedder = embedder or default_embedder
+        self.examples = examples
+        self._example_vectors: Optional[list[tuple[str, list[float]]]] = None
+
+    @staticmethod
+    def match_rules(question: str) -> Optional[str]:
+        matches = [
+            label for label, rule in KEYWORD_RULES.items() if rule.search(question)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    async def match_examples(self, question: str) -> Optional[str]:
+        if self._example_vectors is None:
+            pairs = [
+                (label, text)
+                for label, texts in self.examples.items()
+                for text in texts
+            ]
+            vectors = await asyncio.gather(
+                *(self.embedder.aembed(text) for _, text in pairs)
+            )
+            self._example_vectors = [
+                (label, vector) for (label, _), vector in zip(pairs, vectors)
+            ]
+
+        query_vector = await self.embedder.aembed(question)
+        best: dict[str, float] = {}
+        for label, vector in self._example_vectors:
+            score = cosine_similarity(query_vector, vector)
+            best[label] = max(score, best.get(label, -1.0))
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        label, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if (
+            score >= settings.ROUTER_EMBEDDING_THRESHOLD
+            and score - runner_up >= settings.ROUTER_EMBEDDING_MARGIN
+        ):
+            return label
+        return None
+
+    async def route(self, question: str) -> Optional[str]:
+        """
+        Returns the supervisor 'next_step' for high-confidence questions,
+        or None when the LLM should decide.
+        """
+        label = self.match_rules(question)
+        if label:
+            router_stats["rules"] += 1
+            logger.info(f"Pre-router (rules): {label}")
+            return label
+
+        if settings.ROUTER_USE_EMBEDDINGS:
+            try:
+                label = await self.match_examples(question)
+            except Exception as e:
+                logger.warning(f"Pre-router embedding match failed: {e}")
+                label = None
+            if label:
+                router_stats["embeddings"] += 1
+                logger.info(f"Pre-router (embeddings): {label}")
+                return label
+
+        router_stats["llm"] += 1
+        return None
+
+
+def get_router_stats() -> dict:
+    total = sum(router_stats.values())
+    skipped = router_stats["rules"] + router_stats["embeddings"]
+    return {
+        **router_stats,
+        "llm_skip_rate": round(skipped / total, 4) if total else 0.0,
+    }
+
+
+intent_router = IntentRouter()
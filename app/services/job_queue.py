@@ -0,0 +1,158 @@
+import logging
+from uuid import uuid4
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update, or_, and_, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.job import AgentJob
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_agent_job(
+    session: AsyncSession,
+    question: str,
+    thread_id: str,
+    idempotency_key: Optional[str] = None,
+) -> tuple[AgentJob, bool]:
+    """
+    Inserts a queued job. A repeated idempotency key returns the existing
+    job instead (created=False), so client retries never run a graph twice.
+    """
+    statement = (
+        insert(AgentJob)
+        .values(
+            id=uuid4().hex,
+            idempotency_key=idempotency_key,
+            status="queued",
+            question=question,
+            thread_id=thread_id,
+            attempts=0,
+            created_at=datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(AgentJob.id)
+    )
+    job_id = (await session.execute(statement)).scalar_one_or_none()
+    await session.commit()
+
+    if job_id is not None:
+        return await session.get(AgentJob, job_id), True
+
+    result = await session.execute(
+        select(AgentJob).where(AgentJob.idempotency_key == idempotency_key)
+    )
+    logger.info(f"Duplicate job submission (idempotency key {idempotency_key}).")
+    return result.scalar_one(), False
+
+
+async def claim_next_job(session: AsyncSession, worker_id: str) -> Optional[AgentJob]:
+    """
+    Atomically moves the oldest runnable job to 'running' for this worker.
+    FOR UPDATE SKIP LOCKED lets many workers (across processes) poll the
+    same table without blocking each other or claiming the same row.
+    Jobs left 'running' by a crashed worker (no heartbeat for
+    JOB_STALE_SECONDS) become runnable again, up to JOB_MAX_ATTEMPTS attempts.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    last_seen = func.coalesce(AgentJob.heartbeat_at, AgentJob.started_at)
+
+    # Give up on jobs that keep crashing their workers.
+    await session.execute(
+        update(AgentJob)
+        .where(AgentJob.status == "running")
+        .where(last_seen < stale_before)
+        .where(AgentJob.attempts >= settings.JOB_MAX_ATTEMPTS)
+        .values(status="failed", error="Worker lost", finished_at=now)
+    )
+
+    candidate = (
+        select(AgentJob.id)
+        .where(
+            or_(
+                AgentJob.status == "queued",
+                and_(
+                    AgentJob.status == "running",
+                    last_seen < stale_before,
+                ),
+            )
+        )
+        .where(AgentJob.attempts < settings.JOB_MAX_ATTEMPTS)
+        .order_by(AgentJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    statement = (
+        update(AgentJob)
+        .where(AgentJob.id == candidate)
+        .values(
+            status="running",
+            attempts=AgentJob.attempts + 1,
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now,
+        )
+        .returning(AgentJob.id)
+    )
+    job_id = (await session.execute(statement)).scalar_one_or_none()
+    await session.commit()
+
+    if job_id is None:
+        return None
+    return await session.get(AgentJob, job_id, populate_existing=True)
+
+
+async def heartbeat_job(session: AsyncSession, job_id: str, worker_id: str) -> bool:
+    """
+    Tells other workers the job is still being worked on, so a long run is
+    not reclaimed as stale. Returns False when the job is no longer running
+    under this worker.
+    """
+    updated = await session.execute(
+        update(AgentJob)
+        .where(AgentJob.id == job_id)
+        .where(AgentJob.worker_id == worker_id)
+        .where(AgentJob.status == "running")
+        .values(heartbeat_at=datetime.utcnow())
+    )
+    await session.commit()
+    return updated.rowcount > 0
+
+
+async def finish_job(
+    session: AsyncSession,
+    job_id: str,
+    status: str,
+    result: Optional[dict] = None,
+    error: Optional[str] = None,
+    worker_id: Optional[str] = None,
+) -> bool:
+    """
+    Records the outcome of a job. With 'worker_id', only a job still running
+    under that worker is updated: a worker whose job went stale and was
+    reclaimed cannot overwrite the new owner's run. Returns False when
+    nothing was updated.
+    """
+    statement = update(AgentJob).where(AgentJob.id == job_id)
+    if worker_id is not None:
+        statement = statement.where(AgentJob.worker_id == worker_id).where(
+            AgentJob.status == "running"
+        )
+    updated = await session.execute(
+        statement.values(
+            status=status,
+            result=result,
+            error=error,
+            finished_at=datetime.utcnow() if status != "queued" else None,
+        )
+    )
+    await session.commit()
+    return updated.rowcount > 0
+
+
+async def get_job(session: AsyncSession, job_id: str) -> Optional[AgentJob]:
+    return await session.get(AgentJob, job_id, populate_existing=True)
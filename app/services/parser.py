@@ -1,9 +1,35 @@
 import re
 import logging
+from typing import Optional, TextIO
 from bs4 import BeautifulSoup
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+SKIP_TAGS = {"script", "style", "meta", "noscript", "head", "link"}
+
+
+class LineWriter:
+    """
+    Writes text to 'sink' with clean_html()'s line rules: one stripped line
+    per text line, dropping empty and single-character lines.
+    """
+
+    def __init__(self, sink: TextIO):
+        self.sink = sink
+        self.lines = 0
+
+    def write(self, text: Optional[str]):
+        if not text:
+            return
+        for line in text.splitlines():
+            clean_line = line.strip()
+            if len(clean_line) > 1:
+                if self.lines:
+                    self.sink.write("\n")
+                self.sink.write(clean_line)
+                self.lines += 1
+
 
 class SECParser:
     @staticmethod
@@ -23,7 +49,7 @@ class SECParser:
         """
         soup = BeautifulSoup(content, "lxml")
 
-        for tag in soup(["script", "style", "meta", "noscript", "head", "link"]):
+        for tag in soup(list(SKIP_TAGS)):
             tag.extract()
 
         for table in soup.find_all("table"):
@@ -39,3 +65,63 @@ class SECParser:
                 lines.append(clean_line)
 
         return "\n".join(lines)
+
+    @staticmethod
+    def clean_html_stream(
+        source: TextIO, sink: TextIO, chunk_size: int = 1024 * 1024
+    ) -> int:
+        """
+        Streaming equivalent of clean_html() for large filings. 'source' is
+        fed to an lxml pull parser in chunk_size pieces and cleaned lines are
+        written to 'sink' as soon as their text is complete. Finished
+        elements are freed while parsing, so memory stays flat whatever the
+        file size (bounded by the largest single text node).
+        Returns the number of lines written.
+        """
+        # Comments are kept as events: like in clean_html, the text on each
+        # side of one (e.g. EDGAR's <!-- Field: ... --> markers) stays a
+        # separate line instead of being glued together.
+        parser = etree.HTMLPullParser(
+            events=("start", "end", "comment"),
+            remove_comments=False,
+            remove_pis=True,
+            huge_tree=True,
+        )
+        writer = LineWriter(sink)
+        skip_depth = 0
+
+        def handle(events):
+            nonlocal skip_depth
+            for event, elem in events:
+                if event != "end":
+                    # Text between the previous sibling (or parent) and elem.
+                    if skip_depth == 0:
+                        previous = elem.getprevious()
+                        if previous is not None:
+                            writer.write(previous.tail)
+                        elif elem.getparent() is not None:
+                            writer.write(elem.getparent().text)
+                    if event == "start" and elem.tag in SKIP_TAGS:
+                        skip_depth += 1
+                    continue
+
+                if elem.tag in SKIP_TAGS:
+                    skip_depth -= 1
+                elif skip_depth == 0:
+                    # Trailing text inside elem, after its last child.
+                    writer.write(elem[-1].tail if len(elem) else elem.text)
+
+                # Keep the tail: it is written when the next sibling starts.
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+        while chunk := source.read(chunk_size):
+            parser.feed(chunk)
+            handle(parser.read_events())
+        parser.close()
+        handle(parser.read_events())
+
+        return writer.lines
@@ -0,0 +1,93 @@
+import re
+from app.schemas.search_schema import SearchFilters
+
+# Company names users type instead of the ticker.
+COMPANY_ALIASES = {
+    "apple": "AAPL",
+    "microsoft": "MSFT",
+    "tesla": "TSLA",
+    "nvidia": "NVDA",
+    "amazon": "AMZN",
+    "alphabet": "GOOGL",
+    "google": "GOOGL",
+    "meta": "META",
+    "facebook": "META",
+    "netflix": "NFLX",
+}
+
+# Upper-case words that are not tickers (acronyms common in financial questions).
+NON_TICKER_WORDS = set(
+    "AI CEO CFO CTO EPS ETF EU FY GAAP IPO IRS ML PE ROE ROI SEC UK US USA USD "
+    "YOY WHAT HOW WHY THE AND FOR OF".split()
+)
+
+TICKER_PATTERN = re.compile(r"\$?\b([A-Z]{2,5})\b")
+YEAR_PATTERN = re.compile(r"\b(?:FY\s?)?((?:19|20)\d{2})\b")
+YEAR_RANGE_PATTERN = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|to|through|and)\s*((?:19|20)\d{2})\b"
+)
+REPORT_TYPE_PATTERN = re.compile(r"\b(10-K|10-Q|8-K)\b", re.IGNORECASE)
+
+
+def extract_tickers(question: str) -> list[str]:
+    """
+    Pulls tickers out of a question, in order of appearance and without
+    duplicates. Explicit symbols (AAPL, $TSLA) and well-known company names
+    (Apple, Tesla) are both recognized.
+    """
+    found: list[str] = []
+
+    for match in TICKER_PATTERN.finditer(question):
+        symbol = match.group(1)
+        if symbol not in NON_TICKER_WORDS and symbol not in found:
+            found.append(symbol)
+
+    lowered = question.lower()
+    for name, symbol in COMPANY_ALIASES.items():
+        if re.search(rf"\b{name}\b", lowered) and symbol not in found:
+            found.append(symbol)
+
+    return found
+
+
+def extract_filters(question: str) -> SearchFilters:
+    """
+    Turns a natural-language question into structured SearchFilters
+    (tickers, year range, report type). Used by the 'retrieve' node.
+    """
+    filters = SearchFilters(tickers=extract_tickers(question))
+
+    year_range = YEAR_RANGE_PATTERN.search(question)
+    if year_range:
+        start, end = sorted(int(y) for y in year_range.groups())
+        filters.year_from, filters.year_to = start, end
+    else:
+        years = sorted({int(y) for y in YEAR_PATTERN.findall(question)})
+        if years:
+            filters.year_from, filters.year_to = years[0], years[-1]
+
+    report_type = REPORT_TYPE_PATTERN.search(question)
+    if report_type:
+        filters.report_type = report_type.group(1).upper()
+
+    return filters
+
+
+def relaxation_steps(filters: SearchFilters) -> list[SearchFilters]:
+    """
+    'filters' followed by successively looser versions of it, for when a
+    search comes back empty: the year is dropped first, then report type
+    and section, keeping the tickers. Only when all of those find nothing
+    does the last step search unfiltered, as the retriever did before
+    filters existed.
+    """
+    steps = [filters]
+    if filters.year_from or filters.year_to:
+        steps.append(filters.model_copy(update={"year_from": None, "year_to": None}))
+    if filters.report_type or filters.section:
+        steps.append(
+            steps[-1].model_copy(update={"report_type": None, "section": None})
+        )
+    if not steps[-1].is_empty():
+        steps.append(SearchFilters())
+    return steps
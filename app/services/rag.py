@@ -25,7 +25,10 @@ class RAGService:
             }
 
         context_text = "\n\n".join(
-            [f"[Source: {c.company_ticker} {c.year} 10-K]: {c.content}" for c in chunks]
+            [
+                f"[Source: {c.company_ticker} {c.year} 10-K]: {c.content}"
+                for c, _ in chunks
+            ]
         )
 
         prompt_template = ChatPromptTemplate.from_messages(
@@ -55,5 +58,5 @@ class RAGService:
 
         return {
             "answer": response,
-            "sources": [f"{c.company_ticker} ({c.section})" for c in chunks],
+            "sources": [f"{c.company_ticker} ({c.section})" for c, _ in chunks],
         }
@@ -2,7 +2,9 @@ import logging
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.report import FinancialReport
+from app.schemas.search_schema import SearchFilters
 from app.services.embedder import embedder
+from app.db.vector_index import apply_search_params
 
 logger = logging.getLogger(__name__)
 
@@ -11,36 +13,102 @@ class RetrievalService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def build_search_statement(
+        query_vector: list[float],
+        limit: int,
+        filters: SearchFilters | None = None,
+        threshold: float | None = None,
+    ):
+        """
+        Nearest-neighbour query with the metadata filters and the distance
+        threshold pushed into the WHERE clause, so Postgres evaluates them
+        together with the ANN index scan. Selects (chunk, distance) rows.
+        """
+        distance = FinancialReport.embedding.cosine_distance(query_vector)
+        statement = select(FinancialReport, distance.label("distance"))
+
+        if threshold is not None:
+            statement = statement.where(distance <= threshold)
+
+        if filters:
+            if filters.tickers:
+                tickers = [t.upper() for t in filters.tickers]
+                statement = statement.where(FinancialReport.company_ticker.in_(tickers))
+            if filters.year_from:
+                statement = statement.where(FinancialReport.year >= filters.year_from)
+            if filters.year_to:
+                statement = statement.where(FinancialReport.year <= filters.year_to)
+            if filters.report_type:
+                statement = statement.where(
+                    FinancialReport.report_type == filters.report_type
+                )
+            if filters.section:
+                statement = statement.where(FinancialReport.section == filters.section)
+
+        return statement.order_by(distance).limit(limit)
+
+    async def stored_tickers(self, candidates: list[str]) -> set[str]:
+        """
+        The subset of 'candidates' that has chunks in financial_reports, so
+        acronyms mistaken for tickers (ESG, GDP, EBIT...) never filter a search.
+        """
+        if not candidates:
+            return set()
+        statement = (
+            select(FinancialReport.company_ticker)
+            .where(FinancialReport.company_ticker.in_([t.upper() for t in candidates]))
+            .distinct()
+        )
+        try:
+            result = await self.session.execute(statement)
+            return set(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Ticker lookup failed: {e}")
+            return set(candidates)
+
     async def search_relevant_chunks(
-        self, query: str, limit: int = 5, threshold: float = 0.5
-    ) -> list[FinancialReport]:
+        self,
+        query: str,
+        limit: int = 5,
+        threshold: float | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        filters: SearchFilters | None = None,
+    ) -> list[tuple[FinancialReport, float]]:
         """
         Performs Semantic Search using pgvector cosine distance.
+        Returns (chunk, distance) pairs, closest first.
 
         Args:
             query: The user's question.
             limit: Number of chunks to retrieve.
-            threshold: (Optional) Max distance to consider relevant.
+            threshold: (Optional) Max distance to consider relevant. None disables it.
+            ef_search: (Optional) HNSW candidate list size for this query.
+            probes: (Optional) IVFFlat lists to scan for this query.
+            filters: (Optional) Tickers / years / report type / section to restrict to.
         """
 
         if not query:
             return []
 
-        query_vector = embedder.generate_embedding(query)
+        query_vector = await embedder.aembed(query)
 
         if not query_vector:
             logger.warning("Could not generate embedding for query.")
             return []
 
-        statement = (
-            select(FinancialReport)
-            .order_by(FinancialReport.embedding.cosine_distance(query_vector))
-            .limit(limit)
+        filtered = filters is not None and not filters.is_empty()
+        statement = self.build_search_statement(
+            query_vector, limit, filters if filtered else None, threshold
         )
 
         try:
+            await apply_search_params(
+                self.session, ef_search=ef_search, probes=probes, filtered=filtered
+            )
             results = await self.session.execute(statement)
-            chunks = results.scalars().all()
+            chunks = [(row[0], float(row[1])) for row in results.all()]
 
             logger.info(
                 f"Found {len(chunks)} relevant chunks for query: '{query[:30]}...'"
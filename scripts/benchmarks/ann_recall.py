@@ -0,0 +1,97 @@
+"""
+Benchmark: recall@k and latency of the ANN index vs the exact sequential scan.
+
+Query vectors are sampled from stored chunks (plus a little noise), so the
+distribution matches real questions against the corpus.
+
+Usage (needs an ingested corpus and an index, see scripts/db/manage_index.py):
+    python scripts/benchmarks/ann_recall.py --queries 100 --k 4 --ef-search 20 40 100
+    python scripts/benchmarks/ann_recall.py --probes 1 10 30   # IVFFlat
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+from sqlmodel import select
+from app.db.session import async_session_factory, engine
+from app.models.report import FinancialReport
+
+
+async def sample_queries(n: int, noise: float) -> list[list[float]]:
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(FinancialReport.embedding).order_by(text("random()")).limit(n)
+        )
+        vectors = [list(v) for v in result.scalars().all()]
+    return [[x + random.gauss(0, noise) for x in v] for v in vectors]
+
+
+async def top_k(query: list[float], k: int, setup_sql: list[str]) -> tuple[set, float]:
+    async with async_session_factory() as session:
+        for sql in setup_sql:
+            await session.execute(text(sql))
+        start = time.perf_counter()
+        result = await session.execute(
+            select(FinancialReport.id)
+            .order_by(FinancialReport.embedding.cosine_distance(query))
+            .limit(k)
+        )
+        ids = set(result.scalars().all())
+        return ids, time.perf_counter() - start
+
+
+def report(label: str, recalls: list[float], latencies: list[float]) -> None:
+    latencies_ms = sorted(x * 1000 for x in latencies)
+    p95 = latencies_ms[max(int(len(latencies_ms) * 0.95) - 1, 0)]
+    print(
+        f"{label:<24} recall@k={statistics.mean(recalls):.3f}  "
+        f"p50={statistics.median(latencies_ms):7.2f} ms  p95={p95:7.2f} ms"
+    )
+
+
+async def main(args):
+    queries = await sample_queries(args.queries, args.noise)
+    if not queries:
+        print("No embeddings found. Run scripts/ingest/vectorize.py first.")
+        return
+
+    exact_sql = ["SET LOCAL enable_indexscan = off"]
+    exact_results, exact_latency = [], []
+    for q in queries:
+        ids, latency = await top_k(q, args.k, exact_sql)
+        exact_results.append(ids)
+        exact_latency.append(latency)
+
+    print(f"\n{len(queries)} queries, k={args.k}")
+    report("EXACT (seq scan)", [1.0] * len(queries), exact_latency)
+
+    settings_to_try = [("hnsw.ef_search", v) for v in args.ef_search or []]
+    settings_to_try += [("ivfflat.probes", v) for v in args.probes or []]
+
+    for knob, value in settings_to_try:
+        recalls, latencies = [], []
+        for q, truth in zip(queries, exact_results):
+            ids, latency = await top_k(q, args.k, [f"SET LOCAL {knob} = {value}"])
+            recalls.append(len(ids & truth) / max(len(truth), 1))
+            latencies.append(latency)
+        report(f"ANN {knob}={value}", recalls, latencies)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--ef-search", type=int, nargs="*", default=[20, 40, 100])
+    parser.add_argument("--probes", type=int, nargs="*", default=[])
+    asyncio.run(main(parser.parse_args()))
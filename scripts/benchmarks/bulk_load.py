@@ -0,0 +1,116 @@
+"""
+Benchmark: inserting vectorized chunks into financial_reports.
+
+BEFORE: FinancialReport ORM objects, session.add_all() + commit() per file.
+AFTER:  binary COPY through asyncpg (app/db/bulk_load.py).
+
+Rows are synthetic (random 768-d vectors) and tagged with a throwaway ticker
+that is deleted at the end.
+
+Usage (needs the Postgres from docker-compose):
+    python scripts/benchmarks/bulk_load.py --rows 20000 --file-rows 300
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import argparse
+import logging
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import delete
+from app.db.session import async_session_factory, init_db
+from app.db.bulk_load import ReportBulkLoader, report_record
+from app.models.report import FinancialReport
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger("TITAN_BENCH")
+
+BENCH_TICKER = "ZZBENCH"
+CONTENT = "Revenue increased due to higher services net sales. " * 18
+
+
+def synthetic_rows(count: int) -> list[tuple]:
+    return [
+        (f"chunk_{i}", CONTENT, [random.random() for _ in range(768)])
+        for i in range(count)
+    ]
+
+
+async def orm_insert(rows: list[tuple], file_rows: int) -> float:
+    """Old behaviour: one add_all + commit per file."""
+    start = time.perf_counter()
+    async with async_session_factory() as session:
+        for offset in range(0, len(rows), file_rows):
+            session.add_all(
+                FinancialReport(
+                    company_ticker=BENCH_TICKER,
+                    year=2025,
+                    report_type="10-K",
+                    section=section,
+                    content=content,
+                    embedding=embedding,
+                )
+                for section, content, embedding in rows[offset : offset + file_rows]
+            )
+            await session.commit()
+    return time.perf_counter() - start
+
+
+async def copy_insert(rows: list[tuple], batch_rows: int) -> float:
+    """New behaviour: binary COPY in batch_rows transactions."""
+    start = time.perf_counter()
+    async with ReportBulkLoader(batch_size=batch_rows) as loader:
+        await loader.load(
+            report_record(BENCH_TICKER, 2025, "10-K", section, content, embedding)
+            for section, content, embedding in rows
+        )
+    return time.perf_counter() - start
+
+
+async def cleanup():
+    async with async_session_factory() as session:
+        await session.execute(
+            delete(FinancialReport).where(
+                FinancialReport.company_ticker == BENCH_TICKER
+            )
+        )
+        await session.commit()
+
+
+async def main(args):
+    await init_db()
+    rows = synthetic_rows(args.rows)
+
+    try:
+        before = await orm_insert(rows, args.file_rows)
+        await cleanup()
+        after = await copy_insert(rows, args.batch_rows)
+    finally:
+        await cleanup()
+
+    print(f"\nfinancial_reports insert throughput ({args.rows} rows)")
+    print(
+        f"{'BEFORE (ORM add_all)':<24} {args.rows / before:10.0f} rows/s  {before:7.2f}s"
+    )
+    print(
+        f"{'AFTER  (binary COPY)':<24} {args.rows / after:10.0f} rows/s  {after:7.2f}s"
+    )
+    print(f"Speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument(
+        "--file-rows", type=int, default=300, help="ORM rows per commit (one file)"
+    )
+    parser.add_argument("--batch-rows", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""
+Calibration: cosine distance vs LLM grader verdicts, to pick the grader
+pre-filter cutoffs (GRADER_AUTO_ACCEPT_DISTANCE / GRADER_AUTO_REJECT_DISTANCE).
+
+Each question is retrieved without a distance threshold and every chunk is
+graded by the LLM grader. The script prints the grader's 'yes' rate per
+distance bucket and the loosest cutoffs that still agree with the grader at
+least --agreement of the time. Run it with the embedding model and LLM the
+deployment uses: the distances are only meaningful for that model.
+
+Usage (needs an ingested corpus):
+    python scripts/benchmarks/grader_calibration.py questions.txt --k 10
+    python scripts/benchmarks/grader_calibration.py questions.txt --agreement 0.99
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+
+sys.path.append(os.getcwd())
+
+from langchain_core.output_parsers import JsonOutputParser
+from app.core.llm import LLMFactory
+from app.core.prompts import GRADER_PROMPT
+from app.db.session import async_session_factory, engine
+from app.services.retriever import RetrievalService
+
+
+async def collect(questions: list[str], k: int) -> list[tuple[float, bool]]:
+    grader_chain = (
+        GRADER_PROMPT
+        | LLMFactory.get_llm(temperature=0, json_mode=True)
+        | JsonOutputParser()
+    )
+    samples = []
+    async with async_session_factory() as session:
+        retriever = RetrievalService(session)
+        for question in questions:
+            chunks = await retriever.search_relevant_chunks(question, limit=k)
+            for chunk, distance in chunks:
+                try:
+                    grade = await grader_chain.ainvoke(
+                        {"question": question, "document": chunk.content}
+                    )
+                except Exception as e:
+                    print(f"Grader error, sample skipped: {e}")
+                    continue
+                relevant = isinstance(grade, dict) and grade.get("score") == "yes"
+                samples.append((distance, relevant))
+    return samples
+
+
+def cutoffs(
+    samples: list[tuple[float, bool]], agreement: float
+) -> tuple[float | None, float | None]:
+    """
+    Largest accept distance whose samples at or below it are relevant, and
+    smallest reject distance whose samples at or above it are not, both at
+    'agreement' or better. None when no cutoff reaches it.
+    """
+    ordered = sorted(samples)
+    accept = None
+    relevant = 0
+    for n, (distance, is_relevant) in enumerate(ordered, start=1):
+        relevant += is_relevant
+        if relevant / n >= agreement:
+            accept = distance
+
+    reject = None
+    irrelevant = 0
+    for n, (distance, is_relevant) in enumerate(reversed(ordered), start=1):
+        irrelevant += not is_relevant
+        if irrelevant / n >= agreement:
+            reject = distance
+    return accept, reject
+
+
+def report(samples: list[tuple[float, bool]], bucket: float) -> None:
+    buckets: dict[int, list[bool]] = {}
+    for distance, relevant in samples:
+        buckets.setdefault(int(distance / bucket), []).append(relevant)
+    print(f"\n{'distance':<16}{'chunks':>8}{'yes rate':>10}")
+    for key in sorted(buckets):
+        verdicts = buckets[key]
+        label = f"{key * bucket:.2f}-{(key + 1) * bucket:.2f}"
+        print(f"{label:<16}{len(verdicts):>8}{sum(verdicts) / len(verdicts):>10.2f}")
+
+
+async def main(args):
+    with open(args.questions) as f:
+        questions = [line.strip() for line in f if line.strip()]
+
+    samples = await collect(questions, args.k)
+    await engine.dispose()
+    if not samples:
+        print("No chunks retrieved. Run scripts/ingest/vectorize.py first.")
+        return
+
+    report(samples, args.bucket)
+    accept, reject = cutoffs(samples, args.agreement)
+    print(f"\n{len(samples)} graded chunks, agreement >= {args.agreement:.2f}")
+    print(f"GRADER_AUTO_ACCEPT_DISTANCE={accept if accept is not None else 'None'}")
+    print(f"GRADER_AUTO_REJECT_DISTANCE={reject if reject is not None else 'None'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("questions", help="Text file, one question per line")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--bucket", type=float, default=0.05)
+    parser.add_argument("--agreement", type=float, default=0.98)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Benchmark: per-request overhead of building the TITAN graph.
+
+BEFORE: every request built TitanGraph -> AgentNodes -> StateGraph,
+        created a new AsyncPostgresSaver, ran checkpointer.setup() (DDL) and compiled.
+AFTER:  the graph is compiled once in the FastAPI lifespan and reused.
+
+Usage (needs the Postgres from docker-compose):
+    python scripts/benchmarks/graph_overhead.py --iterations 50
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+
+sys.path.append(os.getcwd())
+
+from app.core.db_pool import open_pool, close_pool
+from app.agents.graph import TitanGraph, init_graph, get_graph
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger("TITAN_BENCH")
+
+
+def summarize(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(
+        f"{label:<28} mean={statistics.mean(samples_ms):8.2f} ms  "
+        f"p50={statistics.median(samples_ms):8.2f} ms  p95={p95:8.2f} ms"
+    )
+
+
+async def per_request_compile(iterations: int) -> list[float]:
+    """Old behaviour: one TitanGraph + setup() + compile per request."""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        agent = await TitanGraph().get()
+        await agent.aget_state({"configurable": {"thread_id": f"bench_{i}"}})
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def process_wide_graph(iterations: int) -> list[float]:
+    """New behaviour: compiled once, each request only reads its thread state."""
+    await init_graph()
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        agent = get_graph()
+        await agent.aget_state({"configurable": {"thread_id": f"bench_{i}"}})
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def main(iterations: int):
+    await open_pool()
+    try:
+        before = await per_request_compile(iterations)
+        after = await process_wide_graph(iterations)
+    finally:
+        await close_pool()
+
+    print(f"\nGraph overhead per request ({iterations} iterations)")
+    summarize("BEFORE (compile/request)", before)
+    summarize("AFTER  (compile once)", after)
+    print(f"Speed-up (mean): {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,116 @@
+"""
+Benchmark: cleaning a large SEC filing to text.
+
+BEFORE: SECParser.clean_html, the whole file is read, parsed into a
+        BeautifulSoup tree and joined with get_text().
+AFTER:  SECParser.clean_html_stream, lxml pull parser fed in 1 MB chunks,
+        finished elements freed and lines written as they complete.
+
+Each mode runs in a fresh process so peak RSS (ru_maxrss) is not shared.
+Without --file, a synthetic full-submission filing of --size-mb is generated.
+
+Usage:
+    python scripts/benchmarks/html_cleaner.py --size-mb 100
+    python scripts/benchmarks/html_cleaner.py --file data/sec_filings/.../full-submission.txt
+"""
+
+import sys
+import os
+import time
+import resource
+import tempfile
+import argparse
+import multiprocessing
+
+sys.path.append(os.getcwd())
+
+from app.services.parser import SECParser
+
+SECTION = """
+<div><span style="font-weight:bold">Item 1A. Risk Factors</span></div>
+<p>The Company faces <i>intense</i> competition in all of its markets &amp;
+its results depend on new product introductions.<br>Net sales by category:</p>
+<table><tr><td>iPhone</td><td>$ 201,183</td></tr>
+<tr><td>Services</td><td>$ 96,169</td></tr></table>
+<script>var tracking = "noise";</script><style>.x { color: red }</style>
+"""
+
+
+def write_synthetic_filing(path: str, size_mb: int):
+    target = size_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<SEC-DOCUMENT><DOCUMENT><TYPE>10-K<TEXT><html><head>")
+        f.write("<title>10-K</title></head><body>")
+        written = 0
+        while written < target:
+            f.write(SECTION)
+            written += len(SECTION)
+        f.write("</body></html></TEXT></DOCUMENT></SEC-DOCUMENT>")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def run_mode(mode: str, input_path: str, output_path: str, results):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "before":
+        with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
+            text = SECParser.clean_html(f.read())
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        with (
+            open(input_path, "r", encoding="utf-8", errors="ignore") as source,
+            open(output_path, "w", encoding="utf-8") as sink,
+        ):
+            SECParser.clean_html_stream(source, sink)
+    results.put((mode, time.perf_counter() - start, baseline, peak_rss_mb()))
+
+
+def measure(mode: str, input_path: str, output_path: str) -> tuple:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=run_mode, args=(mode, input_path, output_path, results)
+    )
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = args.file
+        if input_path is None:
+            input_path = os.path.join(tmp, "synthetic-filing.txt")
+            write_synthetic_filing(input_path, args.size_mb)
+        size_mb = os.path.getsize(input_path) / (1024 * 1024)
+
+        outputs = {
+            mode: os.path.join(tmp, f"{mode}.txt") for mode in ("before", "after")
+        }
+        rows = [measure(mode, input_path, outputs[mode]) for mode in outputs]
+
+        with open(outputs["before"]) as a, open(outputs["after"]) as b:
+            identical = a.read() == b.read()
+
+    print(f"\nHTML cleaning of a {size_mb:.0f} MB filing")
+    labels = {"before": "BEFORE (BeautifulSoup)", "after": "AFTER  (lxml stream)"}
+    for mode, elapsed, baseline, peak in rows:
+        print(
+            f"{labels[mode]:<24} {elapsed:7.2f}s  {size_mb / elapsed:6.1f} MB/s  "
+            f"peak RSS {peak:7.1f} MB (+{peak - baseline:.1f} MB over imports)"
+        )
+    print(f"Identical output: {identical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", default=None, help="Real filing to clean")
+    parser.add_argument("--size-mb", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,82 @@
+"""
+Management command for the pgvector ANN index on financial_reports.embedding.
+
+Examples:
+    python scripts/db/manage_index.py status
+    python scripts/db/manage_index.py create --method hnsw --m 16 --ef-construction 64
+    python scripts/db/manage_index.py rebuild --method ivfflat --lists 200
+    python scripts/db/manage_index.py drop --method hnsw
+    python scripts/db/manage_index.py create --method hnsw --ticker AAPL  # partial
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+import logging
+import time
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.db.vector_index import (
+    INDEX_METHODS,
+    create_vector_index,
+    drop_vector_index,
+    list_vector_indexes,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger("TITAN_INDEX")
+
+
+async def main(args):
+    # CONCURRENTLY cannot run inside a transaction block.
+    async with engine.connect() as raw_conn:
+        conn = await raw_conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        if args.maintenance_work_mem:
+            await conn.execute(
+                text(f"SET maintenance_work_mem = '{args.maintenance_work_mem}'")
+            )
+
+        if args.command in ("drop", "rebuild"):
+            await drop_vector_index(conn, args.method, ticker=args.ticker)
+
+        if args.command in ("create", "rebuild"):
+            start = time.perf_counter()
+            await create_vector_index(
+                conn,
+                args.method,
+                m=args.m,
+                ef_construction=args.ef_construction,
+                lists=args.lists,
+                concurrently=args.concurrently,
+                ticker=args.ticker,
+            )
+            logger.info(f"Index ready in {time.perf_counter() - start:.1f}s")
+
+        for index in await list_vector_indexes(conn):
+            logger.info(f"{index['name']}: {index['definition']}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=["create", "drop", "rebuild", "status"])
+    parser.add_argument("--method", choices=INDEX_METHODS, default=None)
+    parser.add_argument("--m", type=int, default=None, help="HNSW max connections")
+    parser.add_argument("--ef-construction", type=int, default=None)
+    parser.add_argument("--lists", type=int, default=None, help="IVFFlat lists")
+    parser.add_argument("--concurrently", action="store_true")
+    parser.add_argument(
+        "--ticker", default=None, help="Build a partial index for one company"
+    )
+    parser.add_argument("--maintenance-work-mem", default=None, help="e.g. '1GB'")
+    asyncio.run(main(parser.parse_args()))
@@ -54,7 +54,7 @@ async def generate_responses(dataset_path):
 
             response_data = await rag.answer_question(q)
             chunks = await retriever.search_relevant_chunks(q)
-            context_list = [c.content for c in chunks]
+            context_list = [c.content for c, _ in chunks]
 
             if not context_list:
                 print(
@@ -24,13 +24,21 @@ def process_file(file_info):
         if os.path.exists(output_path):
             return f"Skipped (Exists): {os.path.basename(output_path)}"
 
-        with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
-            raw_content = f.read()
-
-        cleaned_text = SECParser.clean_html(raw_content)
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(cleaned_text)
+        # Streamed end to end: memory stays flat even for full-submission
+        # filings with embedded exhibits. Written to a temp file first so an
+        # interrupted run never leaves a truncated output that gets skipped.
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with (
+                open(input_path, "r", encoding="utf-8", errors="ignore") as source,
+                open(tmp_path, "w", encoding="utf-8") as sink,
+            ):
+                SECParser.clean_html_stream(source, sink)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
         return f"Cleaned: {os.path.basename(output_path)}"
 
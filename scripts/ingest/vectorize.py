@@ -1,14 +1,73 @@
+"""
+Vectorizes data/processed/*.txt into financial_reports.
+
+Every run is recorded in ingest_runs / ingest_files (per-file status:
+pending -> embedding -> committed | failed). Workers claim files with
+SELECT ... FOR UPDATE SKIP LOCKED, so --workers N processes on this machine
+(and the same command on other machines) share one run. Restarting resumes
+the unfinished run: committed files are not touched again, and a file that
+was interrupted continues from its last committed batch.
+
+Inside each worker, files flow through a three-stage pipeline:
+    claim + chunk (thread) -> embed (thread, --batch-size chunks per call)
+    -> persist (binary COPY per batch, see app/db/bulk_load.py)
+The next file is claimed and chunked while the current file's last batch
+embeds, so chunking overlaps embedding across files, yet a worker holds at
+most one claim that is not being embedded (it never sits on queued claims
+that go stale or that idle workers could take). Embedding and persisting
+overlap across batches and files.
+Reruns are incremental: unchanged files (see ingest_manifest) are skipped,
+only chunks with a new content hash are embedded, and chunks that vanished
+from a file are deleted. Chunks loaded before source_id existed are
+replaced when their ticker's files are ingested again. A throughput report (chunks/s, files/min) is
+printed at the end.
+
+Usage:
+    python scripts/ingest/vectorize.py --batch-size 64
+    python scripts/ingest/vectorize.py --workers 4
+    python scripts/ingest/vectorize.py --rebuild-index   # large initial loads
+"""
+
 import sys
 import os
+import re
+import time
+import socket
 import asyncio
+import argparse
 import logging
+import multiprocessing
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy import text
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 sys.path.append(os.getcwd())
 
+from app.core.config import settings
 from app.db.session import async_session_factory, init_db
-from app.models.report import FinancialReport
+from app.db.bulk_load import (
+    ReportBulkLoader,
+    report_record,
+    suspend_vector_index,
+    rebuild_vector_index,
+)
 from app.services.embedder import embedder
+from app.services.answer_cache import answer_cache
+from app.services.ingest_manifest import (
+    content_hash,
+    plan_source,
+    delete_stale_chunks,
+    delete_legacy_chunks,
+    record_manifest,
+)
+from app.services.ingest_queue import (
+    open_ingest_run,
+    claim_next_file,
+    record_progress,
+    finish_file,
+    close_run,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,50 +76,385 @@ logging.basicConfig(
 )
 logger = logging.getLogger("TITAN_VECTORIZER")
 
+splitter = RecursiveCharacterTextSplitter(
+    chunk_size=1000, chunk_overlap=150, separators=["\n\n", "\n", ".", " ", ""]
+)
 
-async def process_file(file_path: str, session):
-    filename = os.path.basename(file_path)
-    logger.info(f"Processing file: {filename}")
+# financial_reports.year is the fiscal year the report covers (what "2024
+# risks" means), read from the cover page: "For the fiscal year ended
+# September 28, 2024". clean_data.py names files {ticker}_{type}_{accession}.txt;
+# the accession number (0000320193-23-000106) only carries the filing year.
+YEAR_PART_PATTERN = re.compile(r"^(?:19|20)\d{2}$")
+PERIOD_PATTERN = re.compile(
+    r"(?:fiscal\s+year|quarterly\s+period|transition\s+period)\s+ended:?\s+"
+    r"[A-Za-z]+\.?\s+\d{1,2}\s*,?\s*((?:19|20)\d{2})",
+    re.IGNORECASE,
+)
+ACCESSION_PATTERN = re.compile(r"\d{10}-(\d{2})-\d{6}")
+COVER_PAGE_CHARS = 20000  # the period of report is on the cover page
+
+# Corrects rows stored with another year (hard-coded 2025, or the filing year).
+YEAR_BACKFILL_SQL = text(
+    "UPDATE financial_reports SET year = :year "
+    "WHERE source_id = :source_id AND year <> :year"
+)
+
+
+@dataclass
+class ChunkedFile:
+    filename: str
+    source_id: str
+    ticker: str
+    report_type: str
+    year: int
+    file_hash: str
+    chunks: list[str]
+    hashes: list[str]
+    task_id: int = 0  # ingest_files.id
+    attempts: int = 0
+    worker_id: str = ""
+    pending: list[int] = field(default_factory=list)  # chunk indices to embed
+    stale: list[str] = field(default_factory=list)  # hashes to delete
+    failed: bool = False
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
 
-        parts = filename.split("_")
-        ticker = parts[0] if len(parts) > 0 else "UNKOWN"
-        report_type = parts[1] if len(parts) > 1 else "10-K"
-        year = 2025
+@dataclass
+class EmbeddedBatch:
+    chunked: ChunkedFile
+    indices: list[int]
+    vectors: list[list[float]]
+    last: bool
 
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=150, separators=["\n\n", "\n", ".", " ", ""]
+
+def fiscal_year(filename: str, text: str) -> int:
+    """
+    Fiscal year of a processed filing: an explicit four-digit year part of
+    the filename if present, else the period of report on the cover page,
+    else the year before the accession's filing year (annual reports are
+    filed after the fiscal year ends), else the current year.
+    """
+    stem = os.path.splitext(filename)[0]
+    for part in stem.split("_")[2:]:
+        if YEAR_PART_PATTERN.match(part):
+            return int(part)
+    period = PERIOD_PATTERN.search(text[:COVER_PAGE_CHARS])
+    if period:
+        return int(period.group(1))
+    accession = ACCESSION_PATTERN.search(stem)
+    if accession:
+        logger.warning(
+            f"No period of report in {filename}; assuming the year before filing."
         )
-        chunks = splitter.split_text(text)
-
-        logger.info(f"Split into {len(chunks)} chunks. Generating embeddings...")
-
-        new_records = []
-        for i, chunk in enumerate(chunks):
-            vector = embedder.generate_embedding(chunk)
-            record = FinancialReport(
-                company_ticker=ticker,
-                year=year,
-                report_type=report_type,
-                section=f"chunk_{i}",
-                content=chunk,
-                embedding=vector,
+        return 2000 + int(accession.group(1)) - 1
+    logger.warning(f"No fiscal year in {filename}; using the current year.")
+    return datetime.utcnow().year
+
+
+def read_fiscal_year(file_path: str) -> int:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return fiscal_year(os.path.basename(file_path), f.read(COVER_PAGE_CHARS))
+
+
+async def backfill_years(processed_dir: str, files: list[str]) -> int:
+    """
+    Stores the fiscal year of every already-ingested file on its rows, so
+    unchanged files (skipped by the run) are fixed too. Rows without a
+    source_id are replaced when their ticker is ingested again.
+    """
+    years = await asyncio.to_thread(
+        lambda: {
+            os.path.splitext(f)[0]: read_fiscal_year(os.path.join(processed_dir, f))
+            for f in files
+        }
+    )
+    updated = 0
+    async with async_session_factory() as session:
+        for source_id, year in years.items():
+            result = await session.execute(
+                YEAR_BACKFILL_SQL, {"source_id": source_id, "year": year}
             )
-            new_records.append(record)
+            updated += result.rowcount or 0
+        await session.commit()
+    return updated
+
 
-        session.add_all(new_records)
+def chunk_file(file_path: str) -> ChunkedFile:
+    filename = os.path.basename(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    # Identical chunks in one file are stored once (unique per source + hash).
+    unique = {}
+    for chunk in splitter.split_text(text):
+        if chunk.strip():
+            unique.setdefault(content_hash(chunk), chunk)
+
+    parts = filename.split("_")
+    return ChunkedFile(
+        filename=filename,
+        source_id=os.path.splitext(filename)[0],
+        ticker=parts[0] if len(parts) > 0 else "UNKOWN",
+        report_type=parts[1] if len(parts) > 1 else "10-K",
+        year=fiscal_year(filename, text),
+        file_hash=content_hash(text),
+        chunks=list(unique.values()),
+        hashes=list(unique.keys()),
+    )
+
+
+async def fail_file(
+    task_id: int, attempts: int, filename: str, error: Exception, worker_id: str
+):
+    """
+    Re-queues the file for another worker, or fails it after
+    INGEST_MAX_ATTEMPTS attempts (unless another worker took it over).
+    """
+    retry = attempts < settings.INGEST_MAX_ATTEMPTS
+    logger.error(f"Error processing {filename} (attempt {attempts}): {error}")
+    async with async_session_factory() as session:
+        await finish_file(
+            session,
+            task_id,
+            "pending" if retry else "failed",
+            error=str(error),
+            worker_id=worker_id,
+        )
         await session.commit()
-        logger.info(f"Persisted {len(new_records)} vectors for {ticker}.")
 
-    except Exception as e:
-        logger.error(f"Error processing {filename}: {e}")
-        await session.rollback()
 
+async def chunk_stage(
+    run_id: str,
+    worker_id: str,
+    processed_dir: str,
+    out_queue: asyncio.Queue,
+    embed_ready: asyncio.Semaphore,
+):
+    """
+    Claims files of the run and diffs them against what is already stored,
+    so only new chunks reach the embedder. Chunks committed before a crash
+    are already stored, which is what makes an interrupted file resume
+    from its last committed batch. The next file is claimed once
+    'embed_ready' says the embed stage is on the current file's last batch.
+    """
+    while True:
+        await embed_ready.acquire()
+        async with async_session_factory() as session:
+            task = await claim_next_file(session, run_id, worker_id)
+        if task is None:
+            break
 
-async def main():
+        try:
+            chunked = await asyncio.to_thread(
+                chunk_file, os.path.join(processed_dir, task.filename)
+            )
+            chunked.task_id, chunked.attempts = task.id, task.attempts
+            chunked.worker_id = worker_id
+            async with async_session_factory() as session:
+                plan = await plan_source(
+                    session,
+                    chunked.source_id,
+                    chunked.file_hash,
+                    chunked.hashes,
+                    embedder.model_name,
+                )
+                if plan.unchanged:
+                    await finish_file(
+                        session,
+                        task.id,
+                        "committed",
+                        chunks_total=0,
+                        worker_id=worker_id,
+                    )
+                    await session.commit()
+        except Exception as e:
+            await fail_file(task.id, task.attempts, task.filename, e, worker_id)
+            embed_ready.release()
+            continue
+
+        if plan.unchanged:
+            logger.info(f"{chunked.filename} is unchanged, skipping.")
+            embed_ready.release()
+            continue
+
+        chunked.pending = [
+            i for i, digest in enumerate(chunked.hashes) if digest in plan.pending
+        ]
+        chunked.stale = plan.stale
+        logger.info(
+            f"{chunked.filename}: {len(chunked.chunks)} chunks, "
+            f"{len(chunked.pending)} to embed, {len(chunked.stale)} stale."
+        )
+        await out_queue.put(chunked)
+    await out_queue.put(None)
+
+
+async def embed_stage(
+    in_queue: asyncio.Queue,
+    out_queue: asyncio.Queue,
+    batch_size: int,
+    embed_ready: asyncio.Semaphore,
+):
+    """
+    Embeds each file batch by batch. The 'embed_ready' slot is released
+    when the file's last batch goes to the embedder, so the chunk stage
+    claims and chunks the next file while that batch embeds.
+    """
+    while (chunked := await in_queue.get()) is not None:
+        released = False
+        if not chunked.pending:
+            await out_queue.put(EmbeddedBatch(chunked, [], [], last=True))
+
+        for start in range(0, len(chunked.pending), batch_size):
+            if chunked.failed:  # a previous batch failed to persist
+                break
+            indices = chunked.pending[start : start + batch_size]
+            last = start + batch_size >= len(chunked.pending)
+            if last:
+                embed_ready.release()
+                released = True
+            try:
+                vectors = await asyncio.to_thread(
+                    embedder.embed_documents,
+                    [chunked.chunks[i] for i in indices],
+                    batch_size,
+                )
+            except Exception as e:
+                chunked.failed = True
+                await fail_file(
+                    chunked.task_id,
+                    chunked.attempts,
+                    chunked.filename,
+                    e,
+                    chunked.worker_id,
+                )
+                break
+            await out_queue.put(EmbeddedBatch(chunked, indices, vectors, last))
+        if not released:  # nothing to embed, or the file failed early
+            embed_ready.release()
+    await out_queue.put(None)
+
+
+async def persist_stage(in_queue: asyncio.Queue, loader: ReportBulkLoader):
+    """
+    Upserts each embedded batch and checkpoints it. After the last batch of
+    a file, deletes its stale chunks, records it in the manifest and marks
+    it committed in one transaction.
+    """
+    while (batch := await in_queue.get()) is not None:
+        chunked = batch.chunked
+        if chunked.failed:
+            continue
+
+        try:
+            await loader.load(
+                report_record(
+                    chunked.ticker,
+                    chunked.year,
+                    chunked.report_type,
+                    f"chunk_{i}",
+                    chunked.chunks[i],
+                    vector,
+                    source_id=chunked.source_id,
+                    content_hash=chunked.hashes[i],
+                )
+                for i, vector in zip(batch.indices, batch.vectors)
+            )
+            async with async_session_factory() as session:
+                if batch.indices:
+                    await record_progress(session, chunked.task_id, len(batch.indices))
+                if batch.last:
+                    await delete_stale_chunks(session, chunked.source_id, chunked.stale)
+                    legacy = await delete_legacy_chunks(
+                        session, chunked.ticker, chunked.report_type
+                    )
+                    if legacy:
+                        logger.info(
+                            f"Replaced {legacy} {chunked.ticker} {chunked.report_type} "
+                            "chunks loaded without a source_id."
+                        )
+                    await record_manifest(
+                        session,
+                        chunked.source_id,
+                        chunked.ticker,
+                        chunked.file_hash,
+                        len(chunked.chunks),
+                        embedder.model_name,
+                    )
+                    owned = await finish_file(
+                        session,
+                        chunked.task_id,
+                        "committed",
+                        chunks_total=len(chunked.chunks),
+                        worker_id=chunked.worker_id,
+                    )
+                    if not owned:
+                        raise RuntimeError("claim was taken over by another worker")
+                    await session.commit()
+        except Exception as e:
+            chunked.failed = True
+            await fail_file(
+                chunked.task_id,
+                chunked.attempts,
+                chunked.filename,
+                e,
+                chunked.worker_id,
+            )
+            continue
+
+        if not batch.last:
+            continue
+        logger.info(
+            f"Committed {chunked.filename}: {len(chunked.pending)} vectors "
+            f"({len(chunked.stale)} stale removed)."
+        )
+        if not chunked.pending and not chunked.stale:
+            continue
+
+        try:
+            # Cached answers about this ticker were built from the old corpus.
+            await answer_cache.invalidate_ticker(chunked.ticker)
+        except Exception as e:
+            logger.error(f"Answer cache invalidation failed for {chunked.ticker}: {e}")
+
+
+async def run_worker(run_id: str, processed_dir: str, args):
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    chunked_queue = asyncio.Queue(maxsize=1)
+    embedded_queue = asyncio.Queue(maxsize=args.depth)
+    # One claim ahead: the next file is claimed when the last batch of the
+    # current one is embedding.
+    embed_ready = asyncio.Semaphore(1)
+
+    logger.info(f"Worker {worker_id} joined run {run_id}.")
+    async with ReportBulkLoader(batch_size=args.copy_batch_rows) as loader:
+        await asyncio.gather(
+            chunk_stage(run_id, worker_id, processed_dir, chunked_queue, embed_ready),
+            embed_stage(chunked_queue, embedded_queue, args.batch_size, embed_ready),
+            persist_stage(embedded_queue, loader),
+        )
+
+
+def worker_process(run_id: str, processed_dir: str, args):
+    """
+    Entry point of each --workers process (own event loop and DB pool).
+    """
+    asyncio.run(run_worker(run_id, processed_dir, args))
+
+
+def report(summary: dict, elapsed: float):
+    files = summary["files"]
+    committed = files.get("committed", 0)
+    embedded = summary["chunks_embedded"]
+    print(f"\nVectorization throughput ({elapsed:.1f}s wall clock)")
+    print(
+        f"Files:  {committed} committed, {files.get('failed', 0)} failed, "
+        f"{files.get('pending', 0) + files.get('embedding', 0)} left"
+    )
+    print(f"Chunks: {embedded} embedded ({embedded / elapsed:.1f} chunks/s)")
+    print(f"Files/min: {committed * 60 / elapsed:.1f}")
+
+
+async def main(args):
     logger.info("Initializing Database Infrastructure...")
     await init_db()
     logger.info("Database ready.")
@@ -71,21 +465,86 @@ async def main():
         logger.error(f"Directory not found: {processed_dir}. Run clean_data.py first.")
         return
 
-    files = [f for f in os.listdir(processed_dir) if f.endswith(".txt")]
+    files = sorted(f for f in os.listdir(processed_dir) if f.endswith(".txt"))
 
     if not files:
         logger.warning("No files found to vectorize.")
         return
 
-    logger.info(f"Starting Vectorization Job for {len(files)} files...")
+    backfilled = await backfill_years(processed_dir, files)
+    if backfilled:
+        logger.info(f"Backfilled the fiscal year of {backfilled} chunks.")
+
+    async with async_session_factory() as session:
+        run, resumed = await open_ingest_run(session, files, new_run=args.new_run)
+    logger.info(
+        f"{'Resuming' if resumed else 'Starting'} Vectorization Job {run.id} "
+        f"for {len(files)} files with {args.workers} worker(s)..."
+    )
+
+    started = time.perf_counter()
+    if args.rebuild_index:
+        await suspend_vector_index()
+    try:
+        if args.workers > 1:
+            context = multiprocessing.get_context("spawn")
+            workers = [
+                context.Process(
+                    target=worker_process, args=(run.id, processed_dir, args)
+                )
+                for _ in range(args.workers)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                await asyncio.to_thread(worker.join)
+        else:
+            await run_worker(run.id, processed_dir, args)
+    finally:
+        if args.rebuild_index:
+            await rebuild_vector_index()
 
     async with async_session_factory() as session:
-        for file in files:
-            full_path = os.path.join(processed_dir, file)
-            await process_file(full_path, session)
+        summary = await close_run(session, run.id)
 
     logger.info("Vectorization Job Completed.")
+    report(summary, time.perf_counter() - started)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.INGEST_WORKERS,
+        help="Ingest processes claiming files from the run",
+    )
+    parser.add_argument(
+        "--new-run",
+        action="store_true",
+        help="Start a new run instead of resuming the unfinished one",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.INGEST_EMBED_BATCH_SIZE,
+        help="Chunks per embed_documents call (and per checkpoint)",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=settings.INGEST_PIPELINE_DEPTH,
+        help="Embedded batches buffered between the embed and persist stages",
+    )
+    parser.add_argument(
+        "--copy-batch-rows",
+        type=int,
+        default=settings.INGEST_COPY_BATCH_ROWS,
+        help="Rows per COPY transaction",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Drop the vector index during the load and rebuild it once at the end",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -1,5 +1,8 @@
+import asyncio
 import pytest
 import pytest_asyncio
+import httpx
+from fastapi import FastAPI, HTTPException
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel, text
@@ -8,10 +11,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from app.main import app
 from app.agents.nodes import AgentNodes
 from app.core.config import settings
+from app.services import chronos_client
 
 
 @pytest_asyncio.fixture
-async def client():
+async def client(monkeypatch):
+    # Endpoint tests exercise the pipeline, not replays from the answer cache.
+    monkeypatch.setattr(settings, "ANSWER_CACHE_ENABLED", False)
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as ac:
@@ -52,7 +58,7 @@ def mock_session():
 
 
 @pytest.fixture
-def nodes_with_mocks(mock_session):
+def nodes_with_mocks():
     """
     Initialize AgentNodes with all external tools mocked.
     """
@@ -63,7 +69,7 @@ def nodes_with_mocks(mock_session):
         patch("app.agents.nodes.PythonREPL"),
         patch("app.agents.nodes.load_mcp_tools"),
     ):
-        nodes = AgentNodes(mock_session)
+        nodes = AgentNodes()
 
         nodes.repl = MagicMock()
         return nodes
@@ -90,3 +96,77 @@ async def db_session(setup_test_db):
         yield session
 
     await test_engine.dispose()
+
+
+def build_chronos_stub(batch: bool = False, delay: float = 0.0):
+    """
+    Local stand-in for the CHRONOS API (same routes and payloads).
+    Tickers starting with 'Z' are unknown (404). The optional batch route
+    shows up in /openapi.json like on the real service.
+    """
+    stub = FastAPI()
+    stub.state.calls = []
+    stub.state.in_flight = 0
+    stub.state.max_in_flight = 0
+
+    def forecast(ticker: str) -> dict:
+        return {
+            "ticker": ticker,
+            "target_date": "2026-04-14T00:00:00",
+            "predicted_close": float(len(ticker) * 100),
+            "model_used": "Ridge",
+            "model_run_id": "gs://stub",
+            "environment": "test",
+        }
+
+    @stub.get("/forecast/{ticker}")
+    async def get_forecast(ticker: str):
+        stub.state.calls.append(("GET", ticker))
+        stub.state.in_flight += 1
+        stub.state.max_in_flight = max(stub.state.max_in_flight, stub.state.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            stub.state.in_flight -= 1
+        if ticker.startswith("Z"):
+            raise HTTPException(status_code=404, detail="Unknown ticker")
+        return forecast(ticker)
+
+    if batch:
+
+        @stub.post("/forecast/batch")
+        async def get_forecasts(payload: dict):
+            tickers = payload["tickers"]
+            stub.state.calls.append(("POST", tuple(tickers)))
+            return {
+                "forecasts": [forecast(t) for t in tickers if not t.startswith("Z")],
+                "errors": {t: "Unknown ticker" for t in tickers if t.startswith("Z")},
+            }
+
+    return stub
+
+
+@pytest_asyncio.fixture
+async def chronos_server(monkeypatch):
+    """
+    Factory fixture: points the shared CHRONOS client at an in-process stub
+    server (no network) and returns the stub app for assertions.
+    """
+    monkeypatch.setattr(settings, "CHRONOS_RETRY_BACKOFF_SECONDS", 0)
+    chronos_client.breaker.reset()
+
+    def install(**kwargs):
+        stub = build_chronos_stub(**kwargs)
+        monkeypatch.setattr(
+            chronos_client,
+            "http_client",
+            chronos_client.build_http_client(
+                transport=httpx.ASGITransport(app=stub),
+            ),
+        )
+        monkeypatch.setattr(chronos_client, "batch_supported", None)
+        return stub
+
+    yield install
+    await chronos_client.close_chronos_client()
+    chronos_client.breaker.reset()
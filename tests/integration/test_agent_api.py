@@ -5,18 +5,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 @pytest.fixture
 def mock_graph_execution():
     """
-    It intercepts the creation and execution of TitanGraph within the endpoints.
+    It intercepts the process-wide compiled TitanGraph used by the endpoints.
     It allows us to simulate agent responses without touching the database or the LLM.
     """
-    with patch("app.main.TitanGraph") as MockGraphClass:
-        mock_instance = MockGraphClass.return_value
-        mock_compiled_app = MagicMock()
-        mock_compiled_app.ainvoke = AsyncMock()
-        mock_compiled_app.aget_state = AsyncMock()
-        mock_compiled_app.aupdate_state = AsyncMock()
-
-        mock_instance.get = AsyncMock(return_value=mock_compiled_app)
+    mock_compiled_app = MagicMock()
+    mock_compiled_app.ainvoke = AsyncMock()
+    mock_compiled_app.aget_state = AsyncMock()
+    mock_compiled_app.aupdate_state = AsyncMock()
 
+    with patch("app.main.get_graph", return_value=mock_compiled_app):
         mock_state_snapshot = MagicMock()
         mock_state_snapshot.values = {"next_step": "human_intervention", "loop_step": 1}
         mock_state_snapshot.next = ("human_intervention",)
@@ -45,6 +42,11 @@ async def test_agent_chat_success(client, mock_graph_execution):
     assert data["answer"] == "<html>Report</html>"
     assert len(data["sources"]) == 1
 
+    # The request-scoped DB session travels in the config, not the graph.
+    _, config = mock_graph_execution.ainvoke.call_args.args
+    assert config["configurable"]["thread_id"] == "test_1"
+    assert "session" in config["configurable"]
+
 
 @pytest.mark.asyncio
 async def test_agent_chat_hitl_pause(client, mock_graph_execution):
@@ -67,6 +69,37 @@ async def test_agent_chat_hitl_pause(client, mock_graph_execution):
     assert data["error"] == "Division by zero"
 
 
+@pytest.mark.asyncio
+async def test_agent_chat_served_from_answer_cache(
+    client, mock_graph_execution, monkeypatch
+):
+    """
+    Scenario: A near-duplicate question is answered without running the graph.
+    """
+    monkeypatch.setattr("app.core.config.settings.ANSWER_CACHE_ENABLED", True)
+    cached = {"status": "COMPLETED", "answer": "<html>Cached</html>", "sources": []}
+
+    with (
+        patch(
+            "app.services.answer_cache.embedder.aembed", AsyncMock(return_value=[1.0])
+        ),
+        patch("app.main.answer_cache._scope", AsyncMock(return_value="agent|AAPL@1")),
+        patch("app.main.answer_cache._lookup", AsyncMock(return_value=cached)),
+    ):
+        response = await client.post(
+            "/chat/agent", json={"question": "Analyze Apple", "thread_id": "t"}
+        )
+
+    assert response.json() == {**cached, "cached": True}
+    mock_graph_execution.ainvoke.assert_not_awaited()
+    # The cached turn is still written to the thread's checkpoint.
+    _, values = mock_graph_execution.aupdate_state.await_args.args
+    assert values["generation"] == "<html>Cached</html>"
+    assert mock_graph_execution.aupdate_state.await_args.kwargs == {
+        "as_node": "reporter_agent"
+    }
+
+
 @pytest.mark.asyncio
 async def test_agent_resume_success(client, mock_graph_execution):
     """
@@ -84,3 +117,81 @@ async def test_agent_resume_success(client, mock_graph_execution):
     data = response.json()
     assert data["status"] == "Resumed"
     assert data["answer"] == "<html>Corrected Report</html>"
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_sends_sse(client, mock_graph_execution):
+    """
+    Scenario: The streaming endpoint pushes node events, then the final answer.
+    """
+
+    async def fake_events(graph_input, config, version):
+        assert "session" in config["configurable"]
+        yield {
+            "event": "on_chain_start",
+            "name": "supervisor",
+            "metadata": {"langgraph_node": "supervisor"},
+        }
+
+    mock_graph_execution.astream_events = fake_events
+    mock_graph_execution.aget_state.return_value.values = {
+        "generation": "<html>Report</html>",
+        "sources": [],
+    }
+
+    payload = {"question": "Analyze Apple", "thread_id": "test_stream"}
+    with patch("app.main.async_session_factory", return_value=AsyncMock()):
+        response = await client.post("/chat/agent/stream", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = response.text
+    assert body.startswith("event: start\n")
+    assert "event: node_start" in body
+    assert "event: completed" in body
+    assert "<html>Report</html>" in body
+
+
+@pytest.mark.asyncio
+async def test_submit_agent_job_returns_immediately(client):
+    job = MagicMock(id="abc123", status="queued")
+
+    with patch(
+        "app.main.enqueue_agent_job", new_callable=AsyncMock, return_value=(job, False)
+    ) as mock_enqueue:
+        response = await client.post(
+            "/jobs/agent",
+            json={"question": "Analyze Apple", "thread_id": "job_1"},
+            headers={"Idempotency-Key": "req-42"},
+        )
+
+    assert response.status_code == 202
+    assert response.json() == {
+        "job_id": "abc123",
+        "status": "queued",
+        "deduplicated": True,
+    }
+    assert mock_enqueue.call_args.kwargs["idempotency_key"] == "req-42"
+
+
+@pytest.mark.asyncio
+async def test_get_agent_job_status(client):
+    job = MagicMock(
+        id="abc123",
+        status="completed",
+        result={"status": "COMPLETED", "answer": "<html/>"},
+        error=None,
+        attempts=1,
+        created_at=None,
+        started_at=None,
+        finished_at=None,
+    )
+
+    with patch("app.main.get_job", new_callable=AsyncMock, return_value=job):
+        response = await client.get("/jobs/abc123")
+    with patch("app.main.get_job", new_callable=AsyncMock, return_value=None):
+        missing = await client.get("/jobs/nope")
+
+    assert response.status_code == 200
+    assert response.json()["result"]["answer"] == "<html/>"
+    assert missing.status_code == 404
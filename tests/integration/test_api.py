@@ -5,3 +5,12 @@ async def test_health_check(client):
     data = response.json()
     assert data["status"] == "active"
     assert data["system"] == "TITAN"
+
+
+async def test_metrics_exposes_cache_counters(client):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "llm_clients" in data
+    assert {"hits", "misses", "evictions"} <= data["embedding_cache"].keys()
@@ -1,6 +1,8 @@
 import pytest
+from sqlalchemy import delete
 from sqlmodel import select
 from app.models.report import FinancialReport
+from app.services.ingest_manifest import delete_legacy_chunks, plan_source
 
 
 @pytest.mark.asyncio
@@ -84,3 +86,57 @@ async def test_database_persistence(db_session):
 
     await db_session.delete(fetched)
     await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_legacy_rows_are_replaced_not_duplicated(db_session):
+    """
+    Rows from before source_id existed (NULL source_id) are not matched by
+    the incremental plan, so they are deleted when the file is re-ingested.
+    """
+
+    def chunk(ticker, report_type, content, source_id=None):
+        return FinancialReport(
+            company_ticker=ticker,
+            year=2025,
+            report_type=report_type,
+            section="chunk_0",
+            content=content,
+            source_id=source_id,
+            embedding=[0.1] * 768,
+        )
+
+    db_session.add_all(
+        [
+            chunk("LEGA", "10-K", "old A"),
+            chunk("LEGA", "10-K", "old A"),
+            chunk("LEGA", "10-Q", "old Q"),
+            chunk("LEGB", "10-K", "old B"),
+        ]
+    )
+    await db_session.commit()
+
+    plan = await plan_source(db_session, "LEGA_10-K_x", "f1", ["h1"], "model")
+    assert plan.pending == {"h1"} and plan.stale == []
+
+    db_session.add(chunk("LEGA", "10-K", "new A", source_id="LEGA_10-K_x"))
+    assert await delete_legacy_chunks(db_session, "LEGA", "10-K") == 2
+    await db_session.commit()
+
+    result = await db_session.execute(
+        select(FinancialReport.company_ticker, FinancialReport.content).where(
+            FinancialReport.company_ticker.in_(["LEGA", "LEGB"])
+        )
+    )
+    assert sorted(result.all()) == [
+        ("LEGA", "new A"),
+        ("LEGA", "old Q"),
+        ("LEGB", "old B"),
+    ]
+
+    await db_session.execute(
+        delete(FinancialReport).where(
+            FinancialReport.company_ticker.in_(["LEGA", "LEGB"])
+        )
+    )
+    await db_session.commit()
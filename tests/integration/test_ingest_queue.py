@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.ingest_queue import (
+    open_ingest_run,
+    claim_next_file,
+    record_progress,
+    finish_file,
+    close_run,
+)
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_the_unfinished_run(db_session):
+    run, resumed = await open_ingest_run(db_session, ["AAPL_10-K.txt"])
+    again, resumed_again = await open_ingest_run(
+        db_session, ["AAPL_10-K.txt", "MSFT_10-K.txt"]
+    )
+
+    assert not resumed and resumed_again
+    assert again.id == run.id
+
+    summary = await close_run(db_session, run.id)
+    assert summary["files"] == {"pending": 2}
+
+
+@pytest.mark.asyncio
+async def test_workers_claim_different_files(db_session):
+    run, _ = await open_ingest_run(db_session, ["A_10-K.txt", "B_10-K.txt"])
+
+    async with AsyncSession(db_session.bind) as other_session:
+        first = await claim_next_file(db_session, run.id, "worker-1")
+        second = await claim_next_file(other_session, run.id, "worker-2")
+        assert await claim_next_file(other_session, run.id, "worker-2") is None
+
+    assert {first.filename, second.filename} == {"A_10-K.txt", "B_10-K.txt"}
+    assert first.status == "embedding" and first.attempts == 1
+
+    await record_progress(db_session, first.id, 64)
+    # A worker that lost its claim cannot touch the file.
+    assert not await finish_file(db_session, first.id, "pending", worker_id="other")
+    assert await finish_file(
+        db_session, first.id, "committed", chunks_total=64, worker_id=first.worker_id
+    )
+    await finish_file(db_session, second.id, "committed", chunks_total=0)
+    await db_session.commit()
+
+    summary = await close_run(db_session, run.id)
+    assert summary == {
+        "files": {"committed": 2},
+        "chunks_total": 64,
+        "chunks_embedded": 64,
+    }
+    _, resumed = await open_ingest_run(db_session, [])
+    assert not resumed
@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.job import AgentJob
+from app.services.job_queue import (
+    enqueue_agent_job,
+    claim_next_job,
+    finish_job,
+    heartbeat_job,
+    get_job,
+)
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_deduplicates_submissions(db_session):
+    first, created = await enqueue_agent_job(
+        db_session, "Analyze Apple", "t1", idempotency_key="req-1"
+    )
+    again, created_again = await enqueue_agent_job(
+        db_session, "Analyze Apple", "t1", idempotency_key="req-1"
+    )
+    other, _ = await enqueue_agent_job(db_session, "Analyze Apple", "t1")
+
+    assert created and not created_again
+    assert again.id == first.id
+    assert other.id != first.id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_claim_different_jobs(db_session):
+    """
+    SKIP LOCKED: a second worker polling while the first holds its row lock
+    gets the next job instead of blocking or double-claiming.
+    """
+    job_a, _ = await enqueue_agent_job(db_session, "Q1", "t1")
+    job_b, _ = await enqueue_agent_job(db_session, "Q2", "t2")
+
+    async with AsyncSession(db_session.bind) as other_session:
+        claimed_1 = await claim_next_job(db_session, "worker-1")
+        claimed_2 = await claim_next_job(other_session, "worker-2")
+        assert await claim_next_job(other_session, "worker-2") is None
+
+    assert {claimed_1.id, claimed_2.id} == {job_a.id, job_b.id}
+    assert claimed_1.status == "running" and claimed_1.attempts == 1
+
+    # Only the worker that owns the running job can record its outcome.
+    assert not await finish_job(
+        db_session, claimed_1.id, "failed", worker_id="someone-else"
+    )
+    assert await finish_job(
+        db_session,
+        claimed_1.id,
+        "completed",
+        result={"answer": "ok"},
+        worker_id=claimed_1.worker_id,
+    )
+    db_session.expire_all()
+    finished = await get_job(db_session, claimed_1.id)
+    assert finished.status == "completed"
+    assert finished.result == {"answer": "ok"}
+    assert finished.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_a_long_job_from_being_reclaimed(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.job_queue.settings.JOB_STALE_SECONDS", 60)
+    job, _ = await enqueue_agent_job(db_session, "Q3", "t3")
+    claimed = await claim_next_job(db_session, "worker-1")
+    long_ago = datetime.utcnow() - timedelta(seconds=120)
+    await db_session.execute(
+        update(AgentJob)
+        .where(AgentJob.id == job.id)
+        .values(started_at=long_ago, heartbeat_at=long_ago)
+    )
+    await db_session.commit()
+
+    async def claim_all():
+        claimed = []
+        while (next_job := await claim_next_job(db_session, "worker-2")) is not None:
+            claimed.append(next_job)
+        return claimed
+
+    assert await heartbeat_job(db_session, claimed.id, "worker-1")
+    assert not await heartbeat_job(db_session, claimed.id, "someone-else")
+    assert job.id not in [j.id for j in await claim_all()]
+
+    await db_session.execute(
+        update(AgentJob).where(AgentJob.id == job.id).values(heartbeat_at=long_ago)
+    )
+    await db_session.commit()
+    reclaimed = [j for j in await claim_all() if j.id == job.id]
+    assert reclaimed and reclaimed[0].attempts == 2
@@ -1,6 +1,9 @@
+import time
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.agents.state import AgentState
+from app.core.config import settings
 
 
 @pytest.mark.asyncio
@@ -75,3 +78,173 @@ async def test_supervisor_force_forecast_then_reporter(nodes_with_mocks):
 
     assert result_2["next_step"] == "reporter_agent"
     assert result_2["loop_step"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieve_uses_session_from_config(nodes_with_mocks, mock_session):
+    """
+    Test that the retrieve node binds the RetrievalService to the
+    request-scoped session passed through the LangGraph config.
+    """
+    chunk = MagicMock(content="Revenue grew", company_ticker="AAPL", section="chunk_0")
+
+    with patch("app.agents.nodes.RetrievalService") as MockRetriever:
+        MockRetriever.return_value.search_relevant_chunks = AsyncMock(
+            return_value=[(chunk, 0.12)]
+        )
+        MockRetriever.return_value.stored_tickers = AsyncMock(return_value={"AAPL"})
+        state = AgentState(question="Apple revenue?", documents=[], loop_step=0)
+        config = {"configurable": {"thread_id": "t1", "session": mock_session}}
+
+        result_state = await nodes_with_mocks.retrieve(state, config)
+
+    MockRetriever.assert_called_once_with(mock_session)
+    assert result_state["documents"] == ["Revenue grew"]
+    assert result_state["sources"] == ["AAPL (chunk_0)"]
+    assert result_state["distances"] == [0.12]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_relaxes_year_but_keeps_ticker(nodes_with_mocks, mock_session):
+    chunk = MagicMock(content="Risk", company_ticker="AAPL", section="chunk_0")
+
+    with patch("app.agents.nodes.RetrievalService") as MockRetriever:
+        search = AsyncMock(side_effect=[[], [(chunk, 0.2)]])
+        MockRetriever.return_value.search_relevant_chunks = search
+        MockRetriever.return_value.stored_tickers = AsyncMock(return_value={"AAPL"})
+        state = AgentState(question="Apple 2023 risk factors", documents=[])
+        config = {"configurable": {"session": mock_session}}
+
+        result_state = await nodes_with_mocks.retrieve(state, config)
+
+    first, second = (call.kwargs["filters"] for call in search.await_args_list)
+    assert first.year_from == 2023
+    assert second.year_from is None and second.tickers == ["AAPL"]
+    assert result_state["documents"] == ["Risk"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_ignores_acronyms_that_are_not_stored_tickers(
+    nodes_with_mocks, mock_session
+):
+    chunk = MagicMock(content="ESG", company_ticker="MSFT", section="chunk_0")
+
+    with patch("app.agents.nodes.RetrievalService") as MockRetriever:
+        search = AsyncMock(return_value=[(chunk, 0.3)])
+        MockRetriever.return_value.search_relevant_chunks = search
+        MockRetriever.return_value.stored_tickers = AsyncMock(return_value=set())
+        state = AgentState(question="What are the main ESG risks?", documents=[])
+        config = {"configurable": {"session": mock_session}}
+
+        result_state = await nodes_with_mocks.retrieve(state, config)
+
+    assert search.await_args.kwargs["filters"].is_empty()
+    assert result_state["documents"] == ["ESG"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_ends_with_an_unfiltered_search(nodes_with_mocks, mock_session):
+    chunk = MagicMock(content="Risk", company_ticker="AAPL", section="chunk_0")
+
+    with patch("app.agents.nodes.RetrievalService") as MockRetriever:
+        search = AsyncMock(side_effect=[[], [], [(chunk, 0.4)]])
+        MockRetriever.return_value.search_relevant_chunks = search
+        MockRetriever.return_value.stored_tickers = AsyncMock(return_value={"AAPL"})
+        state = AgentState(question="Apple 2023 risk factors", documents=[])
+        config = {"configurable": {"session": mock_session}}
+
+        result_state = await nodes_with_mocks.retrieve(state, config)
+
+    assert search.await_args.kwargs["filters"].is_empty()
+    assert result_state["documents"] == ["Risk"]
+
+
+@pytest.mark.asyncio
+async def test_grade_documents_prefilter_skips_llm(nodes_with_mocks, monkeypatch):
+    """
+    Conclusive distances are graded without an LLM call; only the
+    ambiguous middle band reaches the grader chain.
+    """
+    monkeypatch.setattr(settings, "GRADER_AUTO_ACCEPT_DISTANCE", 0.2)
+    monkeypatch.setattr(settings, "GRADER_AUTO_REJECT_DISTANCE", 0.45)
+    state = AgentState(
+        question="Apple risks?",
+        documents=["very close", "ambiguous", "far away"],
+        sources=["s1", "s2", "s3"],
+        distances=[0.05, 0.3, 0.9],
+    )
+
+    with patch(
+        "langchain_core.runnables.base.RunnableSequence.ainvoke", new_callable=AsyncMock
+    ) as mock_chain:
+        mock_chain.return_value = {"score": "yes"}
+        result_state = await nodes_with_mocks.grade_documents(state)
+
+    assert mock_chain.await_count == 1
+    assert result_state["documents"] == ["very close", "ambiguous"]
+    assert result_state["sources"] == ["s1", "s2"]
+    assert result_state["distances"] == [0.05, 0.3]
+
+
+def test_prefilter_cutoffs_are_off_until_calibrated(nodes_with_mocks, monkeypatch):
+    assert nodes_with_mocks.prefilter_grade(0.01) is None
+    assert nodes_with_mocks.prefilter_grade(0.99) is None
+
+    monkeypatch.setattr(settings, "GRADER_AUTO_ACCEPT_DISTANCE", 0.2)
+    assert nodes_with_mocks.prefilter_grade(0.1) == "yes"
+    assert nodes_with_mocks.prefilter_grade(0.99) is None
+
+
+@pytest.mark.asyncio
+async def test_grade_documents_concurrent_keeps_order_and_times_out(
+    nodes_with_mocks, monkeypatch
+):
+    """
+    Documents are graded concurrently; a slow grader counts as 'not relevant'
+    and the surviving documents keep their original order and sources.
+    """
+    monkeypatch.setattr("app.agents.nodes.settings.GRADER_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr("app.agents.nodes.settings.GRADER_CONCURRENCY", 4)
+    delays = {"doc_a": 0.02, "doc_b": 1.0, "doc_c": 0.0, "doc_d": 0.01}
+
+    async def fake_grader(inputs, *args, **kwargs):
+        await asyncio.sleep(delays[inputs["document"]])
+        return {"score": "yes"}
+
+    state = AgentState(
+        question="Apple risks?",
+        documents=list(delays),
+        sources=["s_a", "s_b", "s_c", "s_d"],
+    )
+
+    with patch(
+        "langchain_core.runnables.base.RunnableSequence.ainvoke",
+        side_effect=fake_grader,
+    ):
+        start = time.perf_counter()
+        result_state = await nodes_with_mocks.grade_documents(state)
+        elapsed = time.perf_counter() - start
+
+    assert result_state["documents"] == ["doc_a", "doc_c", "doc_d"]
+    assert result_state["sources"] == ["s_a", "s_c", "s_d"]
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_grade_documents_treats_non_dict_grades_as_not_relevant(
+    nodes_with_mocks, monkeypatch
+):
+    monkeypatch.setattr(settings, "GRADER_PREFILTER", False)
+    state = AgentState(
+        question="Apple risks?",
+        documents=["list reply", "dict reply"],
+        sources=["s1", "s2"],
+    )
+
+    with patch(
+        "langchain_core.runnables.base.RunnableSequence.ainvoke", new_callable=AsyncMock
+    ) as mock_chain:
+        mock_chain.side_effect = [["yes"], {"score": "yes"}]
+        result_state = await nodes_with_mocks.grade_documents(state)
+
+    assert result_state["documents"] == ["dict reply"]
@@ -0,0 +1,181 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.config import settings
+from app.services.answer_cache import AnswerCache, get_answer_cache_stats
+from app.services.intent_router import cosine_similarity
+
+
+class InMemoryAnswerCache(AnswerCache):
+    """AnswerCache with the Postgres tables replaced by dicts."""
+
+    def __init__(self):
+        super().__init__(session_factory=None)
+        self.versions = {}
+        self.rows = []
+
+    async def _scope(self, endpoint, tickers, years):
+        keys = tickers or ["*"]
+        versions = {k: self.versions.get(k, 0) for k in keys}
+        return self.scope_key(endpoint, versions, years)
+
+    async def _lookup(self, scope, embedding, ttl_seconds):
+        candidates = [
+            (cosine_similarity(embedding, row["embedding"]), row["response"])
+            for row in self.rows
+            if row["scope"] == scope
+        ]
+        best = max(candidates, key=lambda c: c[0], default=None)
+        if best and best[0] >= settings.ANSWER_CACHE_SIMILARITY:
+            return best[1]
+        return None
+
+    async def _store(self, scope, endpoint, tickers, question, embedding, response):
+        self.rows.append({"scope": scope, "embedding": embedding, "response": response})
+        self.stats["stores"] += 1
+
+    async def invalidate_ticker(self, ticker):
+        for key in (ticker, "*"):
+            self.versions[key] = self.versions.get(key, 0) + 1
+        self.stats["invalidations"] += 1
+
+
+async def fake_embed(text):
+    """'risks' questions point one way, everything else the other."""
+    return [1.0, 0.1] if "risk" in text.lower() else [0.1, 1.0]
+
+
+@pytest.fixture
+def cache():
+    with patch("app.services.answer_cache.embedder.aembed", fake_embed):
+        yield InMemoryAnswerCache()
+
+
+@pytest.mark.asyncio
+async def test_similar_question_is_served_from_cache(cache):
+    compute = AsyncMock(return_value={"answer": "Regulation", "sources": []})
+
+    first = await cache.get_or_compute("simple", "What are Apple's risks?", compute)
+    second = await cache.get_or_compute("simple", "Apple main risks", compute)
+
+    compute.assert_awaited_once()
+    assert first == {"answer": "Regulation", "sources": []}
+    assert second == {**first, "cached": True}
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_hit_rate_is_reported(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.answer_cache.answer_cache.stats",
+        {"hits": 3, "misses": 1, "stores": 1, "invalidations": 0, "errors": 0},
+    )
+    assert get_answer_cache_stats()["hit_rate"] == 0.75
+
+
+@pytest.mark.asyncio
+async def test_scope_separates_tickers_and_endpoints(cache):
+    compute = AsyncMock(return_value={"answer": "x"})
+
+    await cache.get_or_compute("simple", "Apple risks", compute)
+    await cache.get_or_compute("simple", "Tesla risks", compute)
+    await cache.get_or_compute("agent", "Apple risks", compute)
+
+    assert compute.await_count == 3
+    assert cache.stats["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_vectorizing_a_ticker_invalidates_its_answers(cache):
+    compute = AsyncMock(return_value={"answer": "old"})
+    await cache.get_or_compute("simple", "Apple risks", compute)
+    await cache.get_or_compute("simple", "Tesla risks", compute)
+
+    await cache.invalidate_ticker("AAPL")
+    await cache.get_or_compute("simple", "Apple risks", compute)
+    tesla = await cache.get_or_compute("simple", "Tesla risks", compute)
+
+    assert compute.await_count == 3
+    assert tesla["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_responses_are_not_stored(cache):
+    paused = {"status": "PAUSED"}
+    compute = AsyncMock(return_value=paused)
+
+    for _ in range(2):
+        await cache.get_or_compute(
+            "agent",
+            "Apple risks",
+            compute,
+            cacheable=lambda response: response["status"] == "COMPLETED",
+        )
+
+    assert compute.await_count == 2
+    assert cache.rows == []
+
+
+@pytest.mark.asyncio
+async def test_lookup_errors_fall_back_to_compute(cache, monkeypatch):
+    monkeypatch.setattr(cache, "_scope", AsyncMock(side_effect=OSError("db down")))
+    compute = AsyncMock(return_value={"answer": "fresh"})
+
+    assert await cache.get_or_compute("simple", "Apple risks", compute) == {
+        "answer": "fresh"
+    }
+    assert cache.stats["errors"] == 1
+
+
+def test_scope_key_is_order_independent():
+    assert AnswerCache.scope_key("agent", {"MSFT": 1, "AAPL": 3}) == (
+        "agent|AAPL@3,MSFT@1"
+    )
+    assert AnswerCache.scope_tickers("Compare MSFT with Apple") == ["AAPL", "MSFT"]
+    assert AnswerCache.scope_years("Apple risks 2022-2024") == "2022-2024"
+    assert AnswerCache.scope_years("Apple risks") == ""
+
+
+@pytest.mark.asyncio
+async def test_scope_separates_years(cache):
+    compute = AsyncMock(return_value={"answer": "x"})
+
+    await cache.get_or_compute("simple", "Apple 2023 risks", compute)
+    await cache.get_or_compute("simple", "Apple 2024 risks", compute)
+
+    assert compute.await_count == 2
+    assert cache.stats["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ttl_defaults_to_setting_and_can_be_shortened(cache, monkeypatch):
+    lookup = AsyncMock(return_value=None)
+    monkeypatch.setattr(cache, "_lookup", lookup)
+    compute = AsyncMock(return_value={"answer": "x"})
+
+    await cache.get_or_compute("simple", "Apple risks", compute)
+    await cache.get_or_compute("agent", "Apple risks", compute, ttl_seconds=300)
+
+    ttls = [call.args[2] for call in lookup.await_args_list]
+    assert ttls == [settings.ANSWER_CACHE_TTL_SECONDS, 300]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bumps_versions_and_deletes_entries():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    await AnswerCache(session_factory=factory).invalidate_ticker("aapl")
+
+    upsert, cleanup = [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    ]
+    assert "ON CONFLICT (ticker) DO UPDATE" in upsert
+    assert "corpus_versions.version + " in upsert
+    assert upsert.startswith("INSERT INTO corpus_versions")
+    assert cleanup.startswith("DELETE FROM answer_cache")
+    session.commit.assert_awaited_once()
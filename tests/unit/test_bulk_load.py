@@ -0,0 +1,99 @@
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.db.bulk_load import (
+    COPY_COLUMNS,
+    MERGE_SQL,
+    STAGE_DDL,
+    STAGE_TABLE,
+    ReportBulkLoader,
+    report_record,
+)
+
+
+class FakeDriver:
+    """Records COPY batches and the transaction each one ran in."""
+
+    def __init__(self):
+        self.copies = []
+        self.statements = []
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def _transaction(self):
+        self.transactions += 1
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append((table, list(records), columns))
+
+
+@pytest.fixture
+def fake_engine():
+    driver = FakeDriver()
+    conn = MagicMock()
+    conn.get_raw_connection = AsyncMock(
+        return_value=SimpleNamespace(driver_connection=driver)
+    )
+    conn.invalidate = AsyncMock()
+    conn.close = AsyncMock()
+
+    engine = MagicMock()
+    engine.connect = AsyncMock(return_value=conn)
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with patch("app.db.bulk_load.register_vector", AsyncMock()):
+        yield engine, conn, driver
+
+
+@pytest.mark.asyncio
+async def test_load_copies_in_transaction_sized_batches(fake_engine):
+    engine, conn, driver = fake_engine
+    records = [
+        report_record("AAPL", 2025, "10-K", f"chunk_{i}", "text", [0.1])
+        for i in range(5)
+    ]
+
+    async with ReportBulkLoader(batch_size=2, engine=engine) as loader:
+        assert await loader.load(iter(records)) == 5
+
+    assert [len(rows) for _, rows, _ in driver.copies] == [2, 2, 1]
+    assert driver.transactions == 3
+    # Every batch is staged, then merged on (source_id, content_hash).
+    assert driver.copies[0][0] == STAGE_TABLE
+    assert driver.statements == [STAGE_DDL, MERGE_SQL] * 3
+    assert "ON CONFLICT (source_id, content_hash) DO UPDATE" in MERGE_SQL
+    assert driver.copies[0][2] == COPY_COLUMNS
+    assert loader.rows_loaded == 5
+    # The connection carries a custom codec, so it never goes back to the pool.
+    conn.invalidate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rebuild_index_drops_before_and_creates_after(fake_engine, monkeypatch):
+    engine, _, driver = fake_engine
+    monkeypatch.setattr("app.core.config.settings.VECTOR_INDEX_TYPE", "hnsw")
+    calls = []
+
+    async def drop(conn):
+        calls.append(("drop", len(driver.copies)))
+
+    async def create(conn):
+        calls.append(("create", len(driver.copies)))
+
+    with (
+        patch("app.db.bulk_load.drop_vector_index", drop),
+        patch("app.db.bulk_load.create_vector_index", create),
+    ):
+        async with ReportBulkLoader(rebuild_index=True, engine=engine) as loader:
+            await loader.load([report_record("AAPL", 2025, "10-K", "s", "t", [0.1])])
+
+    assert calls == [("drop", 0), ("create", 1)]
@@ -0,0 +1,39 @@
+import pytest
+from app.services.chronos_client import ChronosClient
+
+
+@pytest.mark.asyncio
+async def test_get_forecasts_runs_single_requests_with_concurrency_limit(
+    chronos_server,
+):
+    stub = chronos_server(batch=False, delay=0.02)
+
+    results = await ChronosClient.get_forecasts(
+        ["aapl", "MSFT", "NVDA", "ZZZZ", "AAPL"], concurrency=2
+    )
+
+    assert list(results) == ["AAPL", "MSFT", "NVDA", "ZZZZ"]
+    assert results["MSFT"]["forecast"]["ticker"] == "MSFT"
+    assert results["MSFT"]["error"] is None
+    assert results["ZZZZ"] == {"forecast": None, "error": "HTTP 404"}
+    assert len([c for c in stub.state.calls if c[0] == "GET"]) == 4
+    assert stub.state.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_get_forecasts_uses_advertised_batch_endpoint(chronos_server):
+    stub = chronos_server(batch=True)
+
+    results = await ChronosClient.get_forecasts(["AAPL", "MSFT", "ZZZZ"])
+
+    assert stub.state.calls == [("POST", ("AAPL", "MSFT", "ZZZZ"))]
+    assert results["AAPL"]["forecast"]["predicted_close"] == 400.0
+    assert results["ZZZZ"] == {"forecast": None, "error": "Unknown ticker"}
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_against_stub_server(chronos_server):
+    chronos_server()
+
+    assert (await ChronosClient.get_forecast("msft"))["ticker"] == "MSFT"
+    assert await ChronosClient.get_forecast("ZZZZ") is None
@@ -1,10 +1,28 @@
+import asyncio
 import pytest
 import httpx
 from unittest.mock import patch, AsyncMock
+from app.services import chronos_client
 from app.services.chronos_client import ChronosClient
 from app.core.config import settings
 
 
+@pytest.fixture(autouse=True)
+async def fresh_chronos_state(monkeypatch):
+    monkeypatch.setattr(settings, "CHRONOS_RETRY_BACKOFF_SECONDS", 0)
+    chronos_client.breaker.reset()
+    yield
+    await chronos_client.close_chronos_client()
+    chronos_client.breaker.reset()
+
+
+def forecast_response(status=200):
+    request = httpx.Request("GET", f"{settings.CHRONOS_API_URL}/forecast/AAPL")
+    return httpx.Response(
+        status, json={"ticker": "AAPL", "predicted_close": 150.0}, request=request
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_forecast_success():
     """Test successful JSON parsing from CHRONOS API."""
@@ -53,3 +71,115 @@ async def test_get_forecast_timeout():
         result = await ChronosClient.get_forecast("AAPL")
 
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_reuses_shared_client():
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        return_value=forecast_response(),
+    ):
+        await ChronosClient.get_forecast("AAPL")
+        first_client = chronos_client.get_chronos_client()
+        await ChronosClient.get_forecast("AAPL")
+
+    assert chronos_client.get_chronos_client() is first_client
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_retries_transient_errors():
+    """A dropped connection and a 503 are retried before succeeding."""
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        side_effect=[
+            httpx.ConnectError("reset"),
+            forecast_response(503),
+            forecast_response(200),
+        ],
+    ) as mock_get:
+        result = await ChronosClient.get_forecast("AAPL")
+
+    assert result["predicted_close"] == 150.0
+    assert mock_get.call_count == 3
+    assert chronos_client.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_retried_nor_counted_as_outage():
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        return_value=forecast_response(404),
+    ) as mock_get:
+        assert await ChronosClient.get_forecast("ZZZZ") is None
+
+    assert mock_get.call_count == 1
+    assert chronos_client.breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_probes(monkeypatch):
+    monkeypatch.setattr(chronos_client.breaker, "failure_threshold", 2)
+    monkeypatch.setattr(chronos_client.breaker, "reset_timeout", 0.05)
+    monkeypatch.setattr(settings, "CHRONOS_MAX_RETRIES", 0)
+
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        side_effect=httpx.ConnectError("down"),
+    ) as mock_get:
+        for _ in range(2):
+            assert await ChronosClient.get_forecast("AAPL") is None
+        assert chronos_client.breaker.state == "open"
+
+        # Open circuit: no network call at all.
+        assert await ChronosClient.get_forecast("AAPL") is None
+        assert mock_get.call_count == 2
+
+    await asyncio.sleep(0.06)
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        return_value=forecast_response(),
+    ):
+        assert await ChronosClient.get_forecast("AAPL") is not None
+
+    stats = chronos_client.get_chronos_stats()
+    assert stats["breaker"]["state"] == "closed"
+    assert stats["breaker"]["times_opened"] == 1
+    assert stats["short_circuited"] >= 1
+    assert stats["latency_ms"]["p95"] is not None
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_is_not_retried():
+    """A read timeout already waited the full timeout: no second attempt."""
+    with patch(
+        "httpx.AsyncClient.get",
+        new_callable=AsyncMock,
+        side_effect=httpx.ReadTimeout("slow"),
+    ) as mock_get:
+        assert await ChronosClient.get_forecast("AAPL") is None
+
+    assert mock_get.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_wedge_the_breaker(monkeypatch):
+    monkeypatch.setattr(chronos_client.breaker, "reset_timeout", 0)
+    chronos_client.breaker.state = "open"
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with patch("httpx.AsyncClient.get", side_effect=hang):
+        probe = asyncio.create_task(ChronosClient.get_forecast("AAPL"))
+        await asyncio.sleep(0.01)
+        assert not chronos_client.breaker.allow_request()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    assert chronos_client.breaker.allow_request()
@@ -0,0 +1,141 @@
+import time
+import asyncio
+import threading
+import pytest
+from app.services.embedder import EmbeddingService
+from app.services.embedding_cache import EmbeddingCache
+
+
+class FakeEmbeddings:
+    """Records every embed_documents call made by the batcher."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.fixture
+def fake_embedder(monkeypatch):
+    service = EmbeddingService()
+    fake_model = FakeEmbeddings()
+    monkeypatch.setattr(EmbeddingService, "_embedder_model", fake_model)
+    monkeypatch.setattr(service, "max_batch_size", 8)
+    monkeypatch.setattr(service, "max_wait", 0.01)
+    monkeypatch.setattr(service, "cache", EmbeddingCache(max_size=16))
+    return service, fake_model
+
+
+@pytest.mark.asyncio
+async def test_aembed_micro_batches_concurrent_queries(fake_embedder):
+    """
+    Concurrent queries within the wait window share one embed_documents call,
+    and every caller gets its own vector back.
+    """
+    service, fake_model = fake_embedder
+    questions = ["a", "bb", "ccc", "dddd"]
+
+    vectors = await asyncio.gather(*(service.aembed(q) for q in questions))
+
+    assert fake_model.calls == [questions]
+    assert vectors == [[1.0], [2.0], [3.0], [4.0]]
+
+
+@pytest.mark.asyncio
+async def test_aembed_respects_max_batch_size(fake_embedder):
+    service, fake_model = fake_embedder
+    service.max_batch_size = 2
+
+    vectors = await asyncio.gather(*(service.aembed("x" * n) for n in range(1, 6)))
+
+    assert max(len(call) for call in fake_model.calls) <= 2
+    assert sum(len(call) for call in fake_model.calls) == 5
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+
+
+@pytest.mark.asyncio
+async def test_batch_tasks_are_referenced_until_done(fake_embedder, monkeypatch):
+    service, fake_model = fake_embedder
+    release = threading.Event()
+    embed = fake_model.embed_documents
+    monkeypatch.setattr(
+        fake_model, "embed_documents", lambda texts: release.wait(1) and embed(texts)
+    )
+    pending = asyncio.ensure_future(service.aembed("held"))
+
+    await asyncio.sleep(0.05)  # past max_wait: the batch task is running
+    assert len(service._tasks) == 1
+
+    release.set()
+    assert await pending == [4.0]
+    await asyncio.sleep(0)
+    assert not service._tasks
+
+
+@pytest.mark.asyncio
+async def test_aembed_propagates_model_errors(fake_embedder, monkeypatch):
+    service, fake_model = fake_embedder
+
+    def broken(texts):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(fake_model, "embed_documents", broken)
+
+    with pytest.raises(RuntimeError):
+        await service.aembed("What are Apple's risks?")
+
+    assert await service.aembed("   ") == []
+
+
+@pytest.mark.asyncio
+async def test_aembed_serves_repeated_questions_from_cache(fake_embedder):
+    """
+    Near-identical questions (case/whitespace) hit the cache, not the model.
+    """
+    service, fake_model = fake_embedder
+
+    first = await service.aembed("What are Apple's risks?")
+    second = await service.aembed("  what are   APPLE's risks?")
+
+    assert first == second
+    assert len(fake_model.calls) == 1
+    assert service.cache.stats()["hits"] == 1
+
+
+def test_cache_lru_eviction_and_ttl(monkeypatch):
+    cache = EmbeddingCache(max_size=2, ttl_seconds=60)
+    cache.put("q1", "model", [1.0])
+    cache.put("q2", "model", [2.0])
+    cache.get("q1", "model")  # q1 becomes most recently used
+    cache.put("q3", "model", [3.0])
+
+    assert cache.get("q2", "model") is None
+    assert cache.get("q1", "model") == [1.0]
+    assert cache.get("q1", "other-model") is None
+    assert cache.stats()["evictions"] == 1
+
+    now = time.time()
+    monkeypatch.setattr("app.services.embedding_cache.time.time", lambda: now + 61)
+    assert cache.get("q3", "model") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    EmbeddingCache(persist_path=path).put("Tesla 2024 risks", "model", [0.5, 0.25])
+
+    restarted = EmbeddingCache(persist_path=path)
+
+    assert restarted.get("tesla 2024 risks", "model") == [0.5, 0.25]
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_embed_documents_batches_chunks(fake_embedder):
+    service, fake_model = fake_embedder
+
+    vectors = service.embed_documents(["a\nb", "cc", "ddd", "e", "ff"], batch_size=2)
+
+    assert fake_model.calls == [["a b", "cc"], ["ddd", "e"], ["ff"]]
+    assert vectors == [[3.0], [2.0], [3.0], [1.0], [2.0]]
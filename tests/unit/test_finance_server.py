@@ -0,0 +1,113 @@
+import json
+import asyncio
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.mcp import finance_server
+from app.mcp.finance_server import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(finance_server, "price_cache", TTLCache(60))
+    monkeypatch.setattr(finance_server, "profile_cache", TTLCache(3600))
+
+
+def fake_ticker(symbol):
+    return SimpleNamespace(
+        fast_info=SimpleNamespace(last_price=123.456, currency="USD"),
+        info={"sector": "Technology", "industry": "Hardware", "marketCap": 10**12},
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_price_requests_are_coalesced():
+    """
+    Many concurrent analyses of the same ticker trigger one Yahoo fetch.
+    """
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=fake_ticker) as mock:
+        answers = await asyncio.gather(
+            *(finance_server.get_stock_price("aapl") for _ in range(10))
+        )
+        again = await finance_server.get_stock_price("AAPL")
+
+    assert mock.call_count == 1
+    assert all(a == "The current price of AAPL is 123.46 USD." for a in answers)
+    assert again == answers[0]
+
+    stats = json.loads(await finance_server.get_cache_stats())["prices"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] + stats["hits"] == 10
+
+
+@pytest.mark.asyncio
+async def test_profile_cache_is_separate_and_errors_are_not_cached():
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=RuntimeError("down")):
+        first = await finance_server.get_company_info("MSFT")
+
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=fake_ticker):
+        second = await finance_server.get_company_info("MSFT")
+
+    assert first.startswith("Error fetching info for MSFT")
+    assert "- Sector: Technology" in second
+    assert finance_server.price_cache.stats()["misses"] == 0
+
+
+def fake_download(tickers, **kwargs):
+    index = pd.date_range("2024-05-01 15:58", periods=2, freq="min", tz="UTC")
+    prices = {"AAPL": [189.0, 189.5], "MSFT": [410.0, float("nan")]}
+    columns = pd.MultiIndex.from_product(
+        [[t for t in tickers if t in prices], ["Close"]]
+    )
+    data = {(t, "Close"): prices[t] for t, _ in columns}
+    return pd.DataFrame(data, index=index, columns=columns)
+
+
+@pytest.mark.asyncio
+async def test_batch_prices_use_one_download_and_share_the_cache():
+    with patch("app.mcp.finance_server.yf.download", side_effect=fake_download) as mock:
+        result = await finance_server.get_stock_prices(["aapl", "MSFT", "ZZZZ", "AAPL"])
+        again = await finance_server.get_stock_prices(["AAPL", "MSFT"])
+
+    assert mock.call_count == 1
+    assert mock.call_args.args[0] == ["AAPL", "MSFT", "ZZZZ"]
+
+    quotes = {q["ticker"]: q for q in result["quotes"]}
+    assert list(quotes) == ["AAPL", "MSFT", "ZZZZ"]
+    assert quotes["AAPL"]["price"] == 189.5
+    assert quotes["MSFT"]["price"] == 410.0
+    assert "error" in quotes["ZZZZ"]
+    assert [q["price"] for q in again["quotes"]] == [189.5, 410.0]
+
+    # Batch quotes have no currency, so they never answer a single lookup.
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=fake_ticker):
+        single = await finance_server.get_stock_price("AAPL")
+    assert single == "The current price of AAPL is 123.46 USD."
+
+
+@pytest.mark.asyncio
+async def test_batch_company_infos_report_per_ticker_errors():
+    def ticker_or_fail(symbol):
+        if symbol == "BAD":
+            raise RuntimeError("not found")
+        return fake_ticker(symbol)
+
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=ticker_or_fail):
+        result = await finance_server.get_company_infos(["AAPL", "BAD"])
+
+    aapl, bad = result["companies"]
+    assert aapl["sector"] == "Technology"
+    assert bad == {"ticker": "BAD", "error": "not found"}
+
+
+@pytest.mark.asyncio
+async def test_batch_prices_reuse_full_single_quotes():
+    with patch("app.mcp.finance_server.yf.Ticker", side_effect=fake_ticker):
+        await finance_server.get_stock_price("AAPL")
+
+    with patch("app.mcp.finance_server.yf.download", side_effect=fake_download) as mock:
+        result = await finance_server.get_stock_prices(["AAPL", "MSFT"])
+
+    assert mock.call_args.args[0] == ["MSFT"]
+    assert result["quotes"][0]["currency"] == "USD"
@@ -29,7 +29,7 @@ async def test_forecast_agent_success(nodes_with_mocks):
     }
 
     with patch(
-        "app.agents.nodes.ChronosClient.get_forecast",
+        "app.agents.nodes.forecast_cache.get_forecast",
         new_callable=AsyncMock,
         return_value=mock_forecast,
     ):
@@ -62,7 +62,7 @@ async def test_forecast_agent_service_unavailable(nodes_with_mocks):
     }
 
     with patch(
-        "app.agents.nodes.ChronosClient.get_forecast",
+        "app.agents.nodes.forecast_cache.get_forecast",
         new_callable=AsyncMock,
         return_value=None,  # Simulates timeout/error
     ):
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.services.forecast_cache import ForecastCache
+
+
+class InMemoryForecastCache(ForecastCache):
+    """ForecastCache with the Postgres table replaced by a dict."""
+
+    def __init__(self):
+        super().__init__(session_factory=None)
+        self.rows = {}
+
+    async def _load(self, ticker):
+        return self.rows.get(ticker)
+
+    async def _store(self, ticker, forecast):
+        self.rows[ticker] = SimpleNamespace(
+            payload=forecast, fetched_at=datetime.utcnow()
+        )
+
+
+def make_chronos(delay=0.0):
+    calls = []
+
+    async def get_forecast(ticker):
+        calls.append(ticker)
+        await asyncio.sleep(delay)
+        return {
+            "ticker": ticker,
+            "target_date": "2026-04-14T00:00:00",
+            "predicted_close": 100.0 + len(calls),
+        }
+
+    return get_forecast, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_chronos_call():
+    cache = InMemoryForecastCache()
+    get_forecast, calls = make_chronos(delay=0.05)
+
+    with patch("app.services.forecast_cache.ChronosClient.get_forecast", get_forecast):
+        results = await asyncio.gather(*(cache.get_forecast("aapl") for _ in range(5)))
+        cached = await cache.get_forecast("AAPL")
+
+    assert calls == ["AAPL"]
+    assert all(r == results[0] for r in results)
+    assert cached == results[0]
+    assert cache.stats["coalesced"] == 4
+    assert cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing(monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.FORECAST_CACHE_TTL_SECONDS", 60)
+    cache = InMemoryForecastCache()
+    stale = {"ticker": "MSFT", "predicted_close": 1.0}
+    cache.rows["MSFT"] = SimpleNamespace(
+        payload=stale, fetched_at=datetime.utcnow() - timedelta(hours=2)
+    )
+    get_forecast, calls = make_chronos(delay=0.05)
+
+    with patch("app.services.forecast_cache.ChronosClient.get_forecast", get_forecast):
+        first = await cache.get_forecast("MSFT")
+        assert first == stale
+        await asyncio.gather(*cache._background)
+
+    assert calls == ["MSFT"]
+    assert cache.rows["MSFT"].payload["predicted_close"] == 101.0
+    assert cache.stats["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_forecasts_are_not_cached():
+    cache = InMemoryForecastCache()
+
+    async def unavailable(ticker):
+        return None
+
+    with patch("app.services.forecast_cache.ChronosClient.get_forecast", unavailable):
+        assert await cache.get_forecast("TSLA") is None
+
+    assert cache.rows == {}
+
+
+def test_target_date_parsing():
+    assert ForecastCache.target_date({"target_date": "2026-04-14T00:00:00"}) == date(
+        2026, 4, 14
+    )
+    assert ForecastCache.target_date({}) == datetime.utcnow().date()
@@ -0,0 +1,128 @@
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+from app.agents.graph import TitanGraph
+from app.agents.state import AgentState
+from app.agents.streaming import TOKEN_NODES
+
+FORECAST = {
+    "ticker": "MSFT",
+    "target_date": "2026-04-14T00:00:00",
+    "predicted_close": 425.5,
+    "model_used": "XGBoost",
+    "environment": "test",
+}
+
+
+@pytest.fixture
+def titan_graph():
+    """
+    Real topology and routing with stubbed I/O: retrieval and CHRONOS each
+    take 0.1s, the supervisor LLM always picks research.
+    """
+    with (
+        patch("app.agents.nodes.RetrievalService"),
+        patch("app.agents.nodes.LLMFactory"),
+        patch("app.agents.nodes.TavilySearchResults"),
+        patch("app.agents.nodes.PythonREPL"),
+        patch("app.agents.nodes.load_mcp_tools"),
+    ):
+        graph = TitanGraph()
+
+    nodes = graph.nodes
+    report_prompts = []
+
+    def fake_router_llm(prompt):
+        text = prompt.to_string()
+        if text.startswith("You are TITAN"):
+            report_prompts.append(text)
+            return AIMessage(content='{"executive_summary": "ok"}')
+        return AIMessage(content='{"next_step": "research_agent"}')
+
+    nodes.router_llm = RunnableLambda(fake_router_llm)
+
+    async def retrieve(state, config):
+        await asyncio.sleep(0.1)
+        return {"documents": ["10-K excerpt"], "distances": [0.1]}
+
+    async def grade_documents(state, config=None):
+        return {"documents": state["documents"]}
+
+    nodes.retrieve = retrieve
+    nodes.grade_documents = grade_documents
+    return graph.build().compile(checkpointer=MemorySaver()), report_prompts
+
+
+async def slow_forecast(ticker):
+    await asyncio.sleep(0.1)
+    return {**FORECAST, "ticker": ticker}
+
+
+@pytest.mark.asyncio
+async def test_forecast_is_prefetched_next_to_research(titan_graph):
+    graph, _ = titan_graph
+    config = {"configurable": {"thread_id": "prefetch"}}
+    visited = []
+
+    with patch(
+        "app.agents.nodes.forecast_cache.get_forecast", side_effect=slow_forecast
+    ) as mock_forecast:
+        start = time.perf_counter()
+        async for update in graph.astream(
+            {"question": "Analyze MSFT margins", "loop_step": 0},
+            config,
+            stream_mode="updates",
+        ):
+            visited.extend(update)
+        elapsed = time.perf_counter() - start
+
+    assert "prefetch_forecast" in visited
+    assert "forecast_agent" not in visited
+    assert visited.count("supervisor") == 2
+    assert mock_forecast.call_count == 1
+    assert elapsed < 0.18  # max(retrieval, CHRONOS), not the sum
+
+    assert visited[-1] == "reporter_agent"
+
+
+@pytest.mark.asyncio
+async def test_reporter_context_includes_prefetched_forecast(titan_graph):
+    graph, report_prompts = titan_graph
+    config = {"configurable": {"thread_id": "prefetch-context"}}
+
+    with patch(
+        "app.agents.nodes.forecast_cache.get_forecast", side_effect=slow_forecast
+    ):
+        final_state = await graph.ainvoke(
+            {"question": "Analyze MSFT margins", "loop_step": 0}, config
+        )
+
+    assert final_state["forecast_data"]["ticker"] == "MSFT"
+    assert final_state["documents"] == ["10-K excerpt"]
+    assert "Predicted close price for MSFT" in final_state["forecast_note"]
+    assert len(report_prompts) == 1
+    assert "10-K excerpt" in report_prompts[0]
+    assert "Predicted close price for MSFT" in report_prompts[0]
+
+
+def test_no_prefetch_without_ticker(nodes_with_mocks):
+    state = AgentState(question="What drives margins in software?")
+    assert nodes_with_mocks.prefetch_branches(state, "retrieve") == []
+
+    state = AgentState(question="Analyze MSFT", forecast_data=FORECAST)
+    assert nodes_with_mocks.prefetch_branches(state, "retrieve") == []
+
+    state = AgentState(question="Analyze MSFT")
+    assert nodes_with_mocks.prefetch_branches(state, "reporter_agent") == []
+    assert nodes_with_mocks.prefetch_branches(state, "quant_agent") == [
+        "prefetch_forecast"
+    ]
+
+
+def test_token_nodes_are_graph_nodes(titan_graph):
+    app, _ = titan_graph
+    assert TOKEN_NODES <= set(app.get_graph().nodes)
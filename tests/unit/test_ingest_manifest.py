@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from unittest.mock import AsyncMock, MagicMock
+from app.models.ingest import IngestManifest
+from app.services.ingest_manifest import (
+    content_hash,
+    delete_legacy_chunks,
+    plan_source,
+)
+
+
+def make_session(manifest=None, stored=()):
+    session = MagicMock()
+    session.get = AsyncMock(return_value=manifest)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(stored)
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+def manifest(file_hash="f1", model="text-embedding-004"):
+    return IngestManifest(
+        source_id="AAPL_10-K_2024",
+        ticker="AAPL",
+        file_hash=file_hash,
+        embedding_model=model,
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_file_is_skipped():
+    session = make_session(manifest())
+
+    plan = await plan_source(
+        session, "AAPL_10-K_2024", "f1", ["a", "b"], "text-embedding-004"
+    )
+
+    assert plan.unchanged
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_changed_file_embeds_only_new_chunks_and_drops_vanished_ones():
+    session = make_session(manifest(), stored=["a", "b", "old"])
+
+    plan = await plan_source(
+        session, "AAPL_10-K_2024", "f2", ["a", "b", "new"], "text-embedding-004"
+    )
+
+    assert not plan.unchanged
+    assert plan.pending == {"new"}
+    assert plan.stale == ["old"]
+
+
+@pytest.mark.asyncio
+async def test_new_embedding_model_re_embeds_everything():
+    session = make_session(manifest(model="old-model"), stored=["a", "b"])
+
+    plan = await plan_source(
+        session, "AAPL_10-K_2024", "f1", ["a", "b"], "text-embedding-004"
+    )
+
+    assert plan.pending == {"a", "b"}
+    assert plan.stale == []
+
+
+def test_content_hash_is_stable():
+    assert content_hash("Revenue grew.") == content_hash("Revenue grew.")
+    assert content_hash("Revenue grew.") != content_hash("Revenue fell.")
+
+
+@pytest.mark.asyncio
+async def test_legacy_chunks_are_deleted_per_ticker_and_report_type():
+    session = make_session()
+    session.execute.return_value.rowcount = 3
+
+    assert await delete_legacy_chunks(session, "AAPL", "10-K") == 3
+
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM financial_reports")
+    assert "financial_reports.source_id IS NULL" in sql
+    assert statement.compile().params == {
+        "company_ticker_1": "AAPL",
+        "report_type_1": "10-K",
+    }
@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.agents.job_worker import JobWorkerPool
+
+
+def make_job(n, attempts=1):
+    return SimpleNamespace(
+        id=f"job-{n}",
+        question=f"Analyze AAPL {n}",
+        thread_id=f"t{n}",
+        attempts=attempts,
+        worker_id="worker-0",
+    )
+
+
+@pytest.fixture
+def fake_queue():
+    """In-memory stand-ins for the Postgres queue functions."""
+    queue = {"pending": [], "finished": {}}
+
+    async def claim(session, worker_id):
+        return queue["pending"].pop(0) if queue["pending"] else None
+
+    async def finish(session, job_id, status, result=None, error=None, worker_id=None):
+        queue["finished"][job_id] = (status, result, error)
+        return True
+
+    with (
+        patch("app.agents.job_worker.claim_next_job", side_effect=claim),
+        patch("app.agents.job_worker.finish_job", side_effect=finish),
+    ):
+        yield queue
+
+
+async def wait_for_jobs(queue, count):
+    for _ in range(200):
+        if len(queue["finished"]) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_jobs_with_bounded_concurrency(fake_queue):
+    running = 0
+    peak = 0
+
+    async def ainvoke(graph_input, config):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.03)
+        running -= 1
+        return {"generation": f"report for {graph_input['question']}", "sources": []}
+
+    fake_queue["pending"] = [make_job(n) for n in range(5)]
+    graph = MagicMock(ainvoke=ainvoke)
+    pool = JobWorkerPool(
+        concurrency=2, poll_interval=0.01, session_factory=lambda: AsyncMock()
+    )
+
+    with patch("app.agents.job_worker.get_graph", return_value=graph):
+        await pool.start()
+        await wait_for_jobs(fake_queue, 5)
+        await pool.stop()
+
+    assert peak == 2
+    status, result, error = fake_queue["finished"]["job-3"]
+    assert status == "completed"
+    assert result["answer"] == "report for Analyze AAPL 3"
+    assert pool.stats["completed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_until_max_attempts(fake_queue, monkeypatch):
+    monkeypatch.setattr("app.agents.job_worker.settings.JOB_MAX_ATTEMPTS", 2)
+    graph = MagicMock(ainvoke=AsyncMock(side_effect=RuntimeError("LLM down")))
+    pool = JobWorkerPool(session_factory=lambda: AsyncMock())
+
+    with patch("app.agents.job_worker.get_graph", return_value=graph):
+        await pool.run_job(make_job(1, attempts=1))
+        await pool.run_job(make_job(2, attempts=2))
+
+    assert fake_queue["finished"]["job-1"] == ("queued", None, "LLM down")
+    assert fake_queue["finished"]["job-2"] == ("failed", None, "LLM down")
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_failed_finish(fake_queue):
+    """A DB error while recording a result must not end the worker task."""
+    graph = MagicMock(ainvoke=AsyncMock(return_value={"generation": "ok"}))
+    fake_queue["pending"] = [make_job(1), make_job(2)]
+    finish_calls = 0
+
+    async def flaky_finish(session, job_id, status, **kwargs):
+        nonlocal finish_calls
+        finish_calls += 1
+        if finish_calls == 1:
+            raise ConnectionError("db blip")
+        fake_queue["finished"][job_id] = status
+        return True
+
+    pool = JobWorkerPool(
+        concurrency=1, poll_interval=0.01, session_factory=lambda: AsyncMock()
+    )
+    with (
+        patch("app.agents.job_worker.get_graph", return_value=graph),
+        patch("app.agents.job_worker.finish_job", side_effect=flaky_finish),
+    ):
+        await pool.start()
+        await wait_for_jobs(fake_queue, 1)
+        assert not pool._tasks[0].done()
+        await pool.stop()
+
+    assert fake_queue["finished"] == {"job-2": "completed"}
+
+
+@pytest.mark.asyncio
+async def test_long_jobs_send_heartbeats_until_they_finish(fake_queue):
+    beats = []
+
+    async def heartbeat(session, job_id, worker_id):
+        beats.append((job_id, worker_id))
+        return True
+
+    async def ainvoke(graph_input, config):
+        await asyncio.sleep(0.1)
+        return {"generation": "ok"}
+
+    pool = JobWorkerPool(heartbeat_interval=0.02, session_factory=lambda: AsyncMock())
+    with (
+        patch(
+            "app.agents.job_worker.get_graph", return_value=MagicMock(ainvoke=ainvoke)
+        ),
+        patch("app.agents.job_worker.heartbeat_job", side_effect=heartbeat),
+    ):
+        await pool.run_job(make_job(1))
+        sent = len(beats)
+        await asyncio.sleep(0.05)
+
+    assert sent >= 3
+    assert beats[0] == ("job-1", "worker-0")
+    assert len(beats) == sent  # stopped with the job
+    assert fake_queue["finished"]["job-1"][0] == "completed"
@@ -0,0 +1,55 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.core.llm import LLMFactory
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "local")
+    LLMFactory.reset()
+    yield
+    LLMFactory.reset()
+
+
+def test_get_llm_reuses_client_for_same_config():
+    """
+    The hot path must never build a new client for a known configuration.
+    """
+    with patch("app.core.llm.ChatOllama") as MockOllama:
+        MockOllama.side_effect = lambda **kwargs: object()
+
+        first = LLMFactory.get_llm(temperature=0, json_mode=True)
+        second = LLMFactory.get_llm(temperature=0, json_mode=True)
+
+    assert first is second
+    assert MockOllama.call_count == 1
+    assert LLMFactory.client_count() == 1
+
+
+def test_get_llm_separates_json_mode_and_temperature():
+    with patch("app.core.llm.ChatOllama") as MockOllama:
+        MockOllama.side_effect = lambda **kwargs: object()
+
+        router = LLMFactory.get_llm(temperature=0, json_mode=True)
+        generator = LLMFactory.get_llm(temperature=0, json_mode=False)
+        creative = LLMFactory.get_llm(temperature=0.7, json_mode=False)
+
+    assert len({id(router), id(generator), id(creative)}) == 3
+    assert LLMFactory.client_count() == 3
+    assert MockOllama.call_args_list[0].kwargs["format"] == "json"
+    assert "limits" in MockOllama.call_args_list[0].kwargs["client_kwargs"]
+
+
+def test_get_llm_is_thread_safe():
+    """
+    Concurrent first calls must still produce a single shared client.
+    """
+    with patch("app.core.llm.ChatOllama") as MockOllama:
+        MockOllama.side_effect = lambda **kwargs: object()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: LLMFactory.get_llm(), range(32)))
+
+    assert all(c is clients[0] for c in clients)
+    assert MockOllama.call_count == 1
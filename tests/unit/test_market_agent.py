@@ -0,0 +1,91 @@
+import time
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.agents.state import AgentState
+
+
+def make_tool(name, delay=0.0, fail_for=(), batch_for=None, calls=None):
+    async def coroutine(ticker, timeout=None):
+        if calls is not None:
+            calls.append((name, ticker))
+        if ticker in fail_for:
+            raise RuntimeError("Yahoo rate limited")
+        await asyncio.wait_for(asyncio.sleep(delay), timeout)
+        return f"{name} for {ticker}"
+
+    return SimpleNamespace(
+        name=name, coroutine=coroutine, metadata={"batch_for": batch_for}
+    )
+
+
+@pytest.mark.asyncio
+async def test_market_agent_fans_out_tools_and_tickers(nodes_with_mocks):
+    """
+    All (tool, ticker) lookups run concurrently: total latency is close to
+    the slowest call, and every ticker in the question is covered.
+    """
+    nodes_with_mocks.market_tools = [
+        make_tool("get_stock_price", delay=0.1),
+        make_tool("get_company_info", delay=0.1),
+    ]
+    state = AgentState(question="Compare AAPL, MSFT and NVDA")
+
+    start = time.perf_counter()
+    result_state = await nodes_with_mocks.market_agent(state)
+    elapsed = time.perf_counter() - start
+
+    docs = result_state["documents"]
+    assert len(docs) == 6
+    assert docs[0] == "[get_stock_price]: get_stock_price for AAPL"
+    assert any("NVDA" in d for d in docs)
+    assert elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_market_agent_returns_partial_results(nodes_with_mocks, monkeypatch):
+    monkeypatch.setattr("app.agents.nodes.settings.MARKET_TOOL_TIMEOUT_SECONDS", 0.05)
+    nodes_with_mocks.market_tools = [
+        make_tool("get_stock_price"),
+        make_tool("get_company_info", delay=1.0),
+        make_tool("get_news", fail_for=("TSLA",)),
+    ]
+    state = AgentState(question="Price of TSLA")
+
+    result_state = await nodes_with_mocks.market_agent(state)
+
+    docs = result_state["documents"]
+    assert docs[0] == "[get_stock_price]: get_stock_price for TSLA"
+    assert "unavailable (timed out)" in docs[1]
+    assert "Yahoo rate limited" in docs[2]
+
+
+@pytest.mark.asyncio
+async def test_market_agent_prefers_batch_tools_for_many_tickers(nodes_with_mocks):
+    calls = []
+    nodes_with_mocks.market_tools = [
+        make_tool("get_stock_price", calls=calls),
+        make_tool("get_news", calls=calls),
+        make_tool("get_stock_prices", batch_for="get_stock_price", calls=calls),
+    ]
+    state = AgentState(question="Compare AAPL and MSFT")
+
+    result_state = await nodes_with_mocks.market_agent(state)
+
+    assert ("get_stock_prices", ["AAPL", "MSFT"]) in calls
+    assert not any(name == "get_stock_price" for name, _ in calls)
+    assert len([c for c in calls if c[0] == "get_news"]) == 2
+    assert result_state["documents"][0].startswith("[get_stock_prices]:")
+
+
+@pytest.mark.asyncio
+async def test_market_agent_single_ticker_skips_batch_tools(nodes_with_mocks):
+    calls = []
+    nodes_with_mocks.market_tools = [
+        make_tool("get_stock_price", calls=calls),
+        make_tool("get_stock_prices", batch_for="get_stock_price", calls=calls),
+    ]
+
+    await nodes_with_mocks.market_agent(AgentState(question="Price of TSLA"))
+
+    assert calls == [("get_stock_price", "TSLA")]
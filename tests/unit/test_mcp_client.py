@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.core import mcp_client
+from app.core.mcp_client import MCPClientManager
+
+spawned = []
+
+
+@asynccontextmanager
+async def fake_stdio_client(server_params):
+    spawned.append(server_params)
+    yield (None, None)
+
+
+class FakeClientSession:
+    """In-memory stand-in for an initialized MCP ClientSession."""
+
+    def __init__(self, read, write):
+        self.initialized = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def initialize(self):
+        self.initialized = True
+
+    async def list_tools(self):
+        return SimpleNamespace(
+            tools=[
+                SimpleNamespace(
+                    name="get_stock_price",
+                    description="Price",
+                    inputSchema={"properties": {"ticker": {"type": "string"}}},
+                ),
+                SimpleNamespace(
+                    name="get_stock_prices",
+                    description="Prices",
+                    inputSchema={"properties": {"tickers": {"type": "array"}}},
+                ),
+                SimpleNamespace(
+                    name="get_cache_stats", description="Stats", inputSchema={}
+                ),
+            ]
+        )
+
+    async def call_tool(self, name, arguments):
+        await asyncio.sleep(arguments.get("delay", 0))
+        value = arguments.get("ticker") or ",".join(arguments["tickers"])
+        text = f"{name}:{value}"
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+    async def send_ping(self):
+        return None
+
+
+@pytest.fixture
+async def manager():
+    spawned.clear()
+    with (
+        patch("app.core.mcp_client.stdio_client", fake_stdio_client),
+        patch("app.core.mcp_client.ClientSession", FakeClientSession),
+    ):
+        manager = MCPClientManager(pool_size=2, server_params="fake-server")
+        await manager.start()
+        yield manager
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_reuse_pooled_sessions(manager):
+    """
+    Tool calls must not spawn new servers once the pool is up.
+    """
+    tools = manager.get_tools()
+    assert [t.name for t in tools] == ["get_stock_price", "get_stock_prices"]
+
+    for _ in range(5):
+        assert await tools[0].coroutine("AAPL") == "get_stock_price:AAPL"
+
+    assert len(spawned) == 2
+    assert manager.stats()["calls"] == 5
+    assert manager.stats()["idle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_session_is_restarted_on_checkout(manager):
+    dead = manager.workers[0]
+    await dead.stop()
+    assert not dead.alive
+
+    for _ in range(2):  # both workers get checked out once
+        await manager.call_tool("get_stock_price", {"ticker": "MSFT"})
+
+    assert dead.alive
+    assert manager.stats()["restarts"] == 1
+    assert len(spawned) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_tools_accept_lists_and_strings(manager):
+    batch = manager.get_tools()[1]
+
+    assert batch.metadata == {"batch_for": "get_stock_price"}
+    assert await batch.coroutine(["AAPL", "MSFT"]) == "get_stock_prices:AAPL,MSFT"
+    assert await batch.coroutine("AAPL, MSFT") == "get_stock_prices:AAPL,MSFT"
+
+
+@pytest.mark.asyncio
+async def test_timeout_starts_after_session_checkout(manager):
+    """
+    Calls queued behind a busy pool only spend their timeout once they
+    hold a session.
+    """
+    slow = {"ticker": "AAPL", "delay": 0.1}
+    results = await asyncio.gather(
+        *(manager.call_tool("get_stock_price", slow, timeout=0.15) for _ in range(4))
+    )
+
+    assert results == ["get_stock_price:AAPL"] * 4
+    with pytest.raises(asyncio.TimeoutError):
+        await manager.call_tool("get_stock_price", slow, timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_racing_loaders_start_one_pool(monkeypatch):
+    spawned.clear()
+    monkeypatch.setattr(mcp_client, "mcp_manager", None)
+    monkeypatch.setattr(mcp_client, "get_server_params", lambda: "fake-server")
+    with (
+        patch("app.core.mcp_client.stdio_client", fake_stdio_client),
+        patch("app.core.mcp_client.ClientSession", FakeClientSession),
+    ):
+        results = await asyncio.gather(*(mcp_client.load_mcp_tools() for _ in range(3)))
+        await mcp_client.stop_mcp_manager()
+
+    assert all(len(tools) == 2 for tools in results)
+    assert len(spawned) == mcp_client.settings.MCP_POOL_SIZE
@@ -1,3 +1,4 @@
+import io
 from app.services.parser import SECParser
 
 
@@ -33,3 +34,35 @@ def test_html_cleaning_logic():
     assert "Paragraph 1" in result
     assert "Revenue" in result
     assert "100" in result
+
+
+def test_streaming_cleaner_matches_clean_html():
+    """
+    The streaming cleaner writes the same text as clean_html, even when the
+    input arrives in chunks that split tags and entities.
+    """
+    html_content = """
+    <SEC-DOCUMENT><DOCUMENT><TYPE>10-K<TEXT>
+    <html>
+        <head><title>Apple 10-K</title><style>.x {}</style></head>
+        <body>
+            <div><span>Item 1A.</span> Risk Factors</div>
+            <p>We face <i>intense</i> competition.<br>Caf&eacute; &amp; co</p>
+            <!-- page break -->
+            <table><tr><td>Net sales</td><td>$ 391,035</td></tr></table>
+            <p>Net sales<!-- Field: Sequence -->$ 391,035</p>
+            <script>tracking()</script> Trailing note
+        </body>
+    </html>
+    </TEXT></DOCUMENT></SEC-DOCUMENT>
+    """
+    sink = io.StringIO()
+
+    lines = SECParser.clean_html_stream(io.StringIO(html_content), sink, chunk_size=7)
+
+    assert sink.getvalue() == SECParser.clean_html(html_content)
+    assert lines == len(sink.getvalue().splitlines())
+    assert "tracking" not in sink.getvalue()
+    assert "Trailing note" in sink.getvalue()
+    # A comment separates the text around it instead of joining it.
+    assert "Net sales$" not in sink.getvalue()
@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from app.services.query_filters import (
+    extract_filters,
+    extract_tickers,
+    relaxation_steps,
+)
+from app.services.retriever import RetrievalService
+from app.schemas.search_schema import SearchFilters
+
+
+def test_extract_filters_ticker_and_year():
+    filters = extract_filters("What are TSLA's 2024 risks?")
+
+    assert filters.tickers == ["TSLA"]
+    assert filters.year_from == 2024
+    assert filters.year_to == 2024
+
+
+def test_extract_filters_multiple_tickers_range_and_report_type():
+    filters = extract_filters("Compare AAPL, MSFT and NVDA 10-K filings 2022-2024")
+
+    assert filters.tickers == ["AAPL", "MSFT", "NVDA"]
+    assert (filters.year_from, filters.year_to) == (2022, 2024)
+    assert filters.report_type == "10-K"
+
+
+def test_extract_tickers_ignores_acronyms_and_maps_company_names():
+    assert extract_tickers("What does the CEO of Apple say about AI and the SEC?") == [
+        "AAPL"
+    ]
+    assert extract_tickers("Analyze the risks") == []
+    assert extract_filters("Analyze the risks").is_empty()
+
+
+def test_filters_are_pushed_into_where_clause():
+    statement = RetrievalService.build_search_statement(
+        [0.0] * 768,
+        limit=4,
+        filters=SearchFilters(tickers=["tsla"], year_from=2024, report_type="10-K"),
+    )
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": False}
+        )
+    )
+
+    assert "WHERE financial_reports.company_ticker IN" in sql
+    assert "financial_reports.year >=" in sql
+    assert "financial_reports.report_type =" in sql
+    assert "ORDER BY financial_reports.embedding <=>" in sql
+
+
+def test_threshold_is_applied_in_sql_and_distance_selected():
+    statement = RetrievalService.build_search_statement(
+        [0.0] * 768, limit=4, threshold=0.5
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "AS distance" in sql
+    assert "WHERE (financial_reports.embedding <=>" in sql
+
+
+def test_relaxation_drops_year_first_and_the_ticker_last():
+    steps = relaxation_steps(extract_filters("Apple 2023 10-K risk factors"))
+
+    assert [(f.tickers, f.year_from, f.report_type) for f in steps] == [
+        (["AAPL"], 2023, "10-K"),
+        (["AAPL"], None, "10-K"),
+        (["AAPL"], None, None),
+        ([], None, None),
+    ]
+    assert relaxation_steps(extract_filters("2023 risk factors"))[-1].is_empty()
+    assert len(relaxation_steps(extract_filters("Analyze the risks"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_tickers_keeps_only_tickers_with_filings():
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(scalars=lambda: MagicMock(all=lambda: ["AAPL"]))
+    )
+
+    stored = await RetrievalService(session).stored_tickers(["AAPL", "ESG"])
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT DISTINCT financial_reports.company_ticker")
+    assert stored == {"AAPL"}
+    assert await RetrievalService(session).stored_tickers([]) == set()
@@ -1,5 +1,8 @@
 import pytest
+from unittest.mock import MagicMock
 from app.agents.state import AgentState
+from app.core.config import settings
+from app.services.intent_router import IntentRouter, get_router_stats, router_stats
 
 
 @pytest.mark.asyncio
@@ -53,3 +56,79 @@ async def test_route_quant_hitl(nodes_with_mocks):
     state_success = AgentState(next_step="supervisor")
     decision = await nodes_with_mocks.route_quant(state_success)
     assert decision == "supervisor"
+
+
+# Labelled questions for the pre-router: expected supervisor 'next_step',
+# or None when the question is ambiguous and must go to the LLM.
+PREROUTER_CASES = [
+    ("What is the stock price of AAPL?", "market_agent"),
+    ("Price of TSLA right now", "market_agent"),
+    ("What is Nvidia's market cap?", "market_agent"),
+    (
+        "Calculate the current ratio if assets are 500 and liabilities 200",
+        "quant_agent",
+    ),
+    ("Compute 1500 / 12", "quant_agent"),
+    ("What is 1.05^3 * 400?", "quant_agent"),
+    ("Apple risks 2023/2024", "research_agent"),
+    ("Apple revenue FY2023/2024", None),
+    ("What is the CAGR of revenue from 100 to 150 over 3 years?", "quant_agent"),
+    ("Forecast MSFT for tomorrow", "forecast_agent"),
+    ("What is the predicted close for NVDA?", "forecast_agent"),
+    ("What are the main risks in Apple's 10-K?", "research_agent"),
+    ("Analyze Tesla", "research_agent"),
+    ("Summarize Microsoft's business model", "research_agent"),
+    ("Analyze Apple and forecast its price", None),
+    ("What are the risks to the stock price of AAPL?", None),
+    ("Tell me about Amazon", None),
+]
+
+
+def test_prerouter_rule_accuracy():
+    """
+    Rules never contradict the labels, and decide most routine questions.
+    """
+    decided = 0
+    for question, expected in PREROUTER_CASES:
+        label = IntentRouter.match_rules(question)
+        assert label == expected, question
+        decided += label is not None
+
+    assert decided / len(PREROUTER_CASES) >= 0.75
+
+
+class KeywordEmbedder:
+    """Bag-of-words vectors over a tiny vocabulary (stands in for the model)."""
+
+    VOCAB = ["price", "worth", "market", "sector", "risks", "strategy", "close"]
+
+    async def aembed(self, text):
+        words = text.lower().replace("?", "").split()
+        return [float(sum(w.startswith(v) for w in words)) for v in self.VOCAB]
+
+
+@pytest.mark.asyncio
+async def test_prerouter_embedding_fallback(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTER_EMBEDDING_THRESHOLD", 0.7)
+    router = IntentRouter(embedder=KeywordEmbedder())
+    router_stats.update(rules=0, embeddings=0, llm=0)
+
+    assert await router.route("Which sector is Meta in?") == "market_agent"
+    assert await router.route("Tell me about Amazon") is None
+    assert await router.route("Analyze Tesla") == "research_agent"
+
+    assert router_stats == {"rules": 1, "embeddings": 1, "llm": 1}
+    assert get_router_stats()["llm_skip_rate"] == round(2 / 3, 4)
+
+
+@pytest.mark.asyncio
+async def test_supervisor_skips_llm_for_confident_routes(nodes_with_mocks, monkeypatch):
+    monkeypatch.setattr(settings, "ROUTER_USE_EMBEDDINGS", False)
+    nodes_with_mocks.router_llm = MagicMock(side_effect=AssertionError("LLM called"))
+
+    result = await nodes_with_mocks.supervisor_node(
+        AgentState(question="What is the stock price of AAPL?", loop_step=0)
+    )
+
+    assert result["next_step"] == "market_agent"
+    assert result["loop_step"] == 1
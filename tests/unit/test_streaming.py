@@ -0,0 +1,119 @@
+import json
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from langchain_core.messages import AIMessageChunk
+from app.agents.streaming import stream_agent_run
+
+CONFIG = {"configurable": {"thread_id": "t1"}}
+
+
+def node_event(kind, node):
+    return {"event": kind, "name": node, "metadata": {"langgraph_node": node}}
+
+
+def token_event(node, text):
+    return {
+        "event": "on_chat_model_stream",
+        "name": "ChatOllama",
+        "metadata": {"langgraph_node": node},
+        "data": {"chunk": AIMessageChunk(content=text)},
+    }
+
+
+class FakeAgent:
+    def __init__(self, events, final_values=None, endless=False):
+        self.events = events
+        self.endless = endless
+        self.closed = False
+        self.aget_state = AsyncMock(
+            return_value=SimpleNamespace(values=final_values or {})
+        )
+
+    async def astream_events(self, graph_input, config, version):
+        try:
+            for event in self.events:
+                yield event
+            while self.endless:
+                await asyncio.sleep(0)
+                yield node_event("on_chain_start", "grade_documents")
+        finally:
+            self.closed = True
+
+
+def parse(frames):
+    parsed = []
+    for frame in frames:
+        event_line, data_line = frame.strip().split("\n")
+        parsed.append((event_line[len("event: ") :], json.loads(data_line[6:])))
+    return parsed
+
+
+async def never_disconnected():
+    return False
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_nodes_tokens_and_final_payload():
+    agent = FakeAgent(
+        [
+            node_event("on_chain_start", "supervisor"),
+            token_event("supervisor", '{"next_step"'),  # routing JSON: not streamed
+            node_event("on_chain_end", "supervisor"),
+            node_event("on_chain_start", "reporter_agent"),
+            token_event("reporter_agent", "Apple "),
+            token_event("reporter_agent", "is strong."),
+            node_event("on_chain_end", "reporter_agent"),
+        ],
+        final_values={"generation": "<html/>", "sources": ["10-K"]},
+    )
+
+    frames = [f async for f in stream_agent_run(agent, {}, CONFIG, never_disconnected)]
+    events = parse(frames)
+
+    assert events[0] == ("start", {"thread_id": "t1"})
+    assert ("node_start", {"node": "supervisor"}) in events
+    tokens = [data["content"] for kind, data in events if kind == "token"]
+    assert tokens == ["Apple ", "is strong."]
+    assert events[-1] == (
+        "completed",
+        {"status": "COMPLETED", "answer": "<html/>", "sources": ["10-K"]},
+    )
+    assert agent.closed
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_graph_when_client_disconnects():
+    agent = FakeAgent([], endless=True)
+    checks = 0
+
+    async def disconnect_after_three_events():
+        nonlocal checks
+        checks += 1
+        return checks > 3
+
+    frames = [
+        f
+        async for f in stream_agent_run(
+            agent, {}, CONFIG, disconnect_after_three_events
+        )
+    ]
+
+    assert len(frames) == 1 + 3
+    assert agent.closed
+    agent.aget_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_paused_runs():
+    agent = FakeAgent(
+        [],
+        final_values={"next_step": "human_intervention", "error_message": "Div by 0"},
+    )
+
+    frames = [f async for f in stream_agent_run(agent, {}, CONFIG, never_disconnected)]
+
+    kind, data = parse(frames)[-1]
+    assert kind == "paused"
+    assert data["error"] == "Div by 0"
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.db.vector_index import (
+    apply_search_params,
+    build_index_ddl,
+    create_vector_index,
+    index_name,
+    ivfflat_lists,
+)
+
+
+def test_build_hnsw_ddl():
+    ddl = build_index_ddl("hnsw", m=24, ef_construction=128)
+
+    assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+    assert "WITH (m = 24, ef_construction = 128)" in ddl
+    assert index_name("hnsw") in ddl
+    assert "CONCURRENTLY" not in ddl
+
+
+def test_build_ivfflat_ddl_concurrently():
+    ddl = build_index_ddl("ivfflat", lists=200, concurrently=True)
+
+    assert ddl.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS")
+    assert "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 200)" in ddl
+
+
+def test_ivfflat_lists_follow_row_count():
+    assert ivfflat_lists(0) == 1
+    assert ivfflat_lists(250_000) == 250
+    assert ivfflat_lists(1_000_000) == 1000
+    assert ivfflat_lists(4_000_000) == 2000
+
+
+@pytest.mark.asyncio
+async def test_ivfflat_index_is_sized_from_rows(monkeypatch):
+    monkeypatch.setattr("app.db.vector_index.settings.IVFFLAT_LISTS", None)
+    conn = AsyncMock()
+    conn.execute.side_effect = [MagicMock(scalar=lambda: 50_000), None]
+
+    await create_vector_index(conn, "ivfflat")
+
+    count, ddl = (str(call.args[0]) for call in conn.execute.await_args_list)
+    assert count.startswith("SELECT count(*) FROM financial_reports")
+    assert "WITH (lists = 50)" in ddl
+
+
+def test_build_ddl_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        build_index_ddl("flat")
+
+
+@pytest.mark.asyncio
+async def test_apply_search_params_uses_set_local(monkeypatch):
+    """
+    Per-query knobs must be transaction-scoped so pooled connections stay clean.
+    """
+    monkeypatch.setattr("app.db.vector_index.settings.VECTOR_INDEX_TYPE", "hnsw")
+    session = AsyncMock()
+
+    await apply_search_params(session, ef_search=80)
+
+    statement = session.execute.call_args.args[0]
+    assert str(statement) == "SET LOCAL hnsw.ef_search = 80"